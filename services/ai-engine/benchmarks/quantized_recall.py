@@ -0,0 +1,73 @@
+"""
+Recall and memory of quantized embedding storage versus float32.
+
+Builds a synthetic corpus of clustered unit vectors (job postings tend to
+form tight clusters, which is the hard case for quantization), scores a
+set of queries exactly in float32 and again from float16 / int8 storage,
+and reports recall@k of the top results, memory and scoring time.
+
+Usage:
+    python benchmarks/quantized_recall.py --corpus 200000 --queries 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.quantization import EmbeddingStore, similarity  # noqa: E402
+
+
+def clustered_unit_vectors(n: int, dimension: int, clusters: int, spread: float, rng) -> np.ndarray:
+    """Sample normalized vectors around random cluster centres."""
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, n)] + spread * rng.standard_normal((n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row."""
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=int, default=100000, help="Number of corpus vectors")
+    parser.add_argument("--queries", type=int, default=100, help="Number of query vectors")
+    parser.add_argument("--dimension", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--clusters", type=int, default=200, help="Number of vector clusters")
+    parser.add_argument("--spread", type=float, default=0.5, help="Noise around cluster centres")
+    parser.add_argument("-k", type=int, default=10, help="Recall cut-off")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    corpus = clustered_unit_vectors(args.corpus, args.dimension, args.clusters, args.spread, rng)
+    queries = clustered_unit_vectors(args.queries, args.dimension, args.clusters, args.spread, rng)
+
+    print(f"corpus={args.corpus} queries={args.queries} dimension={args.dimension} k={args.k}")
+    print(f"{'dtype':<8} {'MB':>9} {'ms/query':>9} {'recall@k':>9}")
+
+    exact = None
+    for dtype in ("float32", "float16", "int8"):
+        store = EmbeddingStore(args.dimension, capacity=args.corpus, dtype=dtype)
+        store.write(0, corpus)
+        embeddings = store.head(args.corpus)
+
+        start = time.perf_counter()
+        scores = similarity(queries, embeddings)
+        elapsed = (time.perf_counter() - start) * 1000 / args.queries
+
+        found = top_k(scores, args.k)
+        if exact is None:
+            exact = found
+        recall = np.mean([len(set(e) & set(f)) / args.k for e, f in zip(exact, found)])
+
+        print(f"{dtype:<8} {store.nbytes / 2**20:>9.1f} {elapsed:>9.3f} {recall:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
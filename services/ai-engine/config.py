@@ -23,6 +23,12 @@ class Config:
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
     EMBEDDING_DIMENSION: int = int(os.getenv("EMBEDDING_DIMENSION", "384"))
     MAX_SEQUENCE_LENGTH: int = int(os.getenv("MAX_SEQUENCE_LENGTH", "256"))
+    # Local directory holding a saved copy of the model (loaded instead of the hub name when present)
+    EMBEDDING_MODEL_PATH: str = os.getenv("EMBEDDING_MODEL_PATH", "")
+
+    # Startup: eager (load model before serving), background (serve /live at
+    # once, /ready after the model loads) or lazy (load on first request)
+    STARTUP_MODE: str = os.getenv("STARTUP_MODE", "eager").lower()
 
     # Service URLs
     CORE_API_URL: str = os.getenv("CORE_API_URL", "http://localhost:3001")
@@ -32,6 +38,54 @@ class Config:
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "32"))
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "3600"))
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
+    # Inference calls allowed to wait for a worker before requests get 503
+    INFERENCE_QUEUE_SIZE: int = int(os.getenv("INFERENCE_QUEUE_SIZE", "32"))
+
+    # Worker processes for batch encoding (0 = encode in the API process)
+    EMBEDDING_PROCESSES: int = int(os.getenv("EMBEDDING_PROCESSES", "0"))
+
+    # Results serialized per flush by the NDJSON streaming endpoints
+    STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "100"))
+
+    # Micro-batching of concurrent single-text embedding requests
+    MICRO_BATCH_ENABLED: bool = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+    MICRO_BATCH_MAX_WAIT_MS: float = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5"))
+    MICRO_BATCH_MAX_SIZE: int = int(os.getenv("MICRO_BATCH_MAX_SIZE", str(BATCH_SIZE)))
+
+    # Embedding cache (both tiers use CACHE_TTL; empty path disables the disk tier)
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_ENTRIES", "1000000"))
+
+    # Jobs whose inferred seniority level is cached
+    SENIORITY_CACHE_SIZE: int = int(os.getenv("SENIORITY_CACHE_SIZE", "100000"))
+
+    # Jobs whose requirement importance labels are cached
+    SKILL_IMPORTANCE_CACHE_SIZE: int = int(os.getenv("SKILL_IMPORTANCE_CACHE_SIZE", "100000"))
+
+    # Per-user skill aggregates over saved target jobs (empty path keeps them in memory only)
+    SKILL_AGGREGATE_PATH: str = os.getenv("SKILL_AGGREGATE_PATH", "")
+    SKILL_AGGREGATE_CACHE_SIZE: int = int(os.getenv("SKILL_AGGREGATE_CACHE_SIZE", "10000"))
+
+    # Curated learning resources (JSON or SQLite; empty uses platform search links only)
+    LEARNING_RESOURCES_PATH: str = os.getenv("LEARNING_RESOURCES_PATH", "")
+    LEARNING_RESOURCE_CACHE_SIZE: int = int(os.getenv("LEARNING_RESOURCE_CACHE_SIZE", "10000"))
+
+    # Semantic skill synonyms ("k8s" ~ "Kubernetes") via skill embeddings
+    SKILL_SYNONYMS_ENABLED: bool = os.getenv("SKILL_SYNONYMS_ENABLED", "false").lower() == "true"
+    SKILL_SYNONYM_THRESHOLD: float = float(os.getenv("SKILL_SYNONYM_THRESHOLD", "0.8"))
+
+    # Job corpus embedding storage: float32, float16 (2x smaller) or int8 (~4x smaller)
+    CORPUS_EMBEDDING_DTYPE: str = os.getenv("CORPUS_EMBEDDING_DTYPE", "float32")
+    # File prefix for the memory-mapped corpus snapshot (empty disables it)
+    CORPUS_SNAPSHOT_PATH: str = os.getenv("CORPUS_SNAPSHOT_PATH", "")
+
+    # Approximate nearest-neighbour retrieval over the job corpus
+    ANN_ENABLED: bool = os.getenv("ANN_ENABLED", "false").lower() == "true"
+    ANN_NLIST: int = int(os.getenv("ANN_NLIST", "256"))
+    ANN_NPROBE: int = int(os.getenv("ANN_NPROBE", "16"))
+    ANN_MIN_CORPUS_SIZE: int = int(os.getenv("ANN_MIN_CORPUS_SIZE", "5000"))
+    ANN_CANDIDATES: int = int(os.getenv("ANN_CANDIDATES", "500"))
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -45,6 +99,14 @@ class Config:
         # No strict requirements for MVP - all have defaults
         # Future: Add validation for production deployment
 
+        if cls.STARTUP_MODE not in ("eager", "background", "lazy"):
+            errors.append(f"STARTUP_MODE must be eager, background or lazy (got {cls.STARTUP_MODE!r})")
+
+        if cls.CORPUS_EMBEDDING_DTYPE not in ("float32", "float16", "int8"):
+            errors.append(
+                f"CORPUS_EMBEDDING_DTYPE must be float32, float16 or int8 (got {cls.CORPUS_EMBEDDING_DTYPE!r})"
+            )
+
         if errors:
             raise ValueError(
                 f"Configuration validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
@@ -7,12 +7,18 @@ This service provides:
 - Personalized career recommendations
 - CV analysis and profile enrichment
 """
+# Imported first so the startup clock covers every other import
+from utils.startup import startup_timer
+
+import json
 import logging
+import threading
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Iterator, List, Optional
 
 from config import Config
 from utils.logging import setup_logging
@@ -21,10 +27,18 @@ from models import (
     Job,
     MatchRequest,
     MatchResult,
+    BatchMatchRequest,
+    UserMatches,
+    CorpusDeleteRequest,
+    CorpusUpdateResult,
+    TargetJobsUpdateResult,
     SkillAnalysisResult,
     SkillGapRequest,
     SkillGapResponse,
+    BulkSkillGapRequest,
+    BulkSkillGapResponse,
     LearningPath,
+    SkillAnalysisWithPaths,
     HealthResponse,
     EmbeddingService,
     AIRequest,
@@ -35,16 +49,58 @@ from services import (
     SkillAnalyzer,
     RecommendationEngine,
 )
-from services.skill_analysis import calculate_skill_gap
+from services.skill_analysis import SkillAnalysisSession, calculate_skill_gap, calculate_skill_gaps
+from services.job_corpus import job_corpus
+from services.seniority import seniority_classifier
+from services.learning_resources import learning_resources
+from services.skill_aggregate import skill_aggregates
+from services.skill_importance import importance_annotator
+from utils.cache import TTLCache
+from utils.executor import InferenceQueueFull, inference_executor
 
 # Initialize logging
 setup_logging()
 logger = logging.getLogger(__name__)
+startup_timer.record("imports", startup_timer.elapsed())
 
 # Service version
 VERSION = "1.0.0"
 
 
+def load_model() -> None:
+    """Load and warm up the embedding model."""
+    logger.info("Pre-loading embedding model...")
+    embedding_service.warm_up()
+    logger.info(f"✓ Embedding service ready (dimension: {Config.EMBEDDING_DIMENSION})")
+
+
+def restore_corpus() -> None:
+    """Map the saved job corpus so it is available without re-encoding."""
+    if not Config.CORPUS_SNAPSHOT_PATH:
+        return
+
+    try:
+        with startup_timer.phase("corpus_restore"):
+            restored = job_corpus.restore()
+        if restored:
+            logger.info(f"✓ Job corpus restored ({len(job_corpus)} jobs)")
+    except Exception as e:
+        logger.warning(f"Could not restore job corpus snapshot: {e}")
+
+
+def prepare_in_background() -> None:
+    """Background startup: load the model, then report ready."""
+    try:
+        load_model()
+    except Exception as e:
+        logger.error(f"✗ Failed to load embedding model: {e}", exc_info=True)
+        return
+
+    restore_corpus()
+    startup_timer.mark_ready()
+    logger.info(f"AI Engine ready to serve requests ({startup_timer.report()})")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -55,24 +111,32 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 50)
     logger.info(f"Starting Ori AI Engine v{VERSION}")
     logger.info(f"Environment: {Config.ENVIRONMENT}")
+    logger.info(f"Startup mode: {Config.STARTUP_MODE}")
     logger.info("=" * 50)
 
-    # Pre-load embedding model for faster first request
-    try:
-        logger.info("Pre-loading embedding model...")
-        embedding_service = EmbeddingService()
-        test_embedding = embedding_service.embed_text("test")
-        logger.info(f"✓ Embedding service ready (dimension: {len(test_embedding)})")
-    except Exception as e:
-        logger.error(f"✗ Failed to load embedding model: {e}")
-        raise
-
-    logger.info("AI Engine ready to serve requests")
+    if Config.STARTUP_MODE == "background":
+        # Serve /live immediately; /ready turns healthy once the model is loaded
+        threading.Thread(target=prepare_in_background, name="startup", daemon=True).start()
+    else:
+        # Pre-load embedding model for faster first request
+        if Config.STARTUP_MODE == "eager":
+            try:
+                load_model()
+            except Exception as e:
+                logger.error(f"✗ Failed to load embedding model: {e}")
+                raise
+
+        restore_corpus()
+        startup_timer.mark_ready()
+        logger.info(f"AI Engine ready to serve requests ({startup_timer.report()})")
 
     yield
 
     # Shutdown
     logger.info("Shutting down AI Engine")
+    inference_executor.shutdown()
+    embedding_service.close()
+    learning_resources.close()
 
 
 # Initialize FastAPI app
@@ -104,6 +168,109 @@ recommendation_engine = RecommendationEngine()
 embedding_service = EmbeddingService()
 
 
+async def run_inference(fn, *args, **kwargs):
+    """
+    Run blocking model work on the inference executor.
+
+    Keeps the event loop free for other requests (including /health) and
+    sheds load with a 503 once the executor queue is full.
+    """
+    try:
+        return await inference_executor.run(fn, *args, **kwargs)
+    except InferenceQueueFull as e:
+        logger.warning(f"Rejecting request, inference executor saturated: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI engine is at capacity, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
+async def find_matches(request: MatchRequest) -> List[MatchResult]:
+    """Rank jobs for a single-profile match request (inline, by ID or whole corpus)."""
+    if not (request.jobs or request.job_ids or request.use_corpus):
+        return []
+
+    # Joins the micro-batch from the event loop, before the executor hop
+    # (None when micro-batching is disabled: embedded on the executor)
+    profile_embedding = await embedding_service.embed_profile_async(request.profile)
+
+    if request.jobs:
+        logger.info(f"Match request for user {request.profile.user_id}: {len(request.jobs)} jobs")
+
+        return await run_inference(
+            matching_service.match_profile_to_jobs,
+            request.profile,
+            request.jobs,
+            limit=request.limit,
+            profile_embedding=profile_embedding
+        )
+
+    logger.info(
+        f"Corpus match request for user {request.profile.user_id}: "
+        f"{len(request.job_ids) if request.job_ids else len(job_corpus)} jobs"
+    )
+
+    return await run_inference(
+        matching_service.match_profile_to_corpus,
+        request.profile,
+        job_corpus,
+        job_ids=request.job_ids or None,
+        limit=request.limit,
+        profile_embedding=profile_embedding
+    )
+
+
+def user_matches_chunks(
+    profiles: List[UserProfile],
+    chunks: Iterator[List[List[MatchResult]]]
+) -> Iterator[List[UserMatches]]:
+    """Pair chunked match lists with the profiles they belong to."""
+    start = 0
+    for chunk in chunks:
+        yield [
+            UserMatches(user_id=profile.user_id, matches=matches)
+            for profile, matches in zip(profiles[start:start + len(chunk)], chunk)
+        ]
+        start += len(chunk)
+
+
+async def stream_ndjson(chunks: Iterator[List[BaseModel]], offload: bool = True) -> StreamingResponse:
+    """
+    Stream models as newline-delimited JSON, one flush per chunk.
+
+    The first chunk is produced before the response starts, so failures
+    there (including a saturated executor) still surface as HTTP errors.
+    A later failure cannot change the status code; it is reported as a
+    final `{"error": ...}` line and the stream ends.
+
+    Args:
+        chunks: Iterator of model lists
+        offload: Advance the iterator on the inference executor (for
+            iterators that do model work)
+    """
+    async def next_chunk() -> Optional[List[BaseModel]]:
+        if offload:
+            return await run_inference(next, chunks, None)
+        return next(chunks, None)
+
+    first = await next_chunk()
+
+    async def body() -> AsyncIterator[bytes]:
+        chunk = first
+        while chunk is not None:
+            yield "".join(item.model_dump_json() + "\n" for item in chunk).encode()
+            try:
+                chunk = await next_chunk()
+            except Exception as e:
+                logger.error(f"NDJSON stream aborted: {e}", exc_info=True)
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                yield (json.dumps({"error": detail}) + "\n").encode()
+                return
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
 # Error handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -138,6 +305,54 @@ async def health_check():
             "embedding_model": model_loaded,
             "matching_service": True,
             "skill_analyzer": True,
+        },
+        metrics={
+            "embedding_cache": embedding_service.cache.stats(),
+            "inference": inference_executor.stats(),
+            "seniority_cache": seniority_classifier.stats(),
+            "skill_importance_cache": importance_annotator.stats(),
+            "skill_aggregates": skill_aggregates.stats(),
+            "learning_resources": learning_resources.stats(),
+            "startup": startup_timer.report(),
+            **(
+                {"micro_batching": embedding_service.batcher.stats()}
+                if embedding_service.batcher is not None else {}
+            ),
+            **(
+                {"embedding_pool": embedding_service.pool.stats()}
+                if embedding_service.pool is not None else {}
+            ),
+        }
+    )
+
+
+@app.get("/live")
+async def liveness():
+    """
+    Liveness probe: the process is up and the event loop is responsive.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def readiness():
+    """
+    Readiness probe: startup has finished and the model can serve requests.
+
+    Returns 503 while the service is still starting. The body includes the
+    startup phase timings.
+    """
+    ready = startup_timer.ready and (
+        embedding_service.is_ready() or Config.STARTUP_MODE == "lazy"
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "starting",
+            "startup_mode": Config.STARTUP_MODE,
+            "model_loaded": embedding_service.is_ready(),
+            "startup": startup_timer.report(),
         }
     )
 
@@ -150,7 +365,9 @@ async def root():
         "version": VERSION,
         "status": "operational",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health",
+        "ready": "/ready",
+        "live": "/live"
     }
 
 
@@ -172,23 +389,22 @@ async def generate_matches(request: MatchRequest):
     - Experience alignment (15%): Career level fit
     - Location/work style (10%): Lifestyle preferences
     - Salary fit (5%): Compensation alignment
+
+    Jobs can be sent inline (`jobs`), referenced by corpus ID (`job_ids`),
+    or taken from the whole corpus (`use_corpus`).
     """
     try:
-        logger.info(f"Match request for user {request.profile.user_id}: {len(request.jobs)} jobs")
+        matches = await find_matches(request)
 
-        if not request.jobs:
+        if not matches:
             return []
 
-        matches = matching_service.match_profile_to_jobs(
-            request.profile,
-            request.jobs,
-            limit=request.limit
-        )
-
         logger.info(f"Generated {len(matches)} matches (avg score: {sum(m.match_score for m in matches) / len(matches):.1f})")
 
         return matches
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Match generation failed: {e}", exc_info=True)
         raise HTTPException(
@@ -197,6 +413,127 @@ async def generate_matches(request: MatchRequest):
         )
 
 
+@app.post("/api/v1/match/stream")
+async def stream_matches(request: MatchRequest):
+    """
+    Generate job matches as newline-delimited JSON.
+
+    Same request and ranking as /api/v1/match. Ranking finishes before the
+    first line is sent (top-k is only final once every job is scored);
+    results are then serialized and flushed STREAM_CHUNK_SIZE at a time
+    instead of as one JSON array.
+    """
+    try:
+        matches = await find_matches(request)
+        chunk_size = max(1, Config.STREAM_CHUNK_SIZE)
+
+        return await stream_ndjson(
+            (matches[start:start + chunk_size] for start in range(0, len(matches), chunk_size)),
+            offload=False
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Match stream failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate matches: {str(e)}"
+        )
+
+
+@app.post("/api/v1/match/batch", response_model=List[UserMatches])
+async def generate_batch_matches(request: BatchMatchRequest):
+    """
+    Generate job matches for many profiles against one shared job set.
+
+    Intended for offline jobs such as nightly recommendations. Jobs are
+    embedded once and profiles are scored together, which is much cheaper
+    than one /api/v1/match call per user. Scores are identical to the
+    single-profile endpoint.
+
+    Jobs can be sent inline (`jobs`), referenced by corpus ID (`job_ids`),
+    or taken from the whole corpus (`use_corpus`).
+    """
+    try:
+        if request.jobs:
+            logger.info(f"Batch match request: {len(request.profiles)} profiles, {len(request.jobs)} jobs")
+
+            results = await run_inference(
+                matching_service.match_profiles_to_jobs,
+                request.profiles,
+                request.jobs,
+                limit=request.limit
+            )
+        elif request.job_ids or request.use_corpus:
+            logger.info(
+                f"Batch corpus match request: {len(request.profiles)} profiles, "
+                f"{len(request.job_ids) if request.job_ids else len(job_corpus)} jobs"
+            )
+
+            results = await run_inference(
+                matching_service.match_profiles_to_corpus,
+                request.profiles,
+                job_corpus,
+                job_ids=request.job_ids or None,
+                limit=request.limit
+            )
+        else:
+            results = [[] for _ in request.profiles]
+
+        return [
+            UserMatches(user_id=profile.user_id, matches=matches)
+            for profile, matches in zip(request.profiles, results)
+        ]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch match generation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate batch matches: {str(e)}"
+        )
+
+
+@app.post("/api/v1/match/batch/stream")
+async def stream_batch_matches(request: BatchMatchRequest):
+    """
+    Generate batch job matches as newline-delimited JSON.
+
+    Same request and scores as /api/v1/match/batch, but each line is one
+    `{"user_id": ..., "matches": [...]}` object and lines are flushed as
+    soon as their chunk of BATCH_SIZE profiles is ranked, so the first
+    users arrive long before the batch finishes and the response is never
+    buffered whole.
+    """
+    try:
+        if request.jobs:
+            logger.info(f"Streaming batch match: {len(request.profiles)} profiles, {len(request.jobs)} jobs")
+            chunks = matching_service.iter_profiles_to_jobs(request.profiles, request.jobs, limit=request.limit)
+        elif request.job_ids or request.use_corpus:
+            logger.info(f"Streaming batch corpus match: {len(request.profiles)} profiles")
+            chunks = matching_service.iter_profiles_to_corpus(
+                request.profiles,
+                job_corpus,
+                job_ids=request.job_ids or None,
+                limit=request.limit
+            )
+        else:
+            chunks = iter([[[] for _ in request.profiles]])
+
+        return await stream_ndjson(user_matches_chunks(request.profiles, chunks))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch match stream failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate batch matches: {str(e)}"
+        )
+
+
 @app.post("/api/v1/skill-gap", response_model=SkillGapResponse)
 async def get_skill_gap(request: SkillGapRequest):
     """
@@ -218,12 +555,14 @@ async def get_skill_gap(request: SkillGapRequest):
     try:
         logger.info(f"Simple skill gap check: {len(request.user_skills)} vs {len(request.required_skills)} skills")
 
-        result = calculate_skill_gap(request)
+        result = await run_inference(calculate_skill_gap, request)
 
         logger.info(f"Skill gap result: {len(result.missing_skills)} missing skills")
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Skill gap calculation failed: {e}", exc_info=True)
         raise HTTPException(
@@ -232,6 +571,31 @@ async def get_skill_gap(request: SkillGapRequest):
         )
 
 
+@app.post("/api/v1/skill-gap/bulk", response_model=BulkSkillGapResponse)
+async def get_bulk_skill_gap(request: BulkSkillGapRequest):
+    """
+    Calculate skill gaps for many users against one role in a single call.
+
+    Equivalent to calling /api/v1/skill-gap once per user with the same
+    `required_skills`, but the required side is normalized once and all
+    users are checked in one pass (e.g. for cohort and team views).
+    Results are returned in the order of `users`.
+    """
+    try:
+        logger.info(f"Bulk skill gap check: {len(request.users)} users vs {len(request.required_skills)} skills")
+
+        return await run_inference(calculate_skill_gaps, request)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk skill gap calculation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to calculate skill gaps: {str(e)}"
+        )
+
+
 @app.post("/api/v1/analyze-skills", response_model=SkillAnalysisResult)
 async def analyze_skills(profile: UserProfile, target_jobs: List[Job]):
     """
@@ -252,7 +616,7 @@ async def analyze_skills(profile: UserProfile, target_jobs: List[Job]):
                 detail="At least one target job is required for analysis"
             )
 
-        analysis = skill_analyzer.analyze_skill_gaps(profile, target_jobs)
+        analysis = await run_inference(skill_analyzer.analyze_skill_gaps, profile, target_jobs)
 
         logger.info(
             f"Analysis complete: {len(analysis.skill_gaps)} gaps identified, "
@@ -289,7 +653,8 @@ async def get_learning_paths(
     try:
         logger.info(f"Generating learning paths for user {profile.user_id}")
 
-        paths = recommendation_engine.recommend_learning_paths(
+        paths = await run_inference(
+            recommendation_engine.recommend_learning_paths,
             profile,
             target_jobs,
             max_paths=max_paths
@@ -299,6 +664,8 @@ async def get_learning_paths(
 
         return paths
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Learning path generation failed: {e}", exc_info=True)
         raise HTTPException(
@@ -307,6 +674,41 @@ async def get_learning_paths(
         )
 
 
+@app.post("/api/v1/analyze-skills/with-paths", response_model=SkillAnalysisWithPaths)
+async def analyze_skills_with_paths(
+    profile: UserProfile,
+    target_jobs: List[Job],
+    max_paths: int = 5
+):
+    """
+    Skill analysis and learning paths in one call.
+
+    Returns the same `analysis` as /api/v1/analyze-skills and the same
+    `learning_paths` as /api/v1/learning-paths, but jobs are aggregated
+    and gaps found once for both.
+    """
+    try:
+        logger.info(f"Skill analysis with learning paths for user {profile.user_id}")
+
+        if not target_jobs:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one target job is required for analysis"
+            )
+
+        session = skill_analyzer.session(profile, target_jobs)
+        return await run_inference(session.with_learning_paths, max_paths)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Skill analysis with learning paths failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze skills: {str(e)}"
+        )
+
+
 @app.post("/api/v1/recommend-roles")
 async def recommend_roles(profile: UserProfile):
     """
@@ -412,6 +814,291 @@ async def generate_response(request: AIRequest):
         )
 
 
+# ============================================================================
+# Saved Target Jobs (incremental skill analysis)
+# ============================================================================
+
+# Recent analyses of saved target jobs, shared by the per-user endpoints so
+# analysis and learning paths for the same state are computed once
+analysis_sessions = TTLCache(maxsize=Config.SKILL_AGGREGATE_CACHE_SIZE, ttl=Config.CACHE_TTL)
+
+
+def saved_analysis_session(user_id: str, profile: UserProfile) -> SkillAnalysisSession:
+    """
+    Get the analysis session for a user's current saved jobs and profile.
+
+    Reads the aggregate store (which may load from disk), so run it on the
+    inference executor.
+    """
+    if profile.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Profile user_id {profile.user_id} does not match path user_id {user_id}"
+        )
+
+    aggregate = skill_aggregates.get(user_id)
+    key = (user_id, aggregate.revision, profile.model_dump_json())
+
+    session = analysis_sessions.get(key)
+    if session is None:
+        session = skill_analyzer.session(profile, aggregate)
+        analysis_sessions.set(key, session)
+    return session
+
+
+def target_jobs_result(user_id: str, **counts) -> TargetJobsUpdateResult:
+    """Summarize a user's target-job aggregate after a change (run on the executor)."""
+    aggregate = skill_aggregates.get(user_id)
+    return TargetJobsUpdateResult(
+        user_id=user_id,
+        jobs=len(aggregate),
+        skills=len(aggregate.skills()),
+        **counts
+    )
+
+
+@app.post("/api/v1/users/{user_id}/target-jobs", response_model=TargetJobsUpdateResult)
+async def add_target_jobs(user_id: str, jobs: List[Job]):
+    """
+    Add or update saved target jobs for a user.
+
+    Each job's contribution to the user's skill aggregate is applied
+    incrementally, so later analyses do not rescan every saved job.
+    """
+    try:
+        counts = await run_inference(skill_aggregates.add_jobs, user_id, jobs)
+        return await run_inference(target_jobs_result, user_id, **counts)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Target job update failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update target jobs: {str(e)}"
+        )
+
+
+@app.put("/api/v1/users/{user_id}/target-jobs", response_model=TargetJobsUpdateResult)
+async def replace_target_jobs(user_id: str, jobs: List[Job]):
+    """
+    Replace a user's saved target jobs entirely.
+    """
+    try:
+        counts = await run_inference(skill_aggregates.replace_jobs, user_id, jobs)
+        return await run_inference(target_jobs_result, user_id, changed=len(jobs), **counts)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Target job replace failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to replace target jobs: {str(e)}"
+        )
+
+
+@app.delete("/api/v1/users/{user_id}/target-jobs/{job_id}", response_model=TargetJobsUpdateResult)
+async def remove_target_job(user_id: str, job_id: str):
+    """
+    Remove one saved target job for a user.
+    """
+    try:
+        removed = await run_inference(skill_aggregates.remove_job, user_id, job_id)
+        if not removed:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job {job_id} is not saved for user {user_id}"
+            )
+        return await run_inference(target_jobs_result, user_id, removed=1)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Target job removal failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to remove target job: {str(e)}"
+        )
+
+
+@app.post("/api/v1/users/{user_id}/analyze-skills", response_model=SkillAnalysisResult)
+async def analyze_saved_skills(user_id: str, profile: UserProfile):
+    """
+    Analyze skill gaps against the user's saved target jobs.
+
+    Same result as /api/v1/analyze-skills with those jobs, read from the
+    user's incrementally maintained skill aggregate.
+    """
+    try:
+        session = await run_inference(saved_analysis_session, user_id, profile)
+        if not len(session.target_jobs):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No target jobs saved for user {user_id}"
+            )
+
+        return await run_inference(lambda: session.result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Saved skill analysis failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze skills: {str(e)}"
+        )
+
+
+@app.post("/api/v1/users/{user_id}/learning-paths", response_model=List[LearningPath])
+async def get_saved_learning_paths(user_id: str, profile: UserProfile, max_paths: int = 5):
+    """
+    Generate learning paths from the user's saved target jobs.
+
+    Reuses the gaps of a recent /analyze-skills call for the same saved
+    jobs and profile instead of recomputing them.
+    """
+    try:
+        session = await run_inference(saved_analysis_session, user_id, profile)
+        return await run_inference(session.learning_paths, max_paths)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Saved learning path generation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate learning paths: {str(e)}"
+        )
+
+
+@app.post("/api/v1/users/{user_id}/analyze-skills/with-paths", response_model=SkillAnalysisWithPaths)
+async def analyze_saved_skills_with_paths(user_id: str, profile: UserProfile, max_paths: int = 5):
+    """
+    Skill analysis and learning paths against the user's saved target jobs.
+    """
+    try:
+        session = await run_inference(saved_analysis_session, user_id, profile)
+        if not len(session.target_jobs):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No target jobs saved for user {user_id}"
+            )
+
+        return await run_inference(session.with_learning_paths, max_paths)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Saved skill analysis with learning paths failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze skills: {str(e)}"
+        )
+
+
+# ============================================================================
+# Job Corpus Endpoints
+# ============================================================================
+
+@app.get("/api/v1/corpus")
+async def get_corpus_stats():
+    """Get job corpus size and memory counters."""
+    return job_corpus.stats()
+
+
+@app.post("/api/v1/corpus/jobs", response_model=CorpusUpdateResult)
+async def upsert_corpus_jobs(jobs: List[Job]):
+    """
+    Insert or update jobs in the server-side corpus.
+
+    Only new or changed postings are embedded. Match requests can then
+    reference these jobs by ID instead of sending them.
+    """
+    try:
+        result = await run_inference(job_corpus.upsert, jobs)
+        return CorpusUpdateResult(size=len(job_corpus), **result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Corpus upsert failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update corpus: {str(e)}"
+        )
+
+
+@app.put("/api/v1/corpus/jobs", response_model=CorpusUpdateResult)
+async def load_corpus_jobs(jobs: List[Job]):
+    """
+    Replace the whole job corpus (bulk load).
+
+    Jobs missing from the payload are removed; unchanged jobs keep their
+    embeddings.
+    """
+    try:
+        result = await run_inference(job_corpus.load, jobs)
+        return CorpusUpdateResult(size=len(job_corpus), **result)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Corpus load failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to load corpus: {str(e)}"
+        )
+
+
+@app.post("/api/v1/corpus/jobs/delete", response_model=CorpusUpdateResult)
+async def delete_corpus_jobs(request: CorpusDeleteRequest):
+    """Remove jobs from the corpus by ID."""
+    # Deleting may compact the whole corpus, so keep it off the event loop
+    deleted = await run_inference(job_corpus.delete, request.job_ids)
+    return CorpusUpdateResult(deleted=deleted, size=len(job_corpus))
+
+
+@app.post("/api/v1/corpus/save")
+async def save_corpus():
+    """
+    Save the corpus to CORPUS_SNAPSHOT_PATH.
+
+    Workers started afterwards memory-map the saved embeddings, so they
+    share one copy and start without re-encoding.
+    """
+    if not Config.CORPUS_SNAPSHOT_PATH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CORPUS_SNAPSHOT_PATH is not configured"
+        )
+
+    try:
+        saved = await run_inference(job_corpus.save)
+        return {"path": Config.CORPUS_SNAPSHOT_PATH, "jobs": saved}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Corpus save failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save corpus: {str(e)}"
+        )
+
+
+@app.delete("/api/v1/corpus/jobs/{job_id}", response_model=CorpusUpdateResult)
+async def delete_corpus_job(job_id: str):
+    """Remove a single job from the corpus."""
+    deleted = await run_inference(job_corpus.delete, [job_id])
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} is not in the corpus"
+        )
+    return CorpusUpdateResult(deleted=deleted, size=len(job_corpus))
+
+
 # ============================================================================
 # Development & Testing Endpoints
 # ============================================================================
@@ -428,12 +1115,16 @@ async def generate_embedding(text: str):
         )
 
     try:
-        embedding = embedding_service.embed_text(text)
+        embedding = await embedding_service.embed_text_async(text)
+        if embedding is None:
+            embedding = await run_inference(embedding_service.embed_text, text)
         return {
             "text": text,
             "embedding_dimension": len(embedding),
             "embedding_sample": embedding[:5].tolist()  # First 5 dimensions as sample
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Embedding generation failed: {e}")
         raise HTTPException(
@@ -6,11 +6,21 @@ from .schemas import (
     Job,
     MatchRequest,
     MatchResult,
+    BatchMatchRequest,
+    UserMatches,
+    CorpusDeleteRequest,
+    CorpusUpdateResult,
+    TargetJobsUpdateResult,
     SkillGap,
     SkillAnalysisResult,
     SkillGapRequest,
     SkillGapResponse,
+    UserSkillSet,
+    BulkSkillGapRequest,
+    UserSkillGap,
+    BulkSkillGapResponse,
     LearningPath,
+    SkillAnalysisWithPaths,
     HealthResponse,
     AIRequest,
     AIResponse,
@@ -22,11 +32,21 @@ __all__ = [
     "Job",
     "MatchRequest",
     "MatchResult",
+    "BatchMatchRequest",
+    "UserMatches",
+    "CorpusDeleteRequest",
+    "CorpusUpdateResult",
+    "TargetJobsUpdateResult",
     "SkillGap",
     "SkillAnalysisResult",
     "SkillGapRequest",
     "SkillGapResponse",
+    "UserSkillSet",
+    "BulkSkillGapRequest",
+    "UserSkillGap",
+    "BulkSkillGapResponse",
     "LearningPath",
+    "SkillAnalysisWithPaths",
     "HealthResponse",
     "EmbeddingService",
     "AIRequest",
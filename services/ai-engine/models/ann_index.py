@@ -0,0 +1,325 @@
+"""
+Approximate nearest-neighbour index over normalized embeddings.
+
+Implements an inverted-file (IVF) index in NumPy: vectors are bucketed by
+their nearest k-means centroid, and a search only scans the `nprobe`
+buckets closest to the query. Raising `nprobe` trades latency for recall.
+
+Buckets hold item IDs only. Vectors are read through a VectorSource, so an
+index over the job corpus scores candidates straight from the corpus
+EmbeddingStore (compact, possibly memory-mapped) instead of keeping a
+second float32 copy. Without a source the index keeps its own vectors.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import Config
+from models.quantization import Embeddings, as_float32, similarity
+
+logger = logging.getLogger(__name__)
+
+# Resolves item IDs to their vectors: returns the IDs still present and
+# their rows, in that order
+VectorSource = Callable[[Sequence[str]], Tuple[List[str], Embeddings]]
+
+# Entries bucketed per step when re-assigning the whole index
+ASSIGN_BLOCK = 16384
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index with incremental inserts and deletes.
+
+    Until `train` is called every vector lives in a single bucket, so
+    searches are exact brute-force scans.
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        seed: int = 0,
+        vectors: Optional[VectorSource] = None
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimension: Vector dimension (uses config default if None)
+            nlist: Number of k-means buckets (uses Config.ANN_NLIST if None)
+            nprobe: Buckets scanned per query (uses Config.ANN_NPROBE if None)
+            seed: Random seed for training
+            vectors: Source of the indexed vectors (the index keeps its own
+                copy of added vectors if None)
+        """
+        self.dimension = dimension or Config.EMBEDDING_DIMENSION
+        self.nlist = nlist or Config.ANN_NLIST
+        self.nprobe = nprobe or Config.ANN_NPROBE
+        self.seed = seed
+
+        self._lock = threading.RLock()
+        self._source = vectors
+        self._vectors: Optional[Dict[str, np.ndarray]] = {} if vectors is None else None
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[str]] = [[]]
+        self._where: Dict[str, Tuple[int, int]] = {}  # id -> (list, position)
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._where
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether vectors are bucketed by centroids."""
+        return self._centroids is not None
+
+    def train(self, vectors: Optional[Embeddings] = None, iterations: int = 10) -> None:
+        """
+        Learn bucket centroids with spherical k-means and re-bucket entries.
+
+        Args:
+            vectors: Training sample (uses the indexed vectors if None)
+            iterations: k-means iterations
+        """
+        with self._lock:
+            rng = np.random.default_rng(self.seed)
+            if vectors is None:
+                ids = [item_id for bucket in self._lists for item_id in bucket]
+                sample_size = min(len(ids), self.nlist * 64)
+                if sample_size < len(ids):
+                    ids = [ids[i] for i in rng.choice(len(ids), sample_size, replace=False)]
+                vectors = self._lookup(ids)[1]
+            else:
+                sample_size = min(len(vectors), self.nlist * 64)
+                if sample_size < len(vectors):
+                    vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+            vectors = as_float32(vectors)
+            if len(vectors) == 0:
+                return
+
+            nlist = min(self.nlist, len(vectors))
+            centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignment = np.argmax(vectors @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, vectors)
+                counts = np.bincount(assignment, minlength=nlist)
+
+                empty = counts == 0
+                if empty.any():
+                    # Re-seed empty buckets with random sample points
+                    sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                centroids = sums / norms
+
+            ids = [item_id for bucket in self._lists for item_id in bucket]
+            self._centroids = centroids.astype(np.float32)
+            self._lists = [[] for _ in range(nlist)]
+            self._where = {}
+            # Re-bucket a block at a time so the source is never decoded whole
+            for start in range(0, len(ids), ASSIGN_BLOCK):
+                found, block = self._lookup(ids[start:start + ASSIGN_BLOCK])
+                if found:
+                    self._insert(found, self._assign(block))
+            self.trained_size = len(self._where)
+
+        logger.info(f"ANN index trained: {nlist} buckets, {len(self._where)} vectors")
+
+    def add(self, ids: Sequence[str], vectors: Embeddings) -> None:
+        """
+        Insert or replace vectors.
+
+        Args:
+            ids: Item IDs
+            vectors: Rows of shape (len(ids), dimension), used for bucketing
+                (and kept when the index has no vector source)
+        """
+        if len(ids) == 0:
+            return
+        ids = list(ids)
+        if self._vectors is not None:
+            vectors = as_float32(vectors).reshape(len(ids), self.dimension)
+
+        with self._lock:
+            self.remove([item_id for item_id in ids if item_id in self._where])
+            self._insert(ids, self._assign(vectors))
+            if self._vectors is not None:
+                self._vectors.update(zip(ids, vectors))
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Delete vectors by ID.
+
+        Args:
+            ids: Item IDs (unknown IDs are ignored)
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        with self._lock:
+            for item_id in ids:
+                location = self._where.pop(item_id, None)
+                if location is None:
+                    continue
+                list_no, position = location
+                # Move the last entry into the freed slot
+                bucket = self._lists[list_no]
+                last = bucket.pop()
+                if position < len(bucket):
+                    bucket[position] = last
+                    self._where[last] = (list_no, position)
+                if self._vectors is not None:
+                    del self._vectors[item_id]
+                removed += 1
+        return removed
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: Optional[int] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Find the k vectors with the highest dot product to the query.
+
+        Args:
+            query: Normalized query vector
+            k: Number of results
+            nprobe: Buckets to scan (uses the index default if None)
+
+        Returns:
+            Tuple of (ids, scores) ordered by decreasing score
+        """
+        query = np.asarray(query, dtype=np.float32)
+
+        with self._lock:
+            if self._centroids is None:
+                probed = [0]
+            else:
+                nprobe = min(nprobe or self.nprobe, len(self._lists))
+                centroid_scores = self._centroids @ query
+                probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+            ids: List[str] = []
+            for list_no in probed:
+                ids.extend(self._lists[list_no])
+            if self._vectors is not None:
+                ids, vectors = self._lookup(ids)
+
+        if self._vectors is None:
+            # Read candidate rows from the source without blocking writers
+            ids, vectors = self._lookup(ids)
+
+        if not ids or k <= 0:
+            return [], np.zeros(0, dtype=np.float32)
+
+        scores = similarity(query, vectors)
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [ids[i] for i in top], scores[top]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a .npz file.
+
+        Only bucket assignments are written when vectors come from a
+        source; the source supplies them again after `load`.
+
+        Args:
+            path: Destination file
+        """
+        with self._lock:
+            ids = [item_id for bucket in self._lists for item_id in bucket]
+            lists = np.array([self._where[item_id][0] for item_id in ids], dtype=np.int32)
+            arrays = {}
+            if self._vectors is not None:
+                arrays["vectors"] = self._lookup(ids)[1]
+            np.savez(
+                path,
+                centroids=self._centroids if self._centroids is not None else np.zeros((0, self.dimension), np.float32),
+                ids=np.array(ids, dtype=str),
+                lists=lists,
+                params=np.array([self.dimension, self.nlist, self.nprobe, self.trained_size], dtype=np.int64),
+                **arrays
+            )
+
+    @classmethod
+    def load(cls, path: str, vectors: Optional[VectorSource] = None) -> "IVFIndex":
+        """
+        Read an index written by `save`.
+
+        Args:
+            path: Source .npz file
+            vectors: Source of the indexed vectors (the file must hold the
+                vectors if None)
+
+        Returns:
+            Loaded index
+
+        Raises:
+            KeyError: If no source is given and the file holds no vectors
+        """
+        with np.load(path, allow_pickle=False) as data:
+            dimension, nlist, nprobe, trained_size = (int(v) for v in data["params"])
+            index = cls(dimension=dimension, nlist=nlist, nprobe=nprobe, vectors=vectors)
+            centroids = data["centroids"]
+            ids = data["ids"].tolist()
+            lists = data["lists"]
+            stored = data["vectors"].astype(np.float32) if vectors is None else None
+
+        if len(centroids):
+            index._centroids = centroids.astype(np.float32)
+            index._lists = [[] for _ in range(len(centroids))]
+        index.trained_size = trained_size
+
+        index._insert(ids, lists)
+        if stored is not None:
+            index._vectors = dict(zip(ids, stored))
+
+        return index
+
+    def stats(self) -> Dict[str, float]:
+        """Get index size counters."""
+        with self._lock:
+            sizes = [len(bucket) for bucket in self._lists]
+            return {
+                "vectors": len(self._where),
+                "trained": int(self.is_trained),
+                "lists": len(self._lists),
+                "nprobe": self.nprobe,
+                "max_list_size": max(sizes) if sizes else 0,
+                "vector_bytes": sum(v.nbytes for v in self._vectors.values()) if self._vectors else 0,
+            }
+
+    def _assign(self, vectors: Embeddings) -> np.ndarray:
+        """Bucket number for each row."""
+        if self._centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.argmax(similarity(self._centroids, vectors), axis=0)
+
+    def _insert(self, ids: Sequence[str], assignment: Sequence[int]) -> None:
+        for item_id, list_no in zip(ids, assignment):
+            bucket = self._lists[list_no]
+            self._where[item_id] = (int(list_no), len(bucket))
+            bucket.append(item_id)
+
+    def _lookup(self, ids: Sequence[str]) -> Tuple[List[str], Embeddings]:
+        """Vectors of the given IDs that are still present."""
+        if self._vectors is None:
+            return self._source(ids)
+        if not ids:
+            return [], np.zeros((0, self.dimension), dtype=np.float32)
+        return list(ids), np.stack([self._vectors[item_id] for item_id in ids])
@@ -0,0 +1,310 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by a hash of the model name and the exact text that
+was encoded, so an unchanged job posting or profile is never re-encoded.
+Two tiers are used: an in-process LRU with TTL eviction, and an optional
+SQLite file that survives restarts. Both tiers expire entries after the
+same TTL; the file is also pruned to EMBEDDING_CACHE_DISK_MAX_ENTRIES rows,
+dropping the oldest first.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import Config
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class _DiskTier:
+    """SQLite-backed persistent embedding store with TTL and row cap."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: int = 0):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite file
+            ttl: Row lifetime in seconds (None or <= 0 disables expiry)
+            max_entries: Rows kept after pruning (<= 0 disables the cap)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_entries = max(0, max_entries)
+        # Pruning scans the table, so it runs once per this many written rows
+        # (the file may exceed the cap by that much in between)
+        self._prune_every = max(1, self.max_entries // 10)
+        self._written_since_prune = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "  key TEXT PRIMARY KEY,"
+            "  dim INTEGER NOT NULL,"
+            "  vector BLOB NOT NULL,"
+            "  created_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)")
+        self._conn.commit()
+        self.prune()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Fetch stored vectors for the given keys."""
+        found: Dict[str, np.ndarray] = {}
+        cutoff = self._cutoff()
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings "
+                    f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*chunk, cutoff]
+                ).fetchall()
+            for key, dim, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if vector.size == dim:
+                    found[key] = vector
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Persist vectors, replacing existing rows."""
+        now = time.time()
+        rows = [
+            (key, int(vector.size), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._written_since_prune += len(rows)
+            if self._written_since_prune >= self._prune_every:
+                self._prune()
+
+    def prune(self) -> int:
+        """
+        Delete expired rows, then the oldest rows beyond max_entries.
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            return self._prune()
+
+    def _prune(self) -> int:
+        self._written_since_prune = 0
+        deleted = 0
+        if self.ttl is not None:
+            deleted += self._conn.execute(
+                "DELETE FROM embeddings WHERE created_at < ?", (self._cutoff(),)
+            ).rowcount
+        if self.max_entries:
+            excess = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+            if excess > 0:
+                deleted += self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY created_at, rowid LIMIT ?)",
+                    (excess,)
+                ).rowcount
+        self._conn.commit()
+        return deleted
+
+    def _cutoff(self) -> float:
+        # Rows created before this are expired
+        return time.time() - self.ttl if self.ttl is not None else float("-inf")
+
+    def count(self) -> int:
+        """Number of stored vectors."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache (memory LRU + optional SQLite file).
+
+    Cached vectors are returned read-only so callers cannot corrupt
+    shared entries.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            model_name: Embedding model the vectors belong to
+            max_entries: Memory tier capacity (uses config default if None)
+            ttl: TTL in seconds for both tiers (uses Config.CACHE_TTL if None)
+            path: SQLite file for the disk tier ("" disables it)
+            disk_max_entries: Disk tier row cap (uses Config.EMBEDDING_CACHE_DISK_MAX_ENTRIES if None)
+        """
+        self.model_name = model_name or Config.EMBEDDING_MODEL
+        ttl = Config.CACHE_TTL if ttl is None else ttl
+        self._memory = TTLCache(maxsize=max_entries or Config.EMBEDDING_CACHE_SIZE, ttl=ttl)
+
+        path = Config.EMBEDDING_CACHE_PATH if path is None else path
+        self._disk: Optional[_DiskTier] = None
+        if path:
+            try:
+                self._disk = _DiskTier(
+                    path,
+                    ttl=ttl,
+                    max_entries=(Config.EMBEDDING_CACHE_DISK_MAX_ENTRIES
+                                 if disk_max_entries is None else disk_max_entries)
+                )
+                logger.info(f"Embedding disk cache at {path}")
+            except Exception as e:
+                logger.warning(f"Embedding disk cache unavailable ({path}): {e}")
+
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        """Content address for a text under the current model."""
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding for a text.
+
+        Args:
+            text: Exact text that was encoded
+
+        Returns:
+            Cached vector or None
+        """
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings for several texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Dict mapping each cached text to its vector (misses are omitted)
+        """
+        found: Dict[str, np.ndarray] = {}
+        pending: Dict[str, str] = {}
+        seen = set()
+
+        for text in texts:
+            if text in seen:
+                continue
+            seen.add(text)
+            key = self.key(text)
+            vector = self._memory.get(key)
+            if vector is not None:
+                found[text] = vector
+            else:
+                pending[key] = text
+
+        if pending and self._disk is not None:
+            try:
+                stored = self._disk.get_many(list(pending))
+            except Exception as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+                stored = {}
+
+            for key, vector in stored.items():
+                vector.flags.writeable = False
+                self._memory.set(key, vector)
+                found[pending.pop(key)] = vector
+
+            with self._lock:
+                self.disk_hits += len(stored)
+
+        with self._lock:
+            self.misses += len(pending)
+
+        return found
+
+    def put(self, text: str, vector: np.ndarray) -> None:
+        """Store the embedding for a text."""
+        self.put_many({text: vector})
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """
+        Store embeddings for several texts in both tiers.
+
+        Args:
+            items: Dict mapping text to its embedding
+        """
+        if not items:
+            return
+
+        keyed = {}
+        for text, vector in items.items():
+            vector = np.array(vector, dtype=np.float32)
+            vector.flags.writeable = False
+            key = self.key(text)
+            self._memory.set(key, vector)
+            keyed[key] = vector
+
+        if self._disk is not None:
+            try:
+                self._disk.put_many(keyed)
+            except Exception as e:
+                logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is left untouched)."""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit/miss counters for monitoring."""
+        memory = self._memory.stats()
+        with self._lock:
+            disk_hits = self.disk_hits
+            misses = self.misses
+
+        lookups = memory["hits"] + disk_hits + misses
+        stats = {
+            "memory_hits": memory["hits"],
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "hit_rate": round((memory["hits"] + disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory["size"],
+            "memory_evictions": memory["evictions"],
+            "memory_expirations": memory["expirations"],
+            "disk_enabled": int(self._disk is not None),
+        }
+        if self._disk is not None:
+            try:
+                stats["disk_entries"] = self._disk.count()
+            except Exception:
+                pass
+        return stats
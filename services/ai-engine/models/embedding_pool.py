@@ -0,0 +1,167 @@
+"""
+Multi-process embedding worker pool.
+
+Tokenization and the Python side of `SentenceTransformer.encode` hold the
+GIL, so one process tops out at roughly one core. The pool runs N worker
+processes that each load the model once. Texts are split into contiguous
+row ranges; each worker writes its embeddings straight into one shared
+memory block owned by the caller, so results are not pickled back.
+"""
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Model loaded once per worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker() -> None:
+    """Load the embedding model in a freshly started worker process."""
+    global _worker_model
+    from models.embeddings import embedding_service
+
+    _worker_model = embedding_service.model
+
+
+def _encode_into(
+    texts: List[str],
+    batch_size: int,
+    shm_name: str,
+    start: int,
+    total: int,
+    dimension: int
+) -> int:
+    """Encode texts and write them into rows [start, start + len(texts)) of a shared block."""
+    embeddings = _worker_model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+    block = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray((total, dimension), dtype=np.float32, buffer=block.buf)
+        out[start:start + len(texts)] = embeddings
+        del out  # Release the buffer export before closing
+    finally:
+        block.close()
+    return len(texts)
+
+
+class EmbeddingProcessPool:
+    """
+    Pool of model-owning worker processes.
+
+    Workers are started with the "spawn" method (forking a process that
+    already runs PyTorch threads is unsafe) on the first encode call.
+    """
+
+    def __init__(self, processes: Optional[int] = None, dimension: Optional[int] = None):
+        """
+        Initialize the pool (processes start on first use).
+
+        Args:
+            processes: Worker processes (uses Config.EMBEDDING_PROCESSES if None)
+            dimension: Embedding dimension (uses config default if None)
+        """
+        self.processes = max(1, processes or Config.EMBEDDING_PROCESSES)
+        self.dimension = dimension or Config.EMBEDDING_DIMENSION
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.calls = 0
+        self.texts = 0
+        self.chunks = 0
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Embed texts across the worker processes.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Model batch size per worker (uses config default if None)
+
+        Returns:
+            Normalized embeddings of shape (len(texts), dimension)
+        """
+        total = len(texts)
+        if total == 0:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        batch_size = batch_size or Config.BATCH_SIZE
+        executor = self._get_executor()
+
+        # Never split below one model batch per worker
+        n_chunks = min(self.processes, math.ceil(total / batch_size))
+        chunk_size = math.ceil(total / n_chunks)
+
+        block = shared_memory.SharedMemory(create=True, size=total * self.dimension * 4)
+        try:
+            futures = [
+                executor.submit(
+                    _encode_into,
+                    texts[start:start + chunk_size],
+                    batch_size,
+                    block.name,
+                    start,
+                    total,
+                    self.dimension
+                )
+                for start in range(0, total, chunk_size)
+            ]
+            for future in futures:
+                future.result()
+
+            result = np.ndarray((total, self.dimension), dtype=np.float32, buffer=block.buf).copy()
+        finally:
+            block.close()
+            block.unlink()
+
+        with self._lock:
+            self.calls += 1
+            self.texts += total
+            self.chunks += len(futures)
+
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, float]:
+        """Get pool usage counters for monitoring."""
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "running": int(self._executor is not None),
+                "calls": self.calls,
+                "texts": self.texts,
+                "chunks": self.chunks,
+            }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting {self.processes} embedding worker processes")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
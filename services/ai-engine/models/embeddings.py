@@ -1,17 +1,42 @@
 """
 Embedding generation service using sentence-transformers.
 Provides semantic understanding of profiles and jobs.
+
+sentence-transformers (and with it torch) is imported only when the model
+is first needed, so importing this module is cheap.
 """
+import asyncio
+import os
+import threading
 import numpy as np
-from typing import List, Dict, Optional
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional, Union
 from functools import lru_cache
 import logging
 
 from config import Config
+from models.schemas import Job, UserProfile
+from utils.startup import startup_timer
+from models.embedding_cache import EmbeddingCache
+from models.micro_batcher import MicroBatcher
+from models.embedding_pool import EmbeddingProcessPool
+from models.quantization import Embeddings, similarity
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Embedding inputs: Pydantic models are read directly, no model_dump needed
+ProfileLike = Union[UserProfile, Dict]
+JobLike = Union[Job, Dict]
+
+
+def _field_getter(record: Any) -> Callable[..., Any]:
+    """Field accessor working on both dictionaries and attribute objects."""
+    if isinstance(record, dict):
+        return record.get
+    return lambda name, default=None: getattr(record, name, default)
+
 
 class EmbeddingService:
     """
@@ -20,7 +45,11 @@ class EmbeddingService:
     """
 
     _instance: Optional['EmbeddingService'] = None
-    _model: Optional[SentenceTransformer] = None
+    _model: Optional["SentenceTransformer"] = None
+    _model_lock = threading.Lock()
+    _cache: Optional[EmbeddingCache] = None
+    _batcher: Optional[MicroBatcher] = None
+    _pool: Optional[EmbeddingProcessPool] = None
 
     def __new__(cls):
         """Singleton pattern to ensure single model instance."""
@@ -29,27 +58,94 @@ class EmbeddingService:
         return cls._instance
 
     def __init__(self):
-        """Initialize the embedding model (lazy loading)."""
-        if self._model is None:
-            self._load_model()
+        """Initialize the service; the model itself is loaded on first use."""
+        if self._cache is None:
+            self._cache = EmbeddingCache(model_name=Config.EMBEDDING_MODEL)
+        if self._batcher is None and Config.MICRO_BATCH_ENABLED:
+            self._batcher = MicroBatcher(self._encode_and_cache)
+        if self._pool is None and Config.EMBEDDING_PROCESSES > 0:
+            # Worker processes start on the first batch, not at import
+            self._pool = EmbeddingProcessPool(Config.EMBEDDING_PROCESSES)
 
     def _load_model(self):
-        """Load the sentence transformer model."""
-        try:
-            logger.info(f"Loading embedding model: {Config.EMBEDDING_MODEL}")
-            self._model = SentenceTransformer(Config.EMBEDDING_MODEL)
-            logger.info(f"Model loaded successfully. Dimension: {Config.EMBEDDING_DIMENSION}")
-        except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}")
-            raise
+        """
+        Load the sentence transformer model.
+
+        Uses the local snapshot at Config.EMBEDDING_MODEL_PATH when present,
+        which avoids any hub lookup or download.
+        """
+        with self._model_lock:
+            if self._model is not None:
+                return
+
+            try:
+                with startup_timer.phase("model_import"):
+                    from sentence_transformers import SentenceTransformer
+
+                snapshot = Config.EMBEDDING_MODEL_PATH
+                source = snapshot if snapshot and os.path.isdir(snapshot) else Config.EMBEDDING_MODEL
+
+                logger.info(f"Loading embedding model: {source}")
+                with startup_timer.phase("model_load"):
+                    EmbeddingService._model = SentenceTransformer(source)
+                logger.info(f"Model loaded successfully. Dimension: {Config.EMBEDDING_DIMENSION}")
+            except Exception as e:
+                logger.error(f"Failed to load embedding model: {e}")
+                raise
 
     @property
-    def model(self) -> SentenceTransformer:
-        """Get the model instance."""
+    def model(self) -> "SentenceTransformer":
+        """Get the model instance, loading it on first use."""
         if self._model is None:
             self._load_model()
         return self._model
 
+    def warm_up(self) -> None:
+        """Load the model and run one encode so the first request is fast."""
+        model = self.model
+        with startup_timer.phase("model_warmup"):
+            model.encode(["warm up"], convert_to_numpy=True, show_progress_bar=False)
+
+    def save_snapshot(self, path: Optional[str] = None) -> str:
+        """
+        Serialize the model to a local directory for fast, offline loading.
+
+        Args:
+            path: Target directory (uses Config.EMBEDDING_MODEL_PATH if None)
+
+        Returns:
+            Directory the model was written to
+        """
+        path = path or Config.EMBEDDING_MODEL_PATH
+        if not path:
+            raise ValueError("No model snapshot path configured (EMBEDDING_MODEL_PATH)")
+
+        self.model.save(path)
+        logger.info(f"Embedding model snapshot saved to {path}")
+        return path
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        """Get the embedding cache."""
+        return self._cache
+
+    @property
+    def batcher(self) -> Optional[MicroBatcher]:
+        """Get the micro-batcher for single-text requests (None if disabled)."""
+        return self._batcher
+
+    @property
+    def pool(self) -> Optional[EmbeddingProcessPool]:
+        """Get the multi-process encoder (None if disabled)."""
+        return self._pool
+
+    def close(self) -> None:
+        """Stop background batching threads and worker processes."""
+        if self._batcher is not None:
+            self._batcher.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
@@ -61,19 +157,82 @@ class EmbeddingService:
             Embedding vector as numpy array
         """
         if not text or not text.strip():
-            return np.zeros(Config.EMBEDDING_DIMENSION)
+            return np.zeros(Config.EMBEDDING_DIMENSION, dtype=np.float32)
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
 
         try:
+            # Concurrent single-text requests share one encode call
+            if self._batcher is not None:
+                return self._batcher.embed(text)
+
             embedding = self.model.encode(
                 text,
                 convert_to_numpy=True,
                 normalize_embeddings=True,  # L2 normalization for cosine similarity
                 show_progress_bar=False
             )
+            self._cache.put(text, embedding)
             return embedding
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
-            return np.zeros(Config.EMBEDDING_DIMENSION)
+            return np.zeros(Config.EMBEDDING_DIMENSION, dtype=np.float32)
+
+    async def embed_text_async(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a single text through the micro-batcher from the event loop.
+
+        Awaiting the batch instead of blocking an inference thread on it
+        lets every in-flight request join the same encode call; callers on
+        the executor can only fill a batch up to its thread count.
+
+        Args:
+            text: Input text to embed
+
+        Returns:
+            Embedding vector, or None when micro-batching is disabled
+            (call embed_text on the executor instead)
+        """
+        if self._batcher is None:
+            return None
+        if not text or not text.strip():
+            return np.zeros(Config.EMBEDDING_DIMENSION, dtype=np.float32)
+
+        try:
+            # The cache is consulted on the batcher thread, not the event loop
+            return await asyncio.wrap_future(self._batcher.submit(text))
+        except Exception as e:
+            logger.error(f"Embedding generation failed: {e}")
+            return np.zeros(Config.EMBEDDING_DIMENSION, dtype=np.float32)
+
+    async def embed_profile_async(self, profile: ProfileLike) -> Optional[np.ndarray]:
+        """Embed a user profile from the event loop (see embed_text_async)."""
+        return await self.embed_text_async(self.build_profile_text(profile))
+
+    def _encode_and_cache(self, texts: List[str]) -> np.ndarray:
+        """Embed a micro-batch: cached texts are looked up, the rest encoded in one model call and stored."""
+        cached = self._cache.get_many(texts)
+        missing = [text for text in texts if text not in cached]
+        if missing:
+            fresh = dict(zip(missing, self._encode(missing, batch_size=len(missing))))
+            self._cache.put_many(fresh)
+            cached.update(fresh)
+        return np.stack([cached[text] for text in texts])
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Run the model on a list of texts, in worker processes if enabled."""
+        if self._pool is not None:
+            return self._pool.encode(texts, batch_size=batch_size)
+
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=len(texts) > 100
+        )
 
     def embed_batch(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
         """
@@ -92,94 +251,161 @@ class EmbeddingService:
         batch_size = batch_size or Config.BATCH_SIZE
 
         try:
-            embeddings = self.model.encode(
-                texts,
-                batch_size=batch_size,
-                convert_to_numpy=True,
-                normalize_embeddings=True,
-                show_progress_bar=len(texts) > 100
-            )
-            return embeddings
+            cached = self._cache.get_many(texts)
+            missing = list(dict.fromkeys(t for t in texts if t not in cached))
+
+            if missing:
+                encoded = self._encode(missing, batch_size)
+                fresh = dict(zip(missing, encoded))
+                self._cache.put_many(fresh)
+                cached.update(fresh)
+
+            return np.stack([cached[t] for t in texts])
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {e}")
-            return np.zeros((len(texts), Config.EMBEDDING_DIMENSION))
+            return np.zeros((len(texts), Config.EMBEDDING_DIMENSION), dtype=np.float32)
 
-    def embed_profile(self, profile: Dict) -> np.ndarray:
+    def embed_profile(self, profile: ProfileLike) -> np.ndarray:
         """
         Generate embedding for a user profile.
 
         Args:
-            profile: User profile dictionary
+            profile: User profile (model or dictionary)
 
         Returns:
             Profile embedding vector
         """
-        # Construct rich profile text
+        return self.embed_text(self.build_profile_text(profile))
+
+    def embed_profiles(self, profiles: List[ProfileLike]) -> np.ndarray:
+        """
+        Generate embeddings for many user profiles in batched model calls.
+
+        Produces the same vectors as calling embed_profile for each one.
+
+        Args:
+            profiles: User profiles (models or dictionaries)
+
+        Returns:
+            Array of shape (len(profiles), dimension)
+        """
+        embeddings = np.zeros((len(profiles), Config.EMBEDDING_DIMENSION), dtype=np.float32)
+        texts = [self.build_profile_text(profile) for profile in profiles]
+
+        # Empty profiles keep a zero vector, as in embed_text
+        rows = [i for i, text in enumerate(texts) if text.strip()]
+        if rows:
+            embeddings[rows] = self.embed_batch([texts[i] for i in rows])
+
+        return embeddings
+
+    def embed_job(self, job: JobLike) -> np.ndarray:
+        """
+        Generate embedding for a job posting.
+
+        Args:
+            job: Job posting (model or dictionary)
+
+        Returns:
+            Job embedding vector
+        """
+        return self.embed_text(self.build_job_text(job))
+
+    def embed_jobs(self, jobs: List[JobLike]) -> np.ndarray:
+        """
+        Generate embeddings for many job postings in batched model calls.
+
+        Produces the same vectors as calling embed_job for each posting,
+        but encodes them through embed_batch instead of one encode call
+        per job.
+
+        Args:
+            jobs: Job postings (models or dictionaries)
+
+        Returns:
+            Array of shape (len(jobs), dimension)
+        """
+        if not jobs:
+            return np.zeros((0, Config.EMBEDDING_DIMENSION), dtype=np.float32)
+
+        return self.embed_batch([self.build_job_text(job) for job in jobs])
+
+    @staticmethod
+    def build_profile_text(profile: ProfileLike) -> str:
+        """
+        Compose the text used to embed a user profile.
+
+        Args:
+            profile: User profile (model or dictionary)
+
+        Returns:
+            Profile text
+        """
+        get = _field_getter(profile)
         parts = []
 
         # Skills are most important
-        if profile.get('skills'):
-            parts.append(f"Skills: {', '.join(profile['skills'])}")
+        if get('skills'):
+            parts.append(f"Skills: {', '.join(get('skills'))}")
 
         # Roles and career goals
-        if profile.get('roles'):
-            parts.append(f"Target roles: {', '.join(profile['roles'])}")
+        if get('roles'):
+            parts.append(f"Target roles: {', '.join(get('roles'))}")
 
-        if profile.get('goal'):
-            parts.append(f"Career goal: {profile['goal']}")
+        if get('goal'):
+            parts.append(f"Career goal: {get('goal')}")
 
         # Experience context
-        if profile.get('experience_level'):
-            parts.append(f"Experience level: {profile['experience_level']}")
+        if get('experience_level'):
+            parts.append(f"Experience level: {get('experience_level')}")
 
-        if profile.get('years_of_experience'):
-            parts.append(f"{profile['years_of_experience']} years of experience")
+        if get('years_of_experience'):
+            parts.append(f"{get('years_of_experience')} years of experience")
 
         # Industries
-        if profile.get('industries'):
-            parts.append(f"Industries: {', '.join(profile['industries'])}")
+        if get('industries'):
+            parts.append(f"Industries: {', '.join(get('industries'))}")
 
         # Work preferences
-        if profile.get('work_style'):
-            parts.append(f"Prefers {profile['work_style']} work")
+        if get('work_style'):
+            parts.append(f"Prefers {get('work_style')} work")
 
         # CV text for deep semantic understanding
-        if profile.get('cv_text'):
-            parts.append(f"Background: {profile['cv_text'][:1000]}")  # Limit length
+        if get('cv_text'):
+            parts.append(f"Background: {get('cv_text')[:1000]}")  # Limit length
 
-        profile_text = ". ".join(parts)
-        return self.embed_text(profile_text)
+        return ". ".join(parts)
 
-    def embed_job(self, job: Dict) -> np.ndarray:
+    @staticmethod
+    def build_job_text(job: JobLike) -> str:
         """
-        Generate embedding for a job posting.
+        Compose the text used to embed a job posting.
 
         Args:
-            job: Job posting dictionary
+            job: Job posting (model or dictionary)
 
         Returns:
-            Job embedding vector
+            Job text
         """
-        # Construct rich job text
+        get = _field_getter(job)
         parts = [
-            f"Job title: {job.get('title', '')}",
-            f"Company: {job.get('company', '')}",
+            f"Job title: {get('title', '')}",
+            f"Company: {get('company', '')}",
         ]
 
-        if job.get('description'):
-            parts.append(f"Description: {job['description'][:500]}")  # Limit length
+        if get('description'):
+            parts.append(f"Description: {get('description')[:500]}")  # Limit length
 
-        if job.get('requirements'):
-            parts.append(f"Requirements: {', '.join(job['requirements'])}")
+        if get('requirements'):
+            parts.append(f"Requirements: {', '.join(get('requirements'))}")
 
-        if job.get('tags'):
-            parts.append(f"Tags: {', '.join(job['tags'])}")
+        if get('tags'):
+            parts.append(f"Tags: {', '.join(get('tags'))}")
 
-        if job.get('work_type'):
-            parts.append(f"Work type: {job['work_type']}")
+        if get('work_type'):
+            parts.append(f"Work type: {get('work_type')}")
 
-        job_text = ". ".join(parts)
-        return self.embed_text(job_text)
+        return ". ".join(parts)
 
     @staticmethod
     def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -201,6 +427,45 @@ class EmbeddingService:
         similarity = np.dot(a, b)
         return float(max(0.0, min(1.0, similarity)))  # Clamp to [0, 1]
 
+    @staticmethod
+    def cosine_similarity_batch(query: np.ndarray, matrix: Embeddings) -> np.ndarray:
+        """
+        Calculate cosine similarity between one vector and many.
+        Assumes vectors are already normalized (from embed_* methods).
+
+        Args:
+            query: Vector of shape (D,)
+            matrix: Matrix of shape (N, D), float32 or quantized
+
+        Returns:
+            Array of N similarity scores clamped to [0, 1]
+        """
+        if query.size == 0 or len(matrix) == 0:
+            return np.zeros(len(matrix), dtype=np.float32)
+
+        # One matrix-vector product for all rows
+        scores = similarity(query, matrix)
+        return np.clip(scores, 0.0, 1.0, out=scores)
+
+    @staticmethod
+    def cosine_similarity_matrix(queries: np.ndarray, matrix: Embeddings) -> np.ndarray:
+        """
+        Calculate cosine similarity between many vectors and many.
+        Assumes vectors are already normalized (from embed_* methods).
+
+        Args:
+            queries: Matrix of shape (Q, D)
+            matrix: Matrix of shape (N, D), float32 or quantized
+
+        Returns:
+            Array of shape (Q, N) with scores clamped to [0, 1]
+        """
+        if len(queries) == 0 or len(matrix) == 0:
+            return np.zeros((len(queries), len(matrix)), dtype=np.float32)
+
+        scores = similarity(queries, matrix)
+        return np.clip(scores, 0.0, 1.0, out=scores)
+
     def is_ready(self) -> bool:
         """Check if the embedding service is ready."""
         try:
@@ -0,0 +1,158 @@
+"""
+Dynamic micro-batching for single-text embedding requests.
+
+Concurrent requests each need one embedding, but the model is far more
+efficient encoding many texts in one call. The batcher collects texts
+submitted from any thread for up to `max_wait_ms` (or until `max_batch`
+texts are waiting), encodes them together, and resolves each caller's
+future with its own vector.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects single texts into batched encode calls on a background thread.
+
+    Futures returned by `submit` are concurrent.futures.Future objects, so
+    async callers can await them with asyncio.wrap_future.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        """
+        Initialize the batcher (the worker thread starts on first submit).
+
+        Args:
+            encode: Function embedding a list of texts into a (N, D) array
+            max_batch: Most texts per encode call (uses Config.MICRO_BATCH_MAX_SIZE if None)
+            max_wait_ms: Longest a text waits for companions
+                (uses Config.MICRO_BATCH_MAX_WAIT_MS if None)
+        """
+        self.encode = encode
+        self.max_batch = max(1, max_batch or Config.MICRO_BATCH_MAX_SIZE)
+        self.max_wait_ms = max(0.0, Config.MICRO_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms)
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.batches = 0
+        self.items = 0
+        self.failures = 0
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for the next batch.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Future resolving to the text's embedding vector
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one text through the batcher, blocking until it is encoded."""
+        return self.submit(text).result()
+
+    def close(self) -> None:
+        """Encode whatever is queued, then stop the worker thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> Dict[str, float]:
+        """Get batch size and fill-ratio counters for monitoring."""
+        with self._lock:
+            avg_batch = self.items / self.batches if self.batches else 0.0
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "failures": self.failures,
+                "pending": self._queue.qsize(),
+                "avg_batch_size": round(avg_batch, 2),
+                "fill_ratio": round(avg_batch / self.max_batch, 4),
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the deadline, still take anything already queued
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch: List[Tuple[str, Future]]) -> None:
+        # Identical texts from concurrent callers are encoded once
+        waiting: Dict[str, List[Future]] = {}
+        for text, future in batch:
+            if future.set_running_or_notify_cancel():
+                waiting.setdefault(text, []).append(future)
+
+        if not waiting:
+            return
+
+        texts = list(waiting)
+        try:
+            vectors = self.encode(texts)
+        except Exception as e:
+            logger.error(f"Micro-batch encode failed ({len(texts)} texts): {e}")
+            with self._lock:
+                self.failures += 1
+            for futures in waiting.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.items += len(texts)
+
+        for text, vector in zip(texts, vectors):
+            for future in waiting[text]:
+                future.set_result(vector)
@@ -0,0 +1,313 @@
+"""
+Compact embedding storage.
+
+Normalized embeddings can be stored as float16 (2x smaller) or as int8
+codes with one float32 scale per vector (about 4x smaller). Scores are
+computed directly from the compact form, decoding one block of rows at a
+time so no full float32 copy of the matrix is ever materialized.
+"""
+import logging
+import os
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scalar-quantize vectors to int8 with a per-vector scale.
+
+    Args:
+        vectors: Array of shape (N, D) (or (D,))
+
+    Returns:
+        Tuple of (int8 codes, float32 scales) with codes * scale ~= vectors
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1) / 127
+    safe = np.where(scales > 0, scales, 1.0)
+    codes = np.rint(vectors / safe[..., None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class QuantizedEmbeddings:
+    """
+    Read-only float16 or int8 embedding rows with float32 scoring.
+
+    `scales` is None for float16 rows.
+    """
+
+    __slots__ = ("codes", "scales")
+
+    # Rows decoded to float32 per step while scoring
+    BLOCK_ROWS = 16384
+
+    def __init__(self, codes: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.codes = codes
+        self.scales = scales
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, rows) -> "QuantizedEmbeddings":
+        return QuantizedEmbeddings(
+            self.codes[rows],
+            self.scales[rows] if self.scales is not None else None
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def dot(self, queries: np.ndarray) -> np.ndarray:
+        """
+        Dot products between queries and every stored row.
+
+        Args:
+            queries: Vector of shape (D,) or matrix of shape (Q, D)
+
+        Returns:
+            Scores of shape (N,) or (Q, N)
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        single = queries.ndim == 1
+        queries = np.atleast_2d(queries)
+
+        n = len(self.codes)
+        scores = np.empty((len(queries), n), dtype=np.float32)
+        for start in range(0, n, self.BLOCK_ROWS):
+            block = self.codes[start:start + self.BLOCK_ROWS].astype(np.float32)
+            np.matmul(queries, block.T, out=scores[:, start:start + len(block)])
+
+        if self.scales is not None:
+            scores *= self.scales
+
+        return scores[0] if single else scores
+
+    def to_float32(self) -> np.ndarray:
+        """Decode all rows to a float32 matrix."""
+        decoded = self.codes.astype(np.float32)
+        if self.scales is not None:
+            decoded *= self.scales[:, None]
+        return decoded
+
+
+Embeddings = Union[np.ndarray, QuantizedEmbeddings]
+
+
+def as_float32(embeddings: Embeddings) -> np.ndarray:
+    """Get embeddings as a float32 matrix, decoding quantized rows."""
+    if isinstance(embeddings, QuantizedEmbeddings):
+        return embeddings.to_float32()
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def similarity(queries: np.ndarray, embeddings: Embeddings) -> np.ndarray:
+    """
+    Dot products between queries and embedding rows of any storage type.
+
+    Args:
+        queries: Vector of shape (D,) or matrix of shape (Q, D)
+        embeddings: float32 matrix or quantized rows of shape (N, D)
+
+    Returns:
+        float32 scores of shape (N,) or (Q, N)
+    """
+    if isinstance(embeddings, QuantizedEmbeddings):
+        return embeddings.dot(queries)
+
+    embeddings = np.asarray(embeddings)
+    queries = np.asarray(queries).astype(embeddings.dtype, copy=False)
+    return queries @ embeddings.T if queries.ndim > 1 else embeddings @ queries
+
+
+class EmbeddingStore:
+    """
+    Growable row store for embeddings in float32, float16 or int8.
+
+    float32 rows are handed out as plain ndarrays; float16 and int8 rows
+    as QuantizedEmbeddings. Growing allocates new arrays, so views that
+    readers already hold are never modified. A store can be saved as flat
+    binary files and reopened read-only with np.memmap, letting several
+    processes share one copy through the page cache.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024, dtype: str = "float32"):
+        """
+        Initialize an empty store.
+
+        Args:
+            dimension: Embedding dimension
+            capacity: Rows allocated up front
+            dtype: Storage type, one of SUPPORTED_DTYPES
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype {dtype!r}, expected one of {SUPPORTED_DTYPES}")
+
+        self.dimension = dimension
+        self.dtype = dtype
+        self._codes, self._scales = self._allocate(max(1, capacity))
+
+    @property
+    def capacity(self) -> int:
+        return len(self._codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self._codes.nbytes + (self._scales.nbytes if self._scales is not None else 0)
+
+    @property
+    def memory_mapped(self) -> bool:
+        """Whether rows are backed by a memory-mapped file."""
+        return isinstance(self._codes, np.memmap)
+
+    def save(self, prefix: str, size: int) -> None:
+        """
+        Write the first `size` rows as flat binary files.
+
+        Files are written under temporary names and renamed into place, so
+        processes that have the previous files mapped keep a valid view.
+
+        Args:
+            prefix: Path prefix ("<prefix>.embeddings.bin", "<prefix>.scales.bin")
+            size: Rows to write
+        """
+        _write_flat(f"{prefix}.embeddings.bin", self._codes[:size])
+        if self._scales is not None:
+            _write_flat(f"{prefix}.scales.bin", self._scales[:size])
+
+    @classmethod
+    def open(cls, prefix: str, size: int, dimension: int, dtype: str) -> "EmbeddingStore":
+        """
+        Map files written by `save` read-only.
+
+        The mapped rows are never written: appending beyond them grows the
+        store into fresh in-memory arrays.
+
+        Args:
+            prefix: Path prefix passed to `save`
+            size: Number of rows in the files
+            dimension: Embedding dimension
+            dtype: Storage type the files were written with
+
+        Returns:
+            Store whose rows are backed by the files
+
+        Raises:
+            ValueError: If a file does not hold exactly `size` rows
+        """
+        store = cls(dimension, 1, dtype)
+        if size == 0:
+            return store
+
+        _check_size(f"{prefix}.embeddings.bin", size * dimension * np.dtype(dtype).itemsize)
+        if dtype == "int8":
+            _check_size(f"{prefix}.scales.bin", size * np.dtype(np.float32).itemsize)
+
+        store._codes = np.memmap(
+            f"{prefix}.embeddings.bin", dtype=np.dtype(dtype), mode="r", shape=(size, dimension)
+        )
+        if dtype == "int8":
+            store._scales = np.memmap(f"{prefix}.scales.bin", dtype=np.float32, mode="r", shape=(size,))
+        return store
+
+    def reserve(self, needed: int, used: int) -> None:
+        """
+        Grow (into new arrays) until `needed` rows fit, keeping the first `used`.
+
+        Memory-mapped rows are read-only, so a mapped store is always copied
+        into private memory here, even when the rows would fit.
+
+        Args:
+            needed: Required row count
+            used: Rows holding data
+        """
+        capacity = self.capacity
+        if needed <= capacity and not self.memory_mapped:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        codes, scales = self._allocate(capacity)
+        codes[:used] = self._codes[:used]
+        if scales is not None:
+            scales[:used] = self._scales[:used]
+        self._codes, self._scales = codes, scales
+
+    def write(self, start: int, vectors: np.ndarray) -> None:
+        """
+        Store vectors in consecutive rows.
+
+        Args:
+            start: First row to write
+            vectors: Array of shape (N, dimension)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        end = start + len(vectors)
+        if self.dtype == "int8":
+            self._codes[start:end], self._scales[start:end] = quantize_int8(vectors)
+        else:
+            self._codes[start:end] = vectors
+
+    def head(self, size: int) -> Embeddings:
+        """View of the first `size` rows (no copy)."""
+        return self._wrap(self._codes[:size], self._scales[:size] if self._scales is not None else None)
+
+    def take(self, rows: Sequence[int]) -> Embeddings:
+        """Copy of the given rows, in order."""
+        return self._wrap(self._codes[rows], self._scales[rows] if self._scales is not None else None)
+
+    def compacted(self, rows: Sequence[int], capacity: int) -> "EmbeddingStore":
+        """
+        New store holding only the given rows.
+
+        Args:
+            rows: Rows to keep, in order
+            capacity: Capacity of the new store
+
+        Returns:
+            Compacted store
+        """
+        store = EmbeddingStore(self.dimension, max(capacity, len(rows)), self.dtype)
+        store._codes[:len(rows)] = self._codes[rows]
+        if self._scales is not None:
+            store._scales[:len(rows)] = self._scales[rows]
+        return store
+
+    def _allocate(self, capacity: int) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        codes = np.zeros((capacity, self.dimension), dtype=np.dtype(self.dtype))
+        scales = np.zeros(capacity, dtype=np.float32) if self.dtype == "int8" else None
+        return codes, scales
+
+    def _wrap(self, codes: np.ndarray, scales: Optional[np.ndarray]) -> Embeddings:
+        if self.dtype == "float32":
+            return codes
+        return QuantizedEmbeddings(codes, scales)
+
+
+def _check_size(path: str, expected: int) -> None:
+    """Ensure a flat file holds exactly `expected` bytes before mapping it."""
+    actual = os.path.getsize(path)
+    if actual != expected:
+        raise ValueError(f"{path} holds {actual} bytes, expected {expected}")
+
+
+def _write_flat(path: str, array: np.ndarray) -> None:
+    """Write an array's raw bytes to a file, replacing it atomically."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.ascontiguousarray(array).tofile(f)
+    os.replace(tmp_path, path)
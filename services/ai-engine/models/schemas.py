@@ -59,7 +59,15 @@ class Job(BaseModel):
 class MatchRequest(BaseModel):
     """Request for job matching."""
     profile: UserProfile
-    jobs: List[Job]
+    jobs: List[Job] = Field(default_factory=list, description="Jobs to match against")
+    job_ids: Optional[List[str]] = Field(
+        None,
+        description="IDs of corpus jobs to match against (used when jobs is empty)"
+    )
+    use_corpus: bool = Field(
+        default=False,
+        description="Match against the whole job corpus (used when jobs and job_ids are empty)"
+    )
     limit: int = Field(default=10, ge=1, le=100, description="Max matches to return")
 
 
@@ -76,6 +84,51 @@ class MatchResult(BaseModel):
     missing_skills: List[str] = Field(default_factory=list, description="Skills gap")
 
 
+class BatchMatchRequest(BaseModel):
+    """Request for matching many profiles against one job set."""
+    profiles: List[UserProfile] = Field(..., description="Profiles to match")
+    jobs: List[Job] = Field(default_factory=list, description="Jobs shared by all profiles")
+    job_ids: Optional[List[str]] = Field(
+        None,
+        description="IDs of corpus jobs to match against (used when jobs is empty)"
+    )
+    use_corpus: bool = Field(
+        default=False,
+        description="Match against the whole job corpus (used when jobs and job_ids are empty)"
+    )
+    limit: int = Field(default=10, ge=1, le=100, description="Max matches per profile")
+
+
+class UserMatches(BaseModel):
+    """Ranked matches for one profile of a batch request."""
+    user_id: str
+    matches: List[MatchResult] = Field(default_factory=list)
+
+
+class CorpusDeleteRequest(BaseModel):
+    """Request to remove jobs from the corpus."""
+    job_ids: List[str] = Field(..., description="IDs of jobs to remove")
+
+
+class CorpusUpdateResult(BaseModel):
+    """Outcome of a corpus write."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    size: int = Field(..., description="Jobs in the corpus after the write")
+
+
+class TargetJobsUpdateResult(BaseModel):
+    """Outcome of a change to a user's saved target jobs."""
+    user_id: str
+    changed: int = Field(0, description="Jobs added or updated")
+    unchanged: int = 0
+    removed: int = 0
+    jobs: int = Field(..., description="Target jobs saved after the change")
+    skills: int = Field(..., description="Distinct required skills across them")
+
+
 class SkillGap(BaseModel):
     """Individual skill gap with learning recommendations."""
     skill: str
@@ -126,6 +179,16 @@ class HealthResponse(BaseModel):
     version: str
     model_loaded: bool
     checks: Dict[str, bool] = Field(default_factory=dict)
+    metrics: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="Runtime counters grouped by component"
+    )
+
+
+class SkillAnalysisWithPaths(BaseModel):
+    """Skill analysis and the learning paths derived from it."""
+    analysis: SkillAnalysisResult
+    learning_paths: List[LearningPath]
 
 
 class SkillGapRequest(BaseModel):
@@ -141,6 +204,31 @@ class SkillGapResponse(BaseModel):
     missing_skills: List[str] = Field(..., description="Skills the user needs to acquire")
 
 
+class UserSkillSet(BaseModel):
+    """One user's skills in a bulk skill gap request."""
+    user_id: str
+    user_skills: List[str] = Field(..., description="Skills the user currently has")
+
+
+class BulkSkillGapRequest(BaseModel):
+    """Skill gaps for many users against one required skill list."""
+    required_skills: List[str] = Field(..., description="Skills required for the target role/job")
+    users: List[UserSkillSet] = Field(..., description="Users to check")
+
+
+class UserSkillGap(BaseModel):
+    """One user's result in a bulk skill gap response."""
+    user_id: str
+    user_skills: List[str] = Field(..., description="Skills the user has")
+    missing_skills: List[str] = Field(..., description="Skills the user needs to acquire")
+
+
+class BulkSkillGapResponse(BaseModel):
+    """Bulk skill gap response, aligned with the request's users."""
+    required_skills: List[str] = Field(..., description="Skills required")
+    results: List[UserSkillGap]
+
+
 # Conversational AI Models
 class UserProfileContext(BaseModel):
     """Simplified user profile context for conversational AI."""
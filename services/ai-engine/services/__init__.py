@@ -4,9 +4,11 @@ AI Engine business logic services.
 from .matching import MatchingService
 from .skill_analysis import SkillAnalyzer
 from .recommendations import RecommendationEngine
+from .job_corpus import JobCorpus
 
 __all__ = [
     "MatchingService",
     "SkillAnalyzer",
     "RecommendationEngine",
+    "JobCorpus",
 ]
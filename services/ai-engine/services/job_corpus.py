@@ -0,0 +1,531 @@
+"""
+Server-side job corpus with a precomputed embedding matrix.
+Lets match requests reference jobs by ID instead of shipping them.
+"""
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config import Config
+from models.schemas import Job
+from models.embeddings import embedding_service
+from models.ann_index import IVFIndex
+from models.quantization import Embeddings, EmbeddingStore
+from services.seniority import seniority_classifier
+from services.skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+# Snapshot generation IDs (uuid4 hex)
+_GENERATION = re.compile(r"[0-9a-f]{32}")
+
+
+class CorpusSnapshot:
+    """
+    Consistent read-only view of the corpus.
+
+    Rows of `embeddings` and `skill_bits` line up with `jobs`. The view is
+    unaffected by later upserts or deletes. Embeddings are a float32
+    matrix, or QuantizedEmbeddings when the corpus stores float16/int8;
+    skill_bits holds each job's requirements packed over the shared skill
+    vocabulary (see JobBatch.pack_skills).
+    """
+
+    __slots__ = ("jobs", "embeddings", "skill_bits")
+
+    def __init__(self, jobs: List[Job], embeddings: Embeddings, skill_bits: np.ndarray):
+        self.jobs = jobs
+        self.embeddings = embeddings
+        self.skill_bits = skill_bits
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+
+class JobCorpus:
+    """
+    Registry of job postings and their normalized embeddings.
+
+    Embeddings live in one contiguous matrix (float32, or float16/int8 to
+    save memory on large corpora), next to a matrix of packed requirement
+    bits for skill scoring. Writers never modify
+    rows that readers may already hold: new and updated jobs are appended,
+    and replaced or deleted rows are tombstoned until the next compaction,
+    which builds fresh arrays. The bit matrix is also rebuilt, wider, when
+    the skill vocabulary outgrows it.
+    """
+
+    # Compact once this fraction of rows is dead
+    COMPACTION_RATIO = 0.10
+    MIN_COMPACTION_ROWS = 64
+
+    # Retrain the ANN index once the corpus has grown this much since training
+    ANN_RETRAIN_GROWTH = 4
+
+    def __init__(
+        self,
+        embedder=None,
+        dimension: Optional[int] = None,
+        initial_capacity: int = 1024,
+        ann_enabled: Optional[bool] = None,
+        dtype: Optional[str] = None
+    ):
+        """
+        Initialize an empty corpus.
+
+        Args:
+            embedder: Embedding service (uses the global instance if None)
+            dimension: Embedding dimension (uses config default if None)
+            initial_capacity: Rows allocated up front
+            ann_enabled: Maintain an ANN index (uses Config.ANN_ENABLED if None)
+            dtype: Embedding storage type: float32, float16 or int8
+                (uses Config.CORPUS_EMBEDDING_DTYPE if None)
+        """
+        self.embedder = embedder or embedding_service
+        self.dimension = dimension or Config.EMBEDDING_DIMENSION
+
+        ann_enabled = Config.ANN_ENABLED if ann_enabled is None else ann_enabled
+        # The index reads vectors from the store rather than keeping a copy
+        self.index: Optional[IVFIndex] = (
+            IVFIndex(self.dimension, vectors=self._index_vectors) if ann_enabled else None
+        )
+
+        self._lock = threading.RLock()
+        self._store = EmbeddingStore(
+            self.dimension,
+            initial_capacity,
+            dtype or Config.CORPUS_EMBEDDING_DTYPE
+        )
+        # Row-aligned packed requirements, widened as the vocabulary grows
+        self._skill_bits = np.zeros((initial_capacity, 1), dtype=np.uint64)
+        self._jobs: List[Optional[Job]] = []  # Row-aligned, None for dead rows
+        self._rows: Dict[str, int] = {}  # job_id -> live row
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._rows
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        with self._lock:
+            row = self._rows.get(job_id)
+            return self._jobs[row] if row is not None else None
+
+    def upsert(self, jobs: Iterable[Job]) -> Dict[str, int]:
+        """
+        Insert new jobs and replace changed ones.
+
+        Only new or modified postings are embedded, in one batched call.
+
+        Args:
+            jobs: Jobs to insert or update
+
+        Returns:
+            Counts of inserted, updated and unchanged jobs
+        """
+        # Last occurrence wins for duplicate IDs within one call
+        incoming = {job.job_id: job for job in jobs}
+
+        with self._lock:
+            changed = [
+                job for job_id, job in incoming.items()
+                if self.get(job_id) != job
+            ]
+        unchanged = len(incoming) - len(changed)
+        if not changed:
+            return {"inserted": 0, "updated": 0, "unchanged": unchanged}
+
+        # Embed outside the lock so readers are not blocked on the model
+        embeddings = self.embedder.embed_jobs(changed)
+        # Structured features depend only on the posting, so infer them once here
+        seniority_classifier.warm(changed)
+        req_ids = [skill_index.intern_all(job.requirements) for job in changed]
+
+        inserted = updated = 0
+        with self._lock:
+            self._store.reserve(len(self._jobs) + len(changed), len(self._jobs))
+            self._store.write(len(self._jobs), embeddings)
+            self._write_skill_bits(len(self._jobs), req_ids)
+            for job in changed:
+                old_row = self._rows.get(job.job_id)
+                if old_row is not None:
+                    self._kill(old_row)
+                    updated += 1
+                else:
+                    inserted += 1
+
+                row = len(self._jobs)
+                self._jobs.append(job)
+                self._rows[job.job_id] = row
+
+            self._maybe_compact()
+
+        if self.index is not None:
+            self.index.add([job.job_id for job in changed], embeddings)
+            self._maybe_train_index()
+
+        logger.info(f"Corpus upsert: {inserted} inserted, {updated} updated, {unchanged} unchanged")
+
+        return {"inserted": inserted, "updated": updated, "unchanged": unchanged}
+
+    def delete(self, job_ids: Iterable[str]) -> int:
+        """
+        Remove jobs from the corpus.
+
+        Args:
+            job_ids: IDs to remove (unknown IDs are ignored)
+
+        Returns:
+            Number of jobs removed
+        """
+        job_ids = list(job_ids)
+        removed = 0
+        with self._lock:
+            for job_id in job_ids:
+                row = self._rows.pop(job_id, None)
+                if row is not None:
+                    self._kill(row)
+                    removed += 1
+            self._maybe_compact()
+
+        if self.index is not None and removed:
+            self.index.remove(job_ids)
+
+        if removed:
+            logger.info(f"Corpus delete: {removed} jobs removed")
+
+        return removed
+
+    def load(self, jobs: Iterable[Job]) -> Dict[str, int]:
+        """
+        Replace the whole corpus (bulk load).
+
+        Jobs already present with identical content keep their embeddings.
+
+        Args:
+            jobs: Complete set of jobs
+
+        Returns:
+            Counts of inserted, updated, unchanged and deleted jobs
+        """
+        jobs = list(jobs)
+        keep = {job.job_id for job in jobs}
+
+        with self._lock:
+            stale = [job_id for job_id in self._rows if job_id not in keep]
+        deleted = self.delete(stale)
+
+        result = self.upsert(jobs)
+        result["deleted"] = deleted
+        return result
+
+    def snapshot(self, job_ids: Optional[List[str]] = None) -> CorpusSnapshot:
+        """
+        Get jobs and their embedding rows for matching.
+
+        Args:
+            job_ids: Restrict to these IDs, in this order (unknown IDs are
+                skipped). None selects the whole corpus.
+
+        Returns:
+            Corpus snapshot
+        """
+        with self._lock:
+            if job_ids is not None:
+                rows = [self._rows[job_id] for job_id in job_ids if job_id in self._rows]
+                return CorpusSnapshot(
+                    [self._jobs[row] for row in rows],
+                    self._store.take(rows),
+                    self._skill_bits[rows]
+                )
+
+            if self._dead:
+                self._compact()
+
+            size = len(self._jobs)
+            # Rows below `size` are never rewritten, so a view is safe to share
+            return CorpusSnapshot(list(self._jobs), self._store.head(size), self._skill_bits[:size])
+
+    def save(self, path: Optional[str] = None) -> int:
+        """
+        Write the corpus to flat files that `restore` can memory-map.
+
+        Every save is a new generation: "<path>.<generation>.embeddings.bin"
+        (plus ".scales.bin" for int8), the row-aligned job table
+        "<path>.<generation>.jobs.json" and, when trained, the ANN index
+        "<path>.<generation>.ann.npz" are written first, then
+        "<path>.meta.json" is atomically replaced to point at them. A
+        restore racing a save therefore sees either the old set or the new
+        one, never a mix. Files of older generations are removed, except
+        the previous one, which a concurrent restore may still be opening.
+
+        Args:
+            path: File prefix (uses Config.CORPUS_SNAPSHOT_PATH if None)
+
+        Returns:
+            Number of jobs written
+        """
+        path = path or Config.CORPUS_SNAPSHOT_PATH
+        if not path:
+            raise ValueError("No corpus snapshot path configured (CORPUS_SNAPSHOT_PATH)")
+
+        with self._lock:
+            if self._dead:
+                self._compact()
+            jobs = list(self._jobs)
+            store = self._store
+        index = self.index
+
+        previous = _read_meta(path).get("generation")
+        generation = uuid.uuid4().hex
+        prefix = f"{path}.{generation}"
+
+        # Rows below len(jobs) are never rewritten, so the lock is not needed
+        store.save(prefix, len(jobs))
+        _write_json(f"{prefix}.jobs.json", [job.model_dump(mode="json") for job in jobs])
+        # Saved so restoring workers skip k-means; checked against the job table on restore
+        ann = index is not None and index.is_trained
+        if ann:
+            index.save(f"{prefix}.ann.npz")
+        _write_json(f"{path}.meta.json", {
+            "model": Config.EMBEDDING_MODEL,
+            "dimension": self.dimension,
+            "dtype": store.dtype,
+            "jobs": len(jobs),
+            "generation": generation,
+            "ann": ann,
+        })
+        _remove_generations(path, keep={generation, previous})
+
+        logger.info(f"Corpus saved: {len(jobs)} jobs to {path}")
+        return len(jobs)
+
+    def restore(self, path: Optional[str] = None) -> bool:
+        """
+        Replace the corpus with one written by `save`.
+
+        Embeddings are memory-mapped read-only, so every process restoring
+        the same files shares one copy through the page cache and nothing
+        is re-encoded. Later upserts grow into private memory.
+
+        Args:
+            path: File prefix (uses Config.CORPUS_SNAPSHOT_PATH if None)
+
+        Returns:
+            True if restored, False if there is no compatible snapshot
+        """
+        path = path or Config.CORPUS_SNAPSHOT_PATH
+        if not path or not os.path.exists(f"{path}.meta.json"):
+            return False
+
+        meta = _read_meta(path)
+        if meta.get("model") != Config.EMBEDDING_MODEL or meta.get("dimension") != self.dimension:
+            logger.warning(
+                f"Ignoring corpus snapshot {path}: built with {meta.get('model')} "
+                f"({meta.get('dimension')}d), running {Config.EMBEDDING_MODEL} ({self.dimension}d)"
+            )
+            return False
+
+        # Snapshots written before generations were introduced use the bare prefix
+        prefix = f"{path}.{meta['generation']}" if meta.get("generation") else path
+        try:
+            with open(f"{prefix}.jobs.json") as f:
+                jobs = [Job(**data) for data in json.load(f)]
+            if len(jobs) != meta.get("jobs"):
+                raise ValueError(f"job table holds {len(jobs)} jobs, metadata says {meta.get('jobs')}")
+            store = EmbeddingStore.open(prefix, len(jobs), self.dimension, meta["dtype"])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring corpus snapshot {path}: {e}")
+            return False
+        # Skill IDs are per process, so requirements are packed afresh
+        req_ids = [skill_index.intern_all(job.requirements) for job in jobs]
+
+        with self._lock:
+            self._store = store
+            self._skill_bits = np.zeros((len(jobs), 1), dtype=np.uint64)
+            self._write_skill_bits(0, req_ids)
+            self._jobs = list(jobs)
+            self._rows = {job.job_id: row for row, job in enumerate(jobs)}
+            self._dead = 0
+
+        if self.index is not None:
+            index = self._load_index(f"{prefix}.ann.npz", jobs) if meta.get("ann") else None
+            if index is not None:
+                self.index = index
+            else:
+                # Untrained or unusable: rebuild from the mapped rows
+                self.index = IVFIndex(self.dimension, vectors=self._index_vectors)
+                if jobs:
+                    self.index.add([job.job_id for job in jobs], store.head(len(jobs)))
+                    self._maybe_train_index()
+
+        logger.info(f"Corpus restored: {len(jobs)} jobs from {path} ({meta['dtype']}, memory-mapped)")
+        return True
+
+    def _load_index(self, ann_path: str, jobs: List[Job]) -> Optional[IVFIndex]:
+        """Load a saved ANN index if it covers exactly the given jobs."""
+        try:
+            index = IVFIndex.load(ann_path, vectors=self._index_vectors)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load ANN index {ann_path}, rebuilding: {e}")
+            return None
+
+        if (
+            index.dimension != self.dimension
+            or len(index) != len(jobs)
+            or not all(job.job_id in index for job in jobs)
+        ):
+            logger.warning(f"ANN index {ann_path} does not match the job table, rebuilding")
+            return None
+        return index
+
+    def candidate_ids(self, query: np.ndarray, k: int) -> Optional[List[str]]:
+        """
+        Retrieve likely top-k job IDs from the ANN index.
+
+        Args:
+            query: Normalized profile embedding
+            k: Number of candidates
+
+        Returns:
+            Candidate job IDs, or None when the index is disabled or the
+            corpus is too small to benefit from it
+        """
+        if (
+            self.index is None
+            or not self.index.is_trained
+            or len(self) < Config.ANN_MIN_CORPUS_SIZE
+            or k >= len(self)
+        ):
+            return None
+
+        ids, _ = self.index.search(query, k)
+        return ids
+
+    def build_index(self) -> None:
+        """(Re)train the ANN index on the current corpus."""
+        if self.index is None:
+            self.index = IVFIndex(self.dimension, vectors=self._index_vectors)
+        self.index.train(self.snapshot().embeddings)
+
+    def stats(self) -> Dict[str, float]:
+        """Get corpus size counters."""
+        with self._lock:
+            stats = {
+                "jobs": len(self._rows),
+                "rows": len(self._jobs),
+                "dead_rows": self._dead,
+                "capacity": self._store.capacity,
+                "dimension": self.dimension,
+                "matrix_bytes": self._store.nbytes,
+                "skill_bits_bytes": self._skill_bits.nbytes,
+                "memory_mapped": int(self._store.memory_mapped),
+            }
+        if self.index is not None:
+            stats.update({f"ann_{key}": value for key, value in self.index.stats().items()})
+        return stats
+
+    def _maybe_train_index(self) -> None:
+        """Train the index once the corpus is large enough, and retrain as it grows."""
+        size = len(self)
+        if size < Config.ANN_MIN_CORPUS_SIZE:
+            return
+        if not self.index.is_trained or size >= self.index.trained_size * self.ANN_RETRAIN_GROWTH:
+            self.build_index()
+
+    def _index_vectors(self, job_ids: List[str]) -> Tuple[List[str], Embeddings]:
+        """Stored embeddings of the given jobs that are still present (ANN vector source)."""
+        with self._lock:
+            rows = list(map(self._rows.get, job_ids))
+            if None in rows:
+                job_ids = [job_id for job_id, row in zip(job_ids, rows) if row is not None]
+                rows = [row for row in rows if row is not None]
+            return list(job_ids), self._store.take(np.array(rows, dtype=np.int64))
+
+    def _write_skill_bits(self, start: int, req_ids: List[List[int]]) -> None:
+        """Pack interned requirements into rows from `start` (hold the lock)."""
+        stop = start + len(req_ids)
+        old_capacity, old_words = self._skill_bits.shape
+        capacity, words = old_capacity, old_words
+        # Rows and columns grow independently: rows double when full, columns
+        # widen with headroom so a growing vocabulary does not copy the
+        # matrix on every upsert
+        if stop > capacity:
+            capacity = max(stop, capacity * 2)
+        needed = skill_index.words()
+        if needed > words:
+            words = max(needed, words + words // 4)
+        if (capacity, words) != (old_capacity, old_words):
+            # Fresh array, so snapshots keep their rows
+            grown = np.zeros((capacity, words), dtype=np.uint64)
+            grown[:start, :old_words] = self._skill_bits[:start]
+            self._skill_bits = grown
+        self._skill_bits[start:stop] = skill_index.bitsets(req_ids, words)
+
+    def _kill(self, row: int) -> None:
+        """Tombstone a row."""
+        self._jobs[row] = None
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        if self._dead >= max(self.MIN_COMPACTION_ROWS, len(self._jobs) * self.COMPACTION_RATIO):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild arrays without dead rows."""
+        live = [row for row, job in enumerate(self._jobs) if job is not None]
+
+        capacity = max(len(live) * 2, 16)
+        self._store = self._store.compacted(live, capacity)
+        skill_bits = np.zeros((capacity, self._skill_bits.shape[1]), dtype=np.uint64)
+        skill_bits[:len(live)] = self._skill_bits[live]
+        self._skill_bits = skill_bits
+        self._jobs = [self._jobs[row] for row in live]
+        self._rows = {job.job_id: row for row, job in enumerate(self._jobs)}
+        self._dead = 0
+
+
+def _read_meta(path: str) -> Dict:
+    """Read "<path>.meta.json" (empty if there is none)."""
+    try:
+        with open(f"{path}.meta.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _remove_generations(path: str, keep: Set[Optional[str]]) -> None:
+    """Delete snapshot files of generations not in `keep`."""
+    for file_path in glob.glob(f"{glob.escape(path)}.*"):
+        generation = file_path[len(path) + 1:].split(".", 1)[0]
+        if _GENERATION.fullmatch(generation) and generation not in keep:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+
+def _write_json(path: str, data) -> None:
+    """Write JSON to a file, replacing it atomically."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+# Global corpus instance
+job_corpus = JobCorpus()
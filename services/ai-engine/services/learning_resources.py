@@ -0,0 +1,185 @@
+"""
+Learning resource catalog.
+
+Resources for a skill depend only on the skill, so they are built once per
+skill and kept in a bounded LRU. Platform search links are generated from
+templates; a curated file (LEARNING_RESOURCES_PATH) can add hand-picked
+courses per canonical skill:
+
+- JSON: {"python": [{"title": "...", "url": "..."}, ...], ...}
+- SQLite (.db/.sqlite/.sqlite3): table resources(skill, title, url),
+  looked up per skill on a cache miss, so large catalogs stay on disk.
+
+Curated resources are listed before the platform search links.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from services.skill_index import normalize_skill
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Learning resource templates (can be expanded with real APIs)
+LEARNING_PLATFORMS = {
+    'coursera': 'https://www.coursera.org/search?query=',
+    'udemy': 'https://www.udemy.com/courses/search/?q=',
+    'pluralsight': 'https://www.pluralsight.com/search?q=',
+    'linkedin_learning': 'https://www.linkedin.com/learning/search?keywords=',
+}
+
+# Platforms linked from skill gaps and from learning paths
+GAP_PLATFORMS = 2
+PATH_PLATFORMS = 3
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+_PLATFORM_ITEMS = list(LEARNING_PLATFORMS.items())
+_PLATFORM_NAMES = {platform: platform.replace('_', ' ').title() for platform in LEARNING_PLATFORMS}
+
+
+class SkillResources:
+    """Prebuilt resources for one skill (shared, read-only)."""
+
+    __slots__ = ("gap_resources", "path_resources")
+
+    def __init__(self, gap_resources: Tuple[str, ...], path_resources: Tuple[Tuple[str, str], ...]):
+        self.gap_resources = gap_resources
+        self.path_resources = path_resources
+
+
+class LearningResourceCatalog:
+    """Memoized per-skill learning resources with an optional curated source."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the catalog (the curated file is opened on first use).
+
+        Args:
+            path: Curated JSON or SQLite file (uses Config.LEARNING_RESOURCES_PATH
+                if None; empty uses platform links only)
+            max_entries: Skills kept in memory (uses Config.LEARNING_RESOURCE_CACHE_SIZE if None)
+        """
+        self.path = Config.LEARNING_RESOURCES_PATH if path is None else path
+        self._cache = TTLCache(maxsize=max_entries or Config.LEARNING_RESOURCE_CACHE_SIZE)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._curated: Dict[str, List[Tuple[str, str]]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def gap_resources(self, skill: str) -> List[str]:
+        """
+        Resource lines for a SkillGap ("Title: url").
+
+        Args:
+            skill: Skill name
+
+        Returns:
+            Curated resources followed by platform search links
+        """
+        return list(self._resources(skill).gap_resources)
+
+    def path_resources(self, skill: str) -> List[Dict[str, str]]:
+        """
+        Resources for a LearningPath.
+
+        Args:
+            skill: Skill name
+
+        Returns:
+            Resource dicts with title and url (fresh dicts, safe to modify)
+        """
+        return [{'title': title, 'url': url} for title, url in self._resources(skill).path_resources]
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters for monitoring."""
+        stats = self._cache.stats()
+        stats["curated_skills"] = len(self._curated)
+        return stats
+
+    def close(self) -> None:
+        """Close the curated SQLite connection, if any."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _resources(self, skill: str) -> SkillResources:
+        # Keyed by the skill as written: titles and queries echo its casing
+        resources = self._cache.get(skill)
+        if resources is None:
+            resources = self._build(skill)
+            self._cache.set(skill, resources)
+        return resources
+
+    def _build(self, skill: str) -> SkillResources:
+        curated = self._lookup(normalize_skill(skill))
+        skill_query = skill.replace(' ', '+')
+
+        gap_resources = tuple(f"{title}: {url}" for title, url in curated) + tuple(
+            f"{_PLATFORM_NAMES[platform]}: {url}{skill_query}"
+            for platform, url in _PLATFORM_ITEMS[:GAP_PLATFORMS]
+        )
+        path_resources = tuple(curated) + tuple(
+            (f"Learn {skill} on {_PLATFORM_NAMES[platform]}", f"{base_url}{skill_query}")
+            for platform, base_url in _PLATFORM_ITEMS[:PATH_PLATFORMS]
+        )
+        return SkillResources(gap_resources, path_resources)
+
+    def _lookup(self, canonical: str) -> List[Tuple[str, str]]:
+        self._load()
+        if self._conn is None:
+            return self._curated.get(canonical, [])
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, url FROM resources WHERE skill = ? ORDER BY rowid", (canonical,)
+            ).fetchall()
+        return [(title, url) for title, url in rows]
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+
+            if not self.path:
+                return
+            if not os.path.exists(self.path):
+                logger.warning(f"Learning resource file {self.path} not found, using platform links only")
+                return
+
+            try:
+                if self.path.endswith(SQLITE_EXTENSIONS):
+                    self._conn = sqlite3.connect(
+                        f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+                    )
+                    self._conn.execute("SELECT skill, title, url FROM resources LIMIT 1")
+                    logger.info(f"Learning resources: querying {self.path}")
+                    return
+
+                with open(self.path) as f:
+                    data = json.load(f)
+                self._curated = {
+                    normalize_skill(skill): [(item['title'], item['url']) for item in items]
+                    for skill, items in data.items()
+                }
+                logger.info(f"Learning resources: {len(self._curated)} curated skills from {self.path}")
+            except (OSError, ValueError, KeyError, TypeError, sqlite3.Error) as e:
+                logger.error(f"Failed to load learning resources from {self.path}: {e}")
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                self._curated = {}
+
+
+# Global catalog instance
+learning_resources = LearningResourceCatalog()
@@ -2,14 +2,49 @@
 Intelligent job matching service.
 Combines semantic similarity with structured data scoring.
 """
+import heapq
 import logging
-from typing import List, Dict, Set
+from typing import List, Dict, Iterator, Set, Optional, Union
+import numpy as np
+from config import Config
 from models.schemas import UserProfile, Job, MatchResult
 from models.embeddings import embedding_service
+from models.quantization import Embeddings
+from services.job_batch import JobBatch
+from services.seniority import SENIORITY_LEVELS, infer_job_level
+from services.job_corpus import JobCorpus
+from services.skill_index import SkillIndex, SkillOverlay, skill_index, popcount
+from services.skill_synonyms import skill_synonyms
 
 logger = logging.getLogger(__name__)
 
 
+class MatchComponents:
+    """Numeric score components of one candidate job (stage-1 ranking record)."""
+
+    __slots__ = (
+        "match_score",
+        "semantic_score",
+        "skill_score",
+        "experience_score",
+        "location_score",
+    )
+
+    def __init__(
+        self,
+        match_score: float,
+        semantic_score: float,
+        skill_score: float,
+        experience_score: float,
+        location_score: float
+    ):
+        self.match_score = match_score
+        self.semantic_score = semantic_score
+        self.skill_score = skill_score
+        self.experience_score = experience_score
+        self.location_score = location_score
+
+
 class MatchingService:
     """
     Multi-factor job matching engine.
@@ -37,7 +72,10 @@ class MatchingService:
         self,
         profile: UserProfile,
         jobs: List[Job],
-        limit: int = 10
+        limit: int = 10,
+        job_embeddings: Optional[Embeddings] = None,
+        profile_embedding: Optional[np.ndarray] = None,
+        job_skill_bits: Optional[np.ndarray] = None
     ) -> List[MatchResult]:
         """
         Generate intelligent job matches for a user profile.
@@ -46,6 +84,9 @@ class MatchingService:
             profile: User profile to match
             jobs: Available jobs to match against
             limit: Maximum number of matches to return
+            job_embeddings: Precomputed float32 or quantized job embeddings, computed if None
+            profile_embedding: Precomputed profile embedding
+            job_skill_bits: Packed job requirements (see JobBatch.pack_skills), packed if None
 
         Returns:
             Ranked list of job matches with scores and reasoning
@@ -56,69 +97,308 @@ class MatchingService:
         logger.info(f"Matching profile {profile.user_id} against {len(jobs)} jobs")
 
         # Generate embeddings
-        profile_embedding = self.embedder.embed_profile(profile.dict())
-        job_embeddings = [self.embedder.embed_job(job.dict()) for job in jobs]
+        if profile_embedding is None:
+            profile_embedding = self.embedder.embed_profile(profile)
+        if job_embeddings is None:
+            job_embeddings = self.embedder.embed_jobs(jobs)
+
+        # Semantic similarity for every job in one matrix-vector product
+        semantic_scores = self.embedder.cosine_similarity_batch(
+            profile_embedding,
+            job_embeddings
+        ).astype(np.float64) * 100
+
+        return self._rank_jobs(
+            profile, jobs, semantic_scores, limit, batch=JobBatch(jobs, skill_bits=job_skill_bits)
+        )
+
+    def match_profile_to_corpus(
+        self,
+        profile: UserProfile,
+        corpus: JobCorpus,
+        job_ids: Optional[List[str]] = None,
+        limit: int = 10,
+        profile_embedding: Optional[np.ndarray] = None
+    ) -> List[MatchResult]:
+        """
+        Match a profile against jobs held in the server-side corpus.
+
+        Uses the corpus' precomputed embeddings, so no job is re-encoded.
+        For whole-corpus matches on a large corpus, the ANN index first
+        retrieves a semantic shortlist, which then gets full multi-factor
+        scoring.
+
+        Args:
+            profile: User profile to match
+            corpus: Job corpus
+            job_ids: Restrict matching to these corpus IDs (None = whole corpus)
+            limit: Maximum number of matches to return
+            profile_embedding: Precomputed profile embedding
+
+        Returns:
+            Ranked list of job matches with scores and reasoning
+        """
+        if profile_embedding is None:
+            profile_embedding = self.embedder.embed_profile(profile)
+
+        if job_ids is None:
+            # Candidate generation stage
+            candidates = corpus.candidate_ids(
+                profile_embedding,
+                max(Config.ANN_CANDIDATES, limit * 10)
+            )
+            if candidates is not None:
+                logger.info(f"ANN retrieved {len(candidates)} of {len(corpus)} corpus jobs")
+                job_ids = candidates
+
+        snapshot = corpus.snapshot(job_ids)
+
+        if job_ids is not None and len(snapshot) < len(job_ids):
+            logger.warning(f"{len(job_ids) - len(snapshot)} requested job IDs are not in the corpus")
+
+        return self.match_profile_to_jobs(
+            profile,
+            snapshot.jobs,
+            limit=limit,
+            job_embeddings=snapshot.embeddings,
+            profile_embedding=profile_embedding,
+            job_skill_bits=snapshot.skill_bits
+        )
+
+    def match_profiles_to_jobs(
+        self,
+        profiles: List[UserProfile],
+        jobs: List[Job],
+        limit: int = 10,
+        job_embeddings: Optional[Embeddings] = None,
+        job_skill_bits: Optional[np.ndarray] = None
+    ) -> List[List[MatchResult]]:
+        """
+        Match many profiles against one shared job set.
+
+        Jobs are embedded and columnized once; profiles are embedded together,
+        and semantic scores for a chunk of profiles come from a single
+        (P x D) . (D x N) matrix product.
+
+        Args:
+            profiles: User profiles to match
+            jobs: Shared jobs to match against
+            limit: Maximum number of matches per profile
+            job_embeddings: Precomputed job embeddings aligned with jobs
+                (float32 or quantized)
+            job_skill_bits: Packed job requirements, packed if None
+
+        Returns:
+            Ranked match lists aligned with profiles
+        """
+        results = []
+        for chunk in self.iter_profiles_to_jobs(profiles, jobs, limit, job_embeddings, job_skill_bits):
+            results.extend(chunk)
+        return results
+
+    def iter_profiles_to_jobs(
+        self,
+        profiles: List[UserProfile],
+        jobs: List[Job],
+        limit: int = 10,
+        job_embeddings: Optional[Embeddings] = None,
+        job_skill_bits: Optional[np.ndarray] = None
+    ) -> Iterator[List[List[MatchResult]]]:
+        """
+        Match profiles chunk by chunk, yielding each chunk as soon as it is ranked.
+
+        Same scoring as match_profiles_to_jobs; callers that stream results
+        never hold more than one chunk of profiles' matches at a time.
+
+        Args:
+            profiles: User profiles to match
+            jobs: Shared jobs to match against
+            limit: Maximum number of matches per profile
+            job_embeddings: Precomputed job embeddings aligned with jobs
+            job_skill_bits: Packed job requirements, packed if None
+
+        Yields:
+            Ranked match lists for up to BATCH_SIZE consecutive profiles
+        """
+        if not profiles:
+            return
+
+        # Chunk profiles to bound the size of the score matrix
+        chunk_size = max(1, Config.BATCH_SIZE)
+        if not jobs:
+            for start in range(0, len(profiles), chunk_size):
+                yield [[] for _ in profiles[start:start + chunk_size]]
+            return
+
+        logger.info(f"Batch matching {len(profiles)} profiles against {len(jobs)} jobs")
+
+        if job_embeddings is None:
+            job_embeddings = self.embedder.embed_jobs(jobs)
+        batch = JobBatch(jobs, skill_bits=job_skill_bits)
+
+        for start in range(0, len(profiles), chunk_size):
+            chunk = profiles[start:start + chunk_size]
+            semantic_matrix = self.embedder.cosine_similarity_matrix(
+                self.embedder.embed_profiles(chunk),
+                job_embeddings
+            ).astype(np.float64) * 100
+
+            yield [
+                self._rank_jobs(profile, jobs, semantic_scores, limit, batch=batch)
+                for profile, semantic_scores in zip(chunk, semantic_matrix)
+            ]
+
+    def match_profiles_to_corpus(
+        self,
+        profiles: List[UserProfile],
+        corpus: JobCorpus,
+        job_ids: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> List[List[MatchResult]]:
+        """
+        Match many profiles against jobs held in the server-side corpus.
 
-        # Score each job
-        matches = []
-        for job, job_embedding in zip(jobs, job_embeddings):
-            match = self._score_job_match(profile, job, profile_embedding, job_embedding)
-            matches.append(match)
+        Args:
+            profiles: User profiles to match
+            corpus: Job corpus
+            job_ids: Restrict matching to these corpus IDs (None = whole corpus)
+            limit: Maximum number of matches per profile
 
-        # Sort by overall match score
-        matches.sort(key=lambda x: x.match_score, reverse=True)
+        Returns:
+            Ranked match lists aligned with profiles
+        """
+        results = []
+        for chunk in self.iter_profiles_to_corpus(profiles, corpus, job_ids, limit):
+            results.extend(chunk)
+        return results
 
-        return matches[:limit]
+    def iter_profiles_to_corpus(
+        self,
+        profiles: List[UserProfile],
+        corpus: JobCorpus,
+        job_ids: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> Iterator[List[List[MatchResult]]]:
+        """
+        Chunked variant of match_profiles_to_corpus (see iter_profiles_to_jobs).
+
+        The corpus snapshot is taken once, when iteration starts.
+
+        Args:
+            profiles: User profiles to match
+            corpus: Job corpus
+            job_ids: Restrict matching to these corpus IDs (None = whole corpus)
+            limit: Maximum number of matches per profile
+
+        Yields:
+            Ranked match lists for up to BATCH_SIZE consecutive profiles
+        """
+        snapshot = corpus.snapshot(job_ids)
+
+        yield from self.iter_profiles_to_jobs(
+            profiles,
+            snapshot.jobs,
+            limit=limit,
+            job_embeddings=snapshot.embeddings,
+            job_skill_bits=snapshot.skill_bits
+        )
 
-    def _score_job_match(
+    def _rank_jobs(
+        self,
+        profile: UserProfile,
+        jobs: List[Job],
+        semantic_scores: np.ndarray,
+        limit: int,
+        batch: Optional[JobBatch] = None
+    ) -> List[MatchResult]:
+        """
+        Two-stage ranking: score every job numerically, then explain only the top-k.
+
+        Stage 1 computes the weighted component scores for all jobs as
+        array expressions over the job batch columns and keeps the best
+        `limit` with a bounded heap. Stage 2 builds reasoning, key matches
+        and the MatchResult only for that shortlist.
+
+        Args:
+            profile: User profile
+            jobs: Candidate jobs
+            semantic_scores: Semantic scores (0-100) aligned with jobs
+            limit: Maximum number of matches to return
+            batch: Columnar view of jobs (built on the fly if None)
+
+        Returns:
+            Ranked list of job matches
+        """
+        if batch is None:
+            batch = JobBatch(jobs)
+
+        # Stage 1: cheap numeric scoring for every candidate
+        skill_scores = self._score_skills_batch(
+            profile.skills, jobs, job_bits=batch.skill_bits, vocabulary=batch.vocabulary
+        )
+        experience_scores = batch.experience_scores(profile)
+        location_scores = batch.location_scores(profile)
+        salary_scores = batch.salary_scores(profile)
+
+        # Weighted sum per job, rounded once for ranking and display
+        overall_scores = (
+            semantic_scores * self.SEMANTIC_WEIGHT +
+            skill_scores * self.SKILL_WEIGHT +
+            experience_scores * self.EXPERIENCE_WEIGHT +
+            location_scores * self.LOCATION_WEIGHT +
+            salary_scores * self.SALARY_WEIGHT
+        )
+        match_scores = [round(score, 1) for score in overall_scores.tolist()]
+
+        # Bounded top-k; ties keep input order, like a stable sort
+        shortlist = heapq.nlargest(limit, range(len(jobs)), key=match_scores.__getitem__)
+
+        # Stage 2: full results for the shortlist only
+        return [
+            self._build_match_result(
+                profile,
+                jobs[i],
+                MatchComponents(
+                    match_scores[i],
+                    float(semantic_scores[i]),
+                    float(skill_scores[i]),
+                    float(experience_scores[i]),
+                    float(location_scores[i])
+                ),
+                vocabulary=batch.vocabulary
+            )
+            for i in shortlist
+        ]
+
+    def _build_match_result(
         self,
         profile: UserProfile,
         job: Job,
-        profile_embedding,
-        job_embedding
+        components: MatchComponents,
+        vocabulary: Optional[Union[SkillIndex, SkillOverlay]] = None
     ) -> MatchResult:
         """
-        Calculate comprehensive match score for a single job.
+        Build the explained match result from precomputed components.
 
         Args:
             profile: User profile
             job: Job posting
-            profile_embedding: Profile embedding vector
-            job_embedding: Job embedding vector
+            components: Stage-1 scores computed by _rank_jobs
+            vocabulary: Vocabulary the job's requirements were packed over
 
         Returns:
             Match result with detailed scoring
         """
-        # 1. Semantic similarity (0-100)
-        semantic_score = self.embedder.cosine_similarity(
-            profile_embedding,
-            job_embedding
-        ) * 100
+        semantic_score = components.semantic_score
+        skill_score = components.skill_score
+        experience_score = components.experience_score
+        location_score = components.location_score
 
-        # 2. Skill match score (0-100)
-        skill_result = self._score_skills(profile.skills, job.requirements)
-        skill_score = skill_result['score']
+        # Matching/missing skill lists are only needed for explained results
+        skill_result = self._score_skills(profile.skills, job.requirements, vocabulary)
         matching_skills = skill_result['matching']
         missing_skills = skill_result['missing']
 
-        # 3. Experience alignment (0-100)
-        experience_score = self._score_experience(profile, job)
-
-        # 4. Location/work style fit (0-100)
-        location_score = self._score_location(profile, job)
-
-        # 5. Salary fit (0-100)
-        salary_score = self._score_salary(profile, job)
-
-        # Calculate weighted overall score
-        overall_score = (
-            semantic_score * self.SEMANTIC_WEIGHT +
-            skill_score * self.SKILL_WEIGHT +
-            experience_score * self.EXPERIENCE_WEIGHT +
-            location_score * self.LOCATION_WEIGHT +
-            salary_score * self.SALARY_WEIGHT
-        )
-
         # Generate human-readable reasoning
         reasoning = self._generate_reasoning(
             profile,
@@ -139,7 +419,7 @@ class MatchingService:
 
         return MatchResult(
             job_id=job.job_id,
-            match_score=round(overall_score, 1),
+            match_score=components.match_score,
             semantic_score=round(semantic_score, 1),
             skill_match_score=round(skill_score, 1),
             experience_score=round(experience_score, 1),
@@ -149,10 +429,59 @@ class MatchingService:
             missing_skills=missing_skills
         )
 
+    def _score_skills_batch(
+        self,
+        user_skills: List[str],
+        jobs: List[Job],
+        job_bits: Optional[np.ndarray] = None,
+        vocabulary: Optional[Union[SkillIndex, SkillOverlay]] = None
+    ) -> np.ndarray:
+        """
+        Score skill overlap against every job at once.
+
+        Each job's requirements are packed into a bit vector over the shared
+        skill vocabulary; the user's coverage (exact, fuzzy and synonym
+        matches) is a single bit vector. Overlap is then AND + popcount
+        across all jobs. Scores are identical to _score_skills.
+
+        Args:
+            user_skills: User's skills
+            jobs: Job postings
+            job_bits: Packed requirements from JobBatch.pack_skills (packed
+                over a new request overlay if None)
+            vocabulary: Vocabulary job_bits were packed over (the shared
+                index if None)
+
+        Returns:
+            Array of skill scores (0-100) aligned with jobs
+        """
+        # Requirements are interned before taking the user's coverage snapshot
+        if job_bits is None:
+            vocabulary = skill_index.overlay()
+            job_bits = JobBatch.pack_skills(jobs, vocabulary)
+        elif vocabulary is None:
+            vocabulary = skill_index
+        covered = skill_synonyms.coverage(user_skills, vocabulary)
+
+        # Skills interned after packing cannot appear in any job's bits
+        user_bits = vocabulary.bitset(covered, job_bits.shape[1])
+
+        total_required = popcount(job_bits)
+        total_matched = popcount(job_bits & user_bits)
+
+        # No requirements = perfect fit, as in _score_skills
+        scores = np.full(len(jobs), 100.0)
+        has_requirements = total_required > 0
+        scores[has_requirements] = (
+            total_matched[has_requirements] / total_required[has_requirements]
+        ) * 100
+        return scores
+
     def _score_skills(
         self,
         user_skills: List[str],
-        job_requirements: List[str]
+        job_requirements: List[str],
+        vocabulary: Optional[Union[SkillIndex, SkillOverlay]] = None
     ) -> Dict:
         """
         Score skill overlap between user and job.
@@ -160,6 +489,8 @@ class MatchingService:
         Args:
             user_skills: User's skills
             job_requirements: Job requirements
+            vocabulary: Where requirements are interned (a new request
+                overlay if None, so the shared vocabulary is not grown)
 
         Returns:
             Dict with score, matching skills, and missing skills
@@ -170,41 +501,29 @@ class MatchingService:
         if not user_skills:
             return {'score': 0.0, 'matching': [], 'missing': job_requirements}
 
-        # Normalize for comparison (lowercase, strip whitespace)
-        user_skills_norm = {s.lower().strip() for s in user_skills}
-        job_reqs_norm = {r.lower().strip() for r in job_requirements}
-
-        # Find exact matches
-        matching = user_skills_norm & job_reqs_norm
-        missing = job_reqs_norm - user_skills_norm
+        # Intern normalized skills (lowercase, strip whitespace) to integer IDs
+        vocabulary = skill_index.overlay() if vocabulary is None else vocabulary
+        req_ids = vocabulary.intern_all(job_requirements)
+        required = set(req_ids)
 
-        # Fuzzy matching for partial overlaps (e.g., "React" in "React.js")
-        fuzzy_matches = set()
-        remaining_missing = set()
-
-        for req in missing:
-            matched = False
-            for skill in user_skills_norm:
-                if req in skill or skill in req:
-                    fuzzy_matches.add(req)
-                    matched = True
-                    break
-            if not matched:
-                remaining_missing.add(req)
+        # Everything the user's skills match exactly, fuzzily (e.g., "React"
+        # in "React.js") or as a semantic synonym when enabled
+        covered = skill_synonyms.coverage(user_skills, vocabulary)
+        matched = required & covered
 
         # Calculate score
-        total_matched = len(matching) + len(fuzzy_matches)
-        total_required = len(job_reqs_norm)
+        total_matched = len(matched)
+        total_required = len(required)
         score = (total_matched / total_required) * 100 if total_required > 0 else 100
 
         # Return original-case skills for display
         matching_display = [
-            req for req in job_requirements
-            if req.lower().strip() in matching or req.lower().strip() in fuzzy_matches
+            req for req, req_id in zip(job_requirements, req_ids)
+            if req_id in matched
         ]
         missing_display = [
-            req for req in job_requirements
-            if req.lower().strip() in remaining_missing
+            req for req, req_id in zip(job_requirements, req_ids)
+            if req_id not in matched
         ]
 
         return {
@@ -227,29 +546,11 @@ class MatchingService:
         if not profile.experience_level:
             return 70.0  # Neutral score if unknown
 
-        # Experience level hierarchy
-        levels = {
-            'entry': 1,
-            'mid': 2,
-            'senior': 3,
-            'executive': 4
-        }
-
-        # Extract level from job description/requirements (simplified)
-        job_text = f"{job.title} {job.description}".lower()
-        job_level = None
-
-        if any(term in job_text for term in ['junior', 'entry', 'graduate', 'early career']):
-            job_level = 'entry'
-        elif any(term in job_text for term in ['senior', 'lead', 'staff', 'principal']):
-            job_level = 'senior'
-        elif any(term in job_text for term in ['executive', 'director', 'vp', 'chief', 'head of']):
-            job_level = 'executive'
-        else:
-            job_level = 'mid'  # Default assumption
+        # Extract level from job title/description (simplified)
+        job_level = infer_job_level(job)
 
-        user_level = levels.get(profile.experience_level.value, 2)
-        inferred_job_level = levels.get(job_level, 2)
+        user_level = SENIORITY_LEVELS.get(profile.experience_level.value, 2)
+        inferred_job_level = SENIORITY_LEVELS.get(job_level, 2)
 
         # Score based on alignment (perfect = 100, adjacent = 80, 2+ apart = 50)
         diff = abs(user_level - inferred_job_level)
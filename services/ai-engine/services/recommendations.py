@@ -2,13 +2,14 @@
 Personalized recommendation engine for career guidance.
 """
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from models.schemas import (
     UserProfile,
     Job,
     LearningPath,
     SkillGap
 )
+from services.skill_aggregate import SkillAggregate
 from services.skill_analysis import SkillAnalyzer
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ class RecommendationEngine:
     def recommend_learning_paths(
         self,
         profile: UserProfile,
-        target_jobs: List[Job],
+        target_jobs: Union[List[Job], SkillAggregate],
         max_paths: int = 5
     ) -> List[LearningPath]:
         """
@@ -34,22 +35,14 @@ class RecommendationEngine:
 
         Args:
             profile: User profile
-            target_jobs: Jobs user is targeting
+            target_jobs: Jobs user is targeting, or a prebuilt SkillAggregate of them
             max_paths: Maximum paths to recommend
 
         Returns:
             List of learning paths
         """
-        # Analyze skill gaps
-        analysis = self.skill_analyzer.analyze_skill_gaps(profile, target_jobs)
-
-        # Generate learning paths from gaps
-        paths = self.skill_analyzer.generate_learning_paths(
-            analysis.skill_gaps,
-            max_paths=max_paths
-        )
-
-        return paths
+        # Only the gaps are needed: strengths and recommendations are skipped
+        return self.skill_analyzer.session(profile, target_jobs).learning_paths(max_paths)
 
     def recommend_next_steps(
         self,
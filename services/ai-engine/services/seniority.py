@@ -0,0 +1,133 @@
+"""
+Job seniority inference.
+
+A job's level depends only on its title and description, so it is
+inferred once per posting (on corpus ingest or the first time a job is
+seen) and cached under its job ID and that text. Inference is a
+single pass of one compiled pattern over the text instead of one
+substring scan per keyword.
+"""
+import logging
+import re
+from typing import Dict, Iterable, Optional
+
+from config import Config
+from models.schemas import Job
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Experience level hierarchy
+SENIORITY_LEVELS = {
+    'entry': 1,
+    'mid': 2,
+    'senior': 3,
+    'executive': 4
+}
+
+# Title/description terms implying a level, in priority order
+SENIORITY_TERMS = (
+    ('entry', ('junior', 'entry', 'graduate', 'early career')),
+    ('senior', ('senior', 'lead', 'staff', 'principal')),
+    ('executive', ('executive', 'director', 'vp', 'chief', 'head of')),
+)
+
+DEFAULT_LEVEL = 'mid'
+
+# Term -> priority (lower wins)
+_TERM_PRIORITY = {
+    term: priority
+    for priority, (_, terms) in enumerate(SENIORITY_TERMS)
+    for term in terms
+}
+_PRIORITY_LEVEL = [level for level, _ in SENIORITY_TERMS]
+
+# Zero-width lookahead so matches may overlap: every occurrence of every
+# term is reported, exactly as a separate `term in text` check would see it
+_TERM_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(term) for term in sorted(_TERM_PRIORITY, key=len, reverse=True)) + "))"
+)
+
+
+def classify_text(text: str) -> str:
+    """
+    Infer a seniority level from free text.
+
+    Args:
+        text: Lowercased job text
+
+    Returns:
+        One of the SENIORITY_LEVELS keys (DEFAULT_LEVEL when nothing matches)
+    """
+    best: Optional[int] = None
+    for match in _TERM_PATTERN.finditer(text):
+        priority = _TERM_PRIORITY[match.group(1)]
+        if priority == 0:
+            return _PRIORITY_LEVEL[0]
+        if best is None or priority < best:
+            best = priority
+    return _PRIORITY_LEVEL[best] if best is not None else DEFAULT_LEVEL
+
+
+class SeniorityClassifier:
+    """Cached per-job seniority inference."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize the classifier.
+
+        Args:
+            max_entries: Jobs kept in the cache (uses Config.SENIORITY_CACHE_SIZE if None)
+        """
+        self._cache = TTLCache(maxsize=max_entries or Config.SENIORITY_CACHE_SIZE)
+
+    def level(self, job: Job) -> str:
+        """
+        Get a job's seniority level, inferring it on first sight.
+
+        Args:
+            job: Job posting
+
+        Returns:
+            One of the SENIORITY_LEVELS keys
+        """
+        # Keyed on the text itself, so a hash collision cannot return another
+        # posting's level. str hashes are memoized on the string objects and
+        # equal keys of the same posting compare by identity, so re-keying
+        # it does not rescan its description
+        key = (job.job_id, job.title, job.description)
+        level = self._cache.get(key)
+        if level is None:
+            level = classify_text(f"{job.title} {job.description}".lower())
+            self._cache.set(key, level)
+        return level
+
+    def warm(self, jobs: Iterable[Job]) -> None:
+        """Infer and cache levels for jobs ahead of matching."""
+        for job in jobs:
+            self.level(job)
+
+    def clear(self) -> None:
+        """Drop all cached levels."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters for monitoring."""
+        return self._cache.stats()
+
+
+# Global classifier instance
+seniority_classifier = SeniorityClassifier()
+
+
+def infer_job_level(job: Job) -> str:
+    """
+    Infer a job's seniority from its title and description (simplified).
+
+    Args:
+        job: Job posting
+
+    Returns:
+        One of the SENIORITY_LEVELS keys ('mid' when nothing matches)
+    """
+    return seniority_classifier.level(job)
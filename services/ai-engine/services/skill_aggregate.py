@@ -0,0 +1,394 @@
+"""
+Incremental skill aggregation over a user's target jobs.
+
+Skill analysis aggregates the requirements of every target job into
+per-skill frequency, importance and job lists. Users usually change their
+saved jobs one at a time, so SkillAggregate keeps that aggregation and
+applies each added or removed job in O(requirements) instead of
+rescanning every job. Aggregates are kept per user by
+SkillAggregateStore and, when SKILL_AGGREGATE_PATH is set, persisted as
+one JSON file per user.
+"""
+import fcntl
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+from models.schemas import Job
+from services.skill_importance import importance_annotator
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Revision numbers are unique across all aggregates and changes
+_revisions = itertools.count()
+
+# Per-user update locks are striped: users hashing to the same stripe
+# share one lock, which bounds the number of locks kept
+LOCK_STRIPES = 64
+
+# One job's contribution: (skill, importance) per requirement, in order
+Contribution = Tuple[Tuple[str, str], ...]
+
+
+class SkillAggregate:
+    """
+    Required-skill aggregate over a set of jobs keyed by job ID.
+
+    `skills()` returns the same metadata as aggregating the jobs from
+    scratch in the order they were added. Adding a job ID that is already
+    present replaces its contribution (it then counts as most recent).
+    """
+
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        self._lock = threading.RLock()
+        # job_id -> (add sequence, contribution)
+        self._jobs: Dict[str, Tuple[int, Contribution]] = {}
+        # skill -> {job_id: (count, importance, first requirement index)},
+        # job IDs in add order
+        self._skills: Dict[str, Dict[str, Tuple[int, str, int]]] = {}
+        self._seq = 0
+        self._metadata: Optional[Dict[str, Dict]] = None
+        # Changes on every add/remove (for caching results derived from it)
+        self.revision = next(_revisions)
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job]) -> "SkillAggregate":
+        """Build an aggregate from jobs, in order."""
+        aggregate = cls()
+        for job in jobs:
+            aggregate.add(job)
+        return aggregate
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    @property
+    def job_ids(self) -> List[str]:
+        """Aggregated job IDs in add order."""
+        with self._lock:
+            # Re-added jobs are reinserted, so dict order is add order
+            return list(self._jobs)
+
+    def add(self, job: Job) -> bool:
+        """
+        Add (or replace) one job's requirements.
+
+        Args:
+            job: Job posting
+
+        Returns:
+            False if the job was already present with the same requirements
+        """
+        importances = importance_annotator.annotate(job)
+        contribution = tuple(
+            (req.strip(), importance) for req, importance in zip(job.requirements, importances)
+        )
+        with self._lock:
+            entry = self._jobs.get(job.job_id)
+            if entry is not None and entry[1] == contribution:
+                return False
+            self._add(job.job_id, contribution)
+            return True
+
+    def remove(self, job_id: str) -> bool:
+        """
+        Remove one job's requirements.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            True if the job was part of the aggregate
+        """
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry is None:
+                return False
+
+            for skill in {skill for skill, _ in entry[1]}:
+                by_job = self._skills[skill]
+                del by_job[job_id]
+                if not by_job:
+                    del self._skills[skill]
+
+            self._metadata = None
+            self.revision = next(_revisions)
+            return True
+
+    def skills(self) -> Dict[str, Dict]:
+        """
+        Get per-skill metadata, as built by aggregating the jobs in add order.
+
+        The result is cached until the next change and must not be modified.
+
+        Returns:
+            Dict of skill -> {'frequency', 'importance', 'jobs'}, ordered by
+            first mention
+        """
+        with self._lock:
+            if self._metadata is not None:
+                return self._metadata
+
+            first_mentions = []
+            for skill, by_job in self._skills.items():
+                first_job, (_, importance, index) = next(iter(by_job.items()))
+                first_mentions.append(((self._jobs[first_job][0], index), skill, importance))
+            first_mentions.sort()
+
+            metadata = {}
+            for _, skill, importance in first_mentions:
+                by_job = self._skills[skill]
+                metadata[skill] = {
+                    'frequency': sum(count for count, _, _ in by_job.values()),
+                    'importance': importance,
+                    'jobs': [job_id for job_id, (count, _, _) in by_job.items() for _ in range(count)],
+                }
+
+            self._metadata = metadata
+            return metadata
+
+    def to_dict(self) -> Dict:
+        """Serialize contributions (in add order) to a JSON-compatible dict."""
+        with self._lock:
+            return {
+                "jobs": [
+                    {"job_id": job_id, "requirements": [list(pair) for pair in self._jobs[job_id][1]]}
+                    for job_id in self.job_ids
+                ]
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SkillAggregate":
+        """Rebuild an aggregate written by `to_dict` without rescanning job text."""
+        aggregate = cls()
+        for job in data.get("jobs", []):
+            aggregate._add(job["job_id"], tuple((skill, importance) for skill, importance in job["requirements"]))
+        return aggregate
+
+    def _add(self, job_id: str, contribution: Contribution) -> None:
+        with self._lock:
+            self.remove(job_id)
+
+            self._jobs[job_id] = (self._seq, contribution)
+            self._seq += 1
+
+            for index, (skill, importance) in enumerate(contribution):
+                by_job = self._skills.setdefault(skill, {})
+                entry = by_job.get(job_id)
+                if entry is None:
+                    by_job[job_id] = (1, importance, index)
+                else:
+                    by_job[job_id] = (entry[0] + 1, entry[1], entry[2])
+
+            self._metadata = None
+            self.revision = next(_revisions)
+
+
+class SkillAggregateStore:
+    """
+    Per-user skill aggregates, cached in memory and optionally on disk.
+
+    With a storage directory every change is written through to
+    "<directory>/<user hash>.json", and a file changed by another worker
+    process is reloaded on next access. Changes hold a per-user lock and
+    an exclusive flock on "<user hash>.lock" from reading the aggregate to
+    writing it back, so concurrent updates to one user from several threads
+    or workers are applied one after another, while other users' updates
+    and all reads proceed. Without a directory, aggregates live only in the
+    in-memory cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_users: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: Storage directory (uses Config.SKILL_AGGREGATE_PATH if None;
+                empty keeps aggregates in memory only)
+            max_users: Aggregates kept in memory (uses Config.SKILL_AGGREGATE_CACHE_SIZE if None)
+        """
+        self.path = Config.SKILL_AGGREGATE_PATH if path is None else path
+        # user_id -> (file version when loaded, aggregate)
+        self._cache = TTLCache(maxsize=max_users or Config.SKILL_AGGREGATE_CACHE_SIZE)
+        self._user_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def get(self, user_id: str) -> SkillAggregate:
+        """
+        Get a user's aggregate (empty if they have none).
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The user's aggregate (change it through the store's methods)
+        """
+        version = self._version(user_id)
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        aggregate = self._load(user_id) if version is not None else SkillAggregate()
+        self._cache.set(user_id, (version, aggregate))
+        return aggregate
+
+    def add_jobs(self, user_id: str, jobs: Iterable[Job]) -> Dict[str, int]:
+        """
+        Add or update target jobs for a user.
+
+        Args:
+            user_id: User ID
+            jobs: Jobs to add
+
+        Returns:
+            Counts of added/updated and unchanged jobs
+        """
+        with self._locked(user_id):
+            aggregate = self.get(user_id)
+            changed = unchanged = 0
+            with self._evict_on_error(user_id):
+                for job in jobs:
+                    if aggregate.add(job):
+                        changed += 1
+                    else:
+                        unchanged += 1
+                if changed:
+                    self._save(user_id, aggregate)
+            return {"changed": changed, "unchanged": unchanged}
+
+    def replace_jobs(self, user_id: str, jobs: Iterable[Job]) -> Dict[str, int]:
+        """
+        Replace a user's target jobs entirely.
+
+        Args:
+            user_id: User ID
+            jobs: Complete set of target jobs, in order
+
+        Returns:
+            Count of jobs removed
+        """
+        with self._locked(user_id):
+            old_ids = set(self.get(user_id).job_ids)
+            aggregate = SkillAggregate.from_jobs(jobs)
+            self._save(user_id, aggregate)
+            return {"removed": len(old_ids.difference(aggregate.job_ids))}
+
+    def remove_job(self, user_id: str, job_id: str) -> bool:
+        """
+        Remove one target job from a user's aggregate.
+
+        Args:
+            user_id: User ID
+            job_id: Job ID
+
+        Returns:
+            True if the job was saved for the user
+        """
+        with self._locked(user_id):
+            aggregate = self.get(user_id)
+            with self._evict_on_error(user_id):
+                if not aggregate.remove(job_id):
+                    return False
+                self._save(user_id, aggregate)
+            return True
+
+    @contextmanager
+    def _locked(self, user_id: str) -> Iterator[None]:
+        """Hold the user's lock and, with a storage directory, the user's file lock."""
+        # hash() is per process, which is fine for an in-process lock
+        with self._user_locks[hash(user_id) % LOCK_STRIPES]:
+            if not self.path:
+                yield
+                return
+
+            os.makedirs(self.path, exist_ok=True)
+            # The lock file is never removed, so every worker locks the same inode
+            with open(self._file(user_id, ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _evict_on_error(self, user_id: str) -> Iterator[None]:
+        """Drop the cached aggregate if a change fails, so it is reloaded from disk."""
+        try:
+            yield
+        except BaseException:
+            # Without a directory the cache is the only copy; each job is
+            # applied whole, so it keeps the jobs applied before the failure
+            if self.path:
+                self._cache.pop(user_id)
+            raise
+
+    def _save(self, user_id: str, aggregate: SkillAggregate) -> None:
+        """Store a user's aggregate, writing it through to disk when configured (hold `_locked`)."""
+        version = None
+        if self.path:
+            file_path = self._file(user_id)
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"user_id": user_id, **aggregate.to_dict()}, f)
+            os.replace(tmp_path, file_path)
+            version = self._version(user_id)
+        self._cache.set(user_id, (version, aggregate))
+
+    def delete(self, user_id: str) -> bool:
+        """
+        Drop a user's aggregate.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the user had one
+        """
+        with self._locked(user_id):
+            existed = self._cache.pop(user_id) is not None
+            if self.path and os.path.exists(self._file(user_id)):
+                os.remove(self._file(user_id))
+                existed = True
+            return existed
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters for monitoring."""
+        return self._cache.stats()
+
+    def _file(self, user_id: str, suffix: str = ".json") -> str:
+        # Hashed so arbitrary user IDs map to safe file names
+        name = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{name}{suffix}")
+
+    def _version(self, user_id: str) -> Optional[Tuple[int, int]]:
+        # Every save replaces the file, so the inode changes even when two
+        # saves land within the file system's timestamp granularity
+        if not self.path:
+            return None
+        try:
+            stat = os.stat(self._file(user_id))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load(self, user_id: str) -> SkillAggregate:
+        try:
+            with open(self._file(user_id)) as f:
+                return SkillAggregate.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable skill aggregate for user {user_id}: {e}")
+            return SkillAggregate()
+
+
+# Global per-user aggregate store
+skill_aggregates = SkillAggregateStore()
@@ -3,7 +3,8 @@ Skill gap analysis and learning path generation.
 Identifies what users need to learn to reach their goals.
 """
 import logging
-from typing import List, Dict, Set
+import threading
+from typing import Any, Callable, Hashable, Iterable, List, Dict, Set, Union
 from collections import Counter
 from models.schemas import (
     UserProfile,
@@ -12,12 +13,77 @@ from models.schemas import (
     SkillAnalysisResult,
     LearningPath,
     SkillGapRequest,
-    SkillGapResponse
+    SkillGapResponse,
+    SkillAnalysisWithPaths,
+    BulkSkillGapRequest,
+    BulkSkillGapResponse,
+    UserSkillGap
 )
+from services.learning_resources import LEARNING_PLATFORMS, learning_resources
+from services.skill_aggregate import SkillAggregate
+from services.skill_importance import (
+    CRITICAL_KEYWORDS,
+    IMPORTANT_KEYWORDS,
+    NICE_KEYWORDS,
+    importance_annotator,
+)
+from services.skill_index import skill_index
+from services.skill_synonyms import skill_synonyms
 
 logger = logging.getLogger(__name__)
 
 
+class RequiredSkillSet:
+    """
+    A required skill list prepared once for gap checks against many users.
+
+    Normalization, original-casing lookup and output ordering are done
+    here, so each user check is a single pass over the required skills.
+    """
+
+    __slots__ = ("skills", "_ordered", "_vectors")
+
+    def __init__(self, required_skills: List[str]):
+        """
+        Normalize the required skills.
+
+        Args:
+            required_skills: Skills required for the target role/job
+        """
+        self.skills = required_skills
+
+        # Normalized -> original casing (last spelling wins), in output order
+        skill_map = {skill.lower().strip(): skill for skill in required_skills}
+        self._ordered = sorted(skill_map.items(), key=lambda item: item[1])
+        self._vectors = (
+            skill_synonyms.vectors([skill for skill, _ in self._ordered])
+            if skill_synonyms.enabled else None
+        )
+
+    def missing(self, user_skills: Iterable[str]) -> List[str]:
+        """
+        Find the required skills a user does not have.
+
+        Args:
+            user_skills: Skills the user currently has
+
+        Returns:
+            Missing skills in their original casing, sorted
+        """
+        user_skills_norm = {skill.lower().strip() for skill in user_skills}
+        missing = [
+            (index, original) for index, (skill, original) in enumerate(self._ordered)
+            if skill not in user_skills_norm
+        ]
+
+        # Drop skills the user has under a near-synonym (when enabled)
+        if self._vectors is not None and missing and user_skills_norm:
+            synonyms = skill_synonyms.matches(self._vectors[[index for index, _ in missing]], user_skills_norm)
+            missing = [item for item, is_synonym in zip(missing, synonyms) if not is_synonym]
+
+        return [original for _, original in missing]
+
+
 def calculate_skill_gap(request: SkillGapRequest) -> SkillGapResponse:
     """
     Calculate the skill gap between user skills and required skills.
@@ -31,16 +97,7 @@ def calculate_skill_gap(request: SkillGapRequest) -> SkillGapResponse:
     Returns:
         SkillGapResponse with user_skills, required_skills, and missing_skills
     """
-    # Normalize skills to lowercase for case-insensitive comparison
-    user_skills_norm = {skill.lower().strip() for skill in request.user_skills}
-    required_skills_norm = {skill.lower().strip() for skill in request.required_skills}
-
-    # Find missing skills (required but not in user's skill set)
-    missing_skills_norm = required_skills_norm - user_skills_norm
-
-    # Map back to original casing from required_skills
-    skill_map = {skill.lower().strip(): skill for skill in request.required_skills}
-    missing_skills = [skill_map[skill] for skill in missing_skills_norm]
+    missing_skills = RequiredSkillSet(request.required_skills).missing(request.user_skills)
 
     logger.info(
         f"Skill gap calculated: {len(request.user_skills)} user skills, "
@@ -50,93 +107,90 @@ def calculate_skill_gap(request: SkillGapRequest) -> SkillGapResponse:
     return SkillGapResponse(
         user_skills=request.user_skills,
         required_skills=request.required_skills,
-        missing_skills=sorted(missing_skills)  # Sort for consistent output
+        missing_skills=missing_skills  # Sorted for consistent output
+    )
+
+
+def calculate_skill_gaps(request: BulkSkillGapRequest) -> BulkSkillGapResponse:
+    """
+    Calculate skill gaps for many users against one required skill list.
+
+    The required side is normalized (and embedded for synonym checks) once
+    for the whole request. Each result equals calculate_skill_gap for that
+    user.
+
+    Args:
+        request: BulkSkillGapRequest containing required_skills and users
+
+    Returns:
+        BulkSkillGapResponse with one result per user, in request order
+    """
+    required = RequiredSkillSet(request.required_skills)
+
+    results = [
+        UserSkillGap(
+            user_id=user.user_id,
+            user_skills=user.user_skills,
+            missing_skills=required.missing(user.user_skills)
+        )
+        for user in request.users
+    ]
+
+    logger.info(
+        f"Bulk skill gap calculated: {len(request.users)} users, "
+        f"{len(request.required_skills)} required skills"
     )
 
+    return BulkSkillGapResponse(required_skills=request.required_skills, results=results)
+
 
 class SkillAnalyzer:
     """
     Analyzes skill gaps and generates personalized learning recommendations.
     """
 
-    # Skill importance heuristics (can be enhanced with ML in future)
-    CRITICAL_KEYWORDS = ['required', 'must have', 'essential', 'mandatory']
-    IMPORTANT_KEYWORDS = ['preferred', 'desired', 'should have', 'strong']
-    NICE_KEYWORDS = ['nice to have', 'bonus', 'plus', 'advantage']
+    # Skill importance heuristics (see services.skill_importance)
+    CRITICAL_KEYWORDS = CRITICAL_KEYWORDS
+    IMPORTANT_KEYWORDS = IMPORTANT_KEYWORDS
+    NICE_KEYWORDS = NICE_KEYWORDS
 
-    # Learning resource templates (can be expanded with real APIs)
-    LEARNING_PLATFORMS = {
-        'coursera': 'https://www.coursera.org/search?query=',
-        'udemy': 'https://www.udemy.com/courses/search/?q=',
-        'pluralsight': 'https://www.pluralsight.com/search?q=',
-        'linkedin_learning': 'https://www.linkedin.com/learning/search?keywords=',
-    }
+    # Learning resource templates (see services.learning_resources)
+    LEARNING_PLATFORMS = LEARNING_PLATFORMS
 
     def analyze_skill_gaps(
         self,
         profile: UserProfile,
-        target_jobs: List[Job]
+        target_jobs: Union[List[Job], SkillAggregate]
     ) -> SkillAnalysisResult:
         """
         Analyze skill gaps between user profile and target jobs.
 
         Args:
             profile: User profile
-            target_jobs: Jobs the user is interested in
+            target_jobs: Jobs the user is interested in, or a prebuilt
+                SkillAggregate of them (skips re-aggregating every job)
 
         Returns:
             Comprehensive skill analysis with gaps and recommendations
         """
-        logger.info(f"Analyzing skill gaps for user {profile.user_id}")
-
-        # Aggregate skills from target jobs
-        required_skills = self._aggregate_required_skills(target_jobs)
-
-        # Identify current skills (normalized)
-        user_skills_norm = {s.lower().strip() for s in profile.skills}
-
-        # Find gaps
-        skill_gaps = []
-        for skill, metadata in required_skills.items():
-            if skill.lower() not in user_skills_norm:
-                # Check for fuzzy matches
-                has_similar = any(
-                    skill.lower() in us or us in skill.lower()
-                    for us in user_skills_norm
-                )
-                if not has_similar:
-                    gap = self._create_skill_gap(skill, metadata)
-                    skill_gaps.append(gap)
-
-        # Identify strengths (skills user has that are valuable)
-        strengths = [
-            s for s in profile.skills
-            if any(s.lower() in req.lower() or req.lower() in s.lower()
-                   for req in required_skills.keys())
-        ]
+        return self.session(profile, target_jobs).result
 
-        # Calculate overall readiness
-        total_skills = len(required_skills)
-        matched_skills = total_skills - len(skill_gaps)
-        readiness_score = (matched_skills / total_skills * 100) if total_skills > 0 else 100
+    def session(
+        self,
+        profile: UserProfile,
+        target_jobs: Union[List[Job], SkillAggregate]
+    ) -> "SkillAnalysisSession":
+        """
+        Start a lazy analysis whose artifacts share intermediate results.
 
-        # Generate strategic recommendations
-        recommendations = self._generate_recommendations(
-            profile,
-            skill_gaps,
-            strengths,
-            readiness_score
-        )
+        Args:
+            profile: User profile
+            target_jobs: Jobs the user is interested in, or a SkillAggregate of them
 
-        return SkillAnalysisResult(
-            user_id=profile.user_id,
-            target_role=profile.roles[0] if profile.roles else None,
-            current_skills=profile.skills,
-            skill_gaps=sorted(skill_gaps, key=lambda x: self._gap_priority(x)),
-            strengths=strengths[:5],  # Top 5 strengths
-            recommendations=recommendations,
-            overall_readiness=round(readiness_score, 1)
-        )
+        Returns:
+            Session computing gaps, the full analysis and learning paths on demand
+        """
+        return SkillAnalysisSession(self, profile, target_jobs)
 
     def generate_learning_paths(
         self,
@@ -156,6 +210,10 @@ class SkillAnalyzer:
         # Sort by priority
         sorted_gaps = sorted(skill_gaps, key=self._gap_priority)
 
+        return self._build_learning_paths(sorted_gaps, max_paths)
+
+    def _build_learning_paths(self, sorted_gaps: List[SkillGap], max_paths: int) -> List[LearningPath]:
+        """Build learning paths for the first max_paths of priority-sorted gaps."""
         paths = []
         for i, gap in enumerate(sorted_gaps[:max_paths], 1):
             path = LearningPath(
@@ -183,15 +241,13 @@ class SkillAnalyzer:
         skill_metadata = {}
 
         for job in jobs:
-            job_text = f"{job.description} {' '.join(job.requirements)}".lower()
+            # Importance from context, labelled once per job content
+            importances = importance_annotator.annotate(job)
 
-            for req in job.requirements:
+            for req, importance in zip(job.requirements, importances):
                 skill = req.strip()
                 skill_counter[skill] += 1
 
-                # Determine importance from context
-                importance = self._determine_importance(req, job_text)
-
                 if skill not in skill_metadata:
                     skill_metadata[skill] = {
                         'frequency': 0,
@@ -208,6 +264,9 @@ class SkillAnalyzer:
         """
         Determine skill importance from context.
 
+        Reference implementation for a single skill; aggregation uses the
+        cached per-job labels from importance_annotator instead.
+
         Args:
             skill: Skill name
             context: Surrounding text context
@@ -255,11 +314,8 @@ class SkillAnalyzer:
         }
         target_level = target_level_map.get(importance, 6)
 
-        # Generate learning resources
-        resources = [
-            f"{platform.replace('_', ' ').title()}: {url}{skill.replace(' ', '+')}"
-            for platform, url in list(self.LEARNING_PLATFORMS.items())[:2]
-        ]
+        # Learning resources (memoized per skill)
+        resources = learning_resources.gap_resources(skill)
 
         # Estimate learning time
         time_map = {
@@ -368,16 +424,7 @@ class SkillAnalyzer:
         Returns:
             List of resource dicts with title and url
         """
-        resources = []
-        skill_query = skill.replace(' ', '+')
-
-        for platform, base_url in list(self.LEARNING_PLATFORMS.items())[:3]:
-            resources.append({
-                'title': f"Learn {skill} on {platform.replace('_', ' ').title()}",
-                'url': f"{base_url}{skill_query}"
-            })
-
-        return resources
+        return learning_resources.path_resources(skill)
 
     def _generate_milestones(self, gap: SkillGap) -> List[str]:
         """
@@ -416,3 +463,171 @@ class SkillAnalyzer:
             return "2-3 months"
         else:
             return "1-2 months"
+
+
+class SkillAnalysisSession:
+    """
+    Skill analysis for one profile and target-job set, computed lazily.
+
+    Each artifact is computed on first access and kept, so asking for the
+    full analysis and for learning paths aggregates the jobs and finds the
+    gaps once. Learning paths alone skip strengths and recommendations.
+    Memoization is per instance (functools.cached_property would serialize
+    every session on one class-wide lock before Python 3.12); a session's
+    own lock makes sharing it between requests safe.
+    """
+
+    def __init__(
+        self,
+        analyzer: SkillAnalyzer,
+        profile: UserProfile,
+        target_jobs: Union[List[Job], SkillAggregate]
+    ):
+        """
+        Initialize the session (nothing is computed yet).
+
+        Args:
+            analyzer: Analyzer providing the heuristics
+            profile: User profile
+            target_jobs: Jobs the user is interested in, or a SkillAggregate of them
+        """
+        self.analyzer = analyzer
+        self.profile = profile
+        self.target_jobs = target_jobs
+        self._lock = threading.RLock()
+        self._values: Dict[Hashable, Any] = {}
+        # Required skills get request-local IDs; the shared vocabulary is not grown
+        self._vocabulary = skill_index.overlay()
+
+    def _memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Compute a value once per session."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = compute()
+            return self._values[key]
+
+    @property
+    def required_skills(self) -> Dict[str, Dict]:
+        """Aggregated required skills with metadata (frequency, importance)."""
+        return self._memo('required_skills', self._compute_required_skills)
+
+    def _compute_required_skills(self) -> Dict[str, Dict]:
+        logger.info(f"Analyzing skill gaps for user {self.profile.user_id}")
+
+        # Aggregate skills from target jobs
+        if isinstance(self.target_jobs, SkillAggregate):
+            return self.target_jobs.skills()
+        return self.analyzer._aggregate_required_skills(self.target_jobs)
+
+    @property
+    def required_ids(self) -> List[int]:
+        """Interned required skills (interned before coverage is computed)."""
+        return self._memo('required_ids', self._compute_required_ids)
+
+    def _compute_required_ids(self) -> List[int]:
+        return self._vocabulary.intern_all(self.required_skills.keys())
+
+    @property
+    def user_coverage(self) -> List[Set[int]]:
+        """Skill IDs covered by each profile skill, aligned with profile.skills."""
+        return self._memo('user_coverage', self._compute_user_coverage)
+
+    def _compute_user_coverage(self) -> List[Set[int]]:
+        self.required_ids  # Intern required skills first so coverage sees them
+        return skill_synonyms.covers(self.profile.skills, self._vocabulary)
+
+    @property
+    def gaps(self) -> List[SkillGap]:
+        """Skill gaps sorted by priority."""
+        return self._memo('gaps', self._compute_gaps)
+
+    def _compute_gaps(self) -> List[SkillGap]:
+        # Everything the user's skills cover, including fuzzy matches such
+        # as "React" in "React.js" and semantic synonyms when enabled
+        covered = set().union(*self.user_coverage)
+
+        skill_gaps = [
+            self.analyzer._create_skill_gap(skill, metadata)
+            for (skill, metadata), skill_id in zip(self.required_skills.items(), self.required_ids)
+            if skill_id not in covered
+        ]
+        return sorted(skill_gaps, key=self.analyzer._gap_priority)
+
+    @property
+    def strengths(self) -> List[str]:
+        """Profile skills that cover at least one required skill."""
+        return self._memo('strengths', self._compute_strengths)
+
+    def _compute_strengths(self) -> List[str]:
+        required_ids = self.required_ids
+        return [
+            s for s, covered in zip(self.profile.skills, self.user_coverage)
+            if not covered.isdisjoint(required_ids)
+        ]
+
+    @property
+    def readiness(self) -> float:
+        """Share of required skills the user already covers (0-100)."""
+        return self._memo('readiness', self._compute_readiness)
+
+    def _compute_readiness(self) -> float:
+        total_skills = len(self.required_skills)
+        matched_skills = total_skills - len(self.gaps)
+        return (matched_skills / total_skills * 100) if total_skills > 0 else 100
+
+    @property
+    def result(self) -> SkillAnalysisResult:
+        """Full analysis with strengths and recommendations."""
+        return self._memo('result', self._compute_result)
+
+    def _compute_result(self) -> SkillAnalysisResult:
+        profile = self.profile
+
+        # Priority sorting is stable, so the first critical gap is unchanged
+        recommendations = self.analyzer._generate_recommendations(
+            profile,
+            self.gaps,
+            self.strengths,
+            self.readiness
+        )
+
+        return SkillAnalysisResult(
+            user_id=profile.user_id,
+            target_role=profile.roles[0] if profile.roles else None,
+            current_skills=profile.skills,
+            skill_gaps=self.gaps,
+            strengths=self.strengths[:5],  # Top 5 strengths
+            recommendations=recommendations,
+            overall_readiness=round(self.readiness, 1)
+        )
+
+    def learning_paths(self, max_paths: int = 5) -> List[LearningPath]:
+        """
+        Learning paths for the highest-priority gaps.
+
+        Args:
+            max_paths: Maximum number of paths to generate
+
+        Returns:
+            List of learning paths
+        """
+        return self._memo(
+            ("learning_paths", max_paths),
+            lambda: self.analyzer._build_learning_paths(self.gaps, max_paths)
+        )
+
+    def with_learning_paths(self, max_paths: int = 5) -> SkillAnalysisWithPaths:
+        """
+        Full analysis plus learning paths, sharing one gap computation.
+
+        Args:
+            max_paths: Maximum number of paths to generate
+
+        Returns:
+            Analysis and learning paths
+        """
+        return SkillAnalysisWithPaths(analysis=self.result, learning_paths=self.learning_paths(max_paths))
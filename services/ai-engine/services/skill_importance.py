@@ -0,0 +1,149 @@
+"""
+Requirement importance detection from job text.
+
+A requirement is critical or nice-to-have when a matching keyword appears
+within CONTEXT_WINDOW characters of its first mention in the job text.
+Each job's text is lowercased and scanned for keywords once with a single
+compiled pattern; every requirement is then labelled by looking up the
+keyword positions around its mention. Labels depend only on the job's
+description and requirements, so they are cached keyed on that text.
+"""
+import logging
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import Config
+from models.schemas import Job
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Skill importance heuristics (can be enhanced with ML in future)
+CRITICAL_KEYWORDS = ['required', 'must have', 'essential', 'mandatory']
+IMPORTANT_KEYWORDS = ['preferred', 'desired', 'should have', 'strong']
+NICE_KEYWORDS = ['nice to have', 'bonus', 'plus', 'advantage']
+
+# Characters either side of a requirement's mention searched for keywords
+CONTEXT_WINDOW = 50
+
+DEFAULT_IMPORTANCE = 'important'
+
+
+def _alternation(keywords: Sequence[str]) -> str:
+    # Shortest first: where keywords share a start, the one ending
+    # earliest is reported, which is the one most likely to fit a window
+    return "|".join(re.escape(kw) for kw in sorted(keywords, key=len))
+
+
+# Matches wherever any keyword starts, capturing the critical and the
+# nice-to-have keyword starting there (either may be absent). Lookaheads
+# keep matches zero-width, so overlapping keywords are all seen.
+_KEYWORD_PATTERN = re.compile(
+    f"(?=(?:{_alternation(CRITICAL_KEYWORDS + NICE_KEYWORDS)}))"
+    f"(?:(?=(?P<critical>{_alternation(CRITICAL_KEYWORDS)})))?"
+    f"(?:(?=(?P<nice>{_alternation(NICE_KEYWORDS)})))?"
+)
+
+
+class _KeywordSpans:
+    """Sorted start/end offsets of one keyword class in a text."""
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+    def any_within(self, lo: int, hi: int) -> bool:
+        """Whether a keyword lies entirely inside text[lo:hi]."""
+        k = bisect_left(self.starts, lo)
+        while k < len(self.starts) and self.starts[k] < hi:
+            if self.ends[k] <= hi:
+                return True
+            k += 1
+        return False
+
+
+def label_requirements(description: str, requirements: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Label every requirement of a job with an importance level.
+
+    Args:
+        description: Job description
+        requirements: Job requirements
+
+    Returns:
+        critical, important or nice-to-have for each requirement, in order
+    """
+    text = f"{description} {' '.join(requirements)}".lower()
+
+    critical, nice = _KeywordSpans(), _KeywordSpans()
+    for match in _KEYWORD_PATTERN.finditer(text):
+        start = match.start()
+        for spans, keyword in ((critical, match.group('critical')), (nice, match.group('nice'))):
+            if keyword:
+                spans.starts.append(start)
+                spans.ends.append(start + len(keyword))
+
+    labels = []
+    for req in requirements:
+        # Look for keywords near the requirement's first mention
+        mention = text.find(req.lower())
+        if mention < 0:
+            labels.append(DEFAULT_IMPORTANCE)
+            continue
+
+        lo, hi = max(0, mention - CONTEXT_WINDOW), mention + CONTEXT_WINDOW
+        if critical.any_within(lo, hi):
+            labels.append('critical')
+        elif nice.any_within(lo, hi):
+            labels.append('nice-to-have')
+        else:
+            labels.append(DEFAULT_IMPORTANCE)
+
+    return tuple(labels)
+
+
+class ImportanceAnnotator:
+    """Cached per-job requirement importance labels."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize the annotator.
+
+        Args:
+            max_entries: Jobs kept in the cache (uses Config.SKILL_IMPORTANCE_CACHE_SIZE if None)
+        """
+        self._cache = TTLCache(maxsize=max_entries or Config.SKILL_IMPORTANCE_CACHE_SIZE)
+
+    def annotate(self, job: Job) -> Tuple[str, ...]:
+        """
+        Get importance labels for a job's requirements.
+
+        Args:
+            job: Job posting
+
+        Returns:
+            One label per entry of job.requirements
+        """
+        # Keyed on the text itself (a bare hash could collide and return
+        # another job's labels); str hashes are memoized on the strings
+        key = (job.description, tuple(job.requirements))
+        labels = self._cache.get(key)
+        if labels is None:
+            labels = label_requirements(job.description, job.requirements)
+            self._cache.set(key, labels)
+        return labels
+
+    def clear(self) -> None:
+        """Drop all cached labels."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters for monitoring."""
+        return self._cache.stats()
+
+
+# Global annotator instance
+importance_annotator = ImportanceAnnotator()
@@ -0,0 +1,387 @@
+"""
+Shared skill vocabulary index.
+
+Interns normalized skill strings to integer IDs and precomputes which
+skills contain one another, so fuzzy skill overlap ("React" vs "React.js")
+becomes set operations on integers instead of nested substring scans.
+Skill sets can also be packed into uint64 bit vectors, so overlap
+against many jobs is a vectorized AND + popcount.
+
+Only corpus job requirements are interned. Requirements of jobs sent
+with a request get IDs in a per-request SkillOverlay, and a user's skills
+are related to the vocabulary with `lookup`; neither changes the shared
+vocabulary, so it grows with the corpus rather than with every request.
+"""
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Substrings up to this length are indexed for containment lookups
+GRAM_SIZE = 3
+
+_NO_IDS: FrozenSet[int] = frozenset()
+
+# Set-bit count for every byte value
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form used for skill comparison (lowercase, trimmed)."""
+    return skill.lower().strip()
+
+
+class SkillIndex:
+    """
+    Append-only vocabulary of canonical skills.
+
+    For every interned skill the index stores the IDs of all skills that
+    are a substring of it or contain it (itself included). The relation
+    is filled in once when a skill is first seen. Skills it contains are
+    found by looking up its substrings (at the lengths present in the
+    vocabulary); skills containing it are found through an index of every
+    substring of up to GRAM_SIZE characters, verifying only the skills
+    that share all of its GRAM_SIZE-grams. Neither scans the vocabulary.
+    Semantic near-synonyms are stored alongside by SkillSynonyms once the
+    skill has been embedded.
+    """
+
+    def __init__(self):
+        """Initialize an empty vocabulary."""
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self._related: List[Set[int]] = []
+        self._synonyms: List[Set[int]] = []
+        # Substring of up to GRAM_SIZE characters -> IDs of skills containing it
+        self._grams: Dict[str, Set[int]] = {}
+        self._lengths: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def intern(self, skill: str) -> int:
+        """
+        Get the ID for a skill, adding it to the vocabulary if new.
+
+        Args:
+            skill: Skill string (normalized internally)
+
+        Returns:
+            Integer skill ID
+        """
+        canonical = normalize_skill(skill)
+        skill_id = self._ids.get(canonical)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._ids.get(canonical)
+            if skill_id is not None:
+                return skill_id
+
+            skill_id = len(self._skills)
+            related = self._relate(canonical)
+            for other_id in related:
+                self._related[other_id].add(skill_id)
+            related.add(skill_id)
+
+            for length in range(1, GRAM_SIZE + 1):
+                for start in range(len(canonical) - length + 1):
+                    self._grams.setdefault(canonical[start:start + length], set()).add(skill_id)
+            self._lengths.add(len(canonical))
+
+            self._skills.append(canonical)
+            self._related.append(related)
+            self._synonyms.append(set())
+            # Publish the ID last so lock-free readers never see a partial entry
+            self._ids[canonical] = skill_id
+
+        return skill_id
+
+    def intern_all(self, skills: Iterable[str]) -> List[int]:
+        """Intern several skills, preserving order."""
+        return [self.intern(skill) for skill in skills]
+
+    def get(self, skill: str) -> Optional[int]:
+        """Get the ID for a skill without adding it (None if not interned)."""
+        return self._ids.get(normalize_skill(skill))
+
+    def lookup(self, skill: str) -> Set[int]:
+        """
+        IDs of vocabulary skills that contain or are contained in a skill.
+
+        The skill is not added to the vocabulary.
+
+        Args:
+            skill: Skill string (normalized internally)
+
+        Returns:
+            Related IDs (for an interned skill, its shared related set,
+            which must not be modified)
+        """
+        canonical = normalize_skill(skill)
+        skill_id = self._ids.get(canonical)
+        if skill_id is not None:
+            return self._related[skill_id]
+
+        with self._lock:
+            skill_id = self._ids.get(canonical)
+            if skill_id is not None:
+                return self._related[skill_id]
+            return self._relate(canonical)
+
+    def _relate(self, canonical: str) -> Set[int]:
+        """IDs of interned skills related to a canonical skill (hold the lock)."""
+        related: Set[int] = set()
+
+        # Interned skills it contains: look up its substrings by length
+        for length in self._lengths:
+            for start in range(len(canonical) - length + 1):
+                other_id = self._ids.get(canonical[start:start + length])
+                if other_id is not None:
+                    related.add(other_id)
+
+        # Interned skills containing it
+        if not canonical:
+            related.update(range(len(self._skills)))
+        elif len(canonical) <= GRAM_SIZE:
+            related |= self._grams.get(canonical, _NO_IDS)
+        else:
+            postings = sorted(
+                (self._grams.get(canonical[start:start + GRAM_SIZE], _NO_IDS)
+                 for start in range(len(canonical) - GRAM_SIZE + 1)),
+                key=len
+            )
+            if postings[0]:
+                candidates = postings[0].intersection(*postings[1:])
+                related.update(other_id for other_id in candidates if canonical in self._skills[other_id])
+
+        return related
+
+    def skill(self, skill_id: int) -> str:
+        """Get the canonical string for an ID."""
+        return self._skills[skill_id]
+
+    def related(self, skill_id: int) -> Set[int]:
+        """IDs of skills that contain or are contained in this one (itself included)."""
+        return self._related[skill_id]
+
+    def synonyms(self, skill_id: int) -> Set[int]:
+        """IDs of embedded near-synonyms of this skill (empty until linked)."""
+        return self._synonyms[skill_id]
+
+    def link_synonyms(self, skill_id: int, synonym_ids: Iterable[int]) -> None:
+        """
+        Record near-synonyms of a skill, in both directions.
+
+        Args:
+            skill_id: Skill ID
+            synonym_ids: IDs of skills similar to it
+        """
+        with self._lock:
+            for other_id in synonym_ids:
+                self._synonyms[skill_id].add(other_id)
+                self._synonyms[other_id].add(skill_id)
+
+    def coverage(self, skills: Iterable[str]) -> FrozenSet[int]:
+        """
+        All skill IDs matched, exactly or fuzzily, by a set of skills.
+
+        The result is a snapshot: intern the skills it will be compared
+        against before calling this. The given skills are not interned.
+
+        Args:
+            skills: Skills a user has
+
+        Returns:
+            Union of the related sets of every given skill
+        """
+        covered: Set[int] = set()
+        for skill in skills:
+            covered |= self.lookup(skill)
+        return frozenset(covered)
+
+    def overlay(self) -> "SkillOverlay":
+        """Create a request-local vocabulary on top of this one."""
+        return SkillOverlay(self)
+
+    def words(self) -> int:
+        """Number of uint64 words needed for a bit vector over the vocabulary."""
+        return max(1, (len(self._skills) + 63) // 64)
+
+    def bitset(self, skill_ids: Iterable[int], n_words: int) -> np.ndarray:
+        """
+        Pack skill IDs into a bit vector.
+
+        Args:
+            skill_ids: Skill IDs to set
+            n_words: Vector width in uint64 words
+
+        Returns:
+            Array of shape (n_words,)
+        """
+        return self.bitsets([list(skill_ids)], n_words)[0]
+
+    def bitsets(self, id_lists: Sequence[Sequence[int]], n_words: int) -> np.ndarray:
+        """
+        Pack one skill-ID list per row into a bit matrix.
+
+        IDs that do not fit in n_words are ignored.
+
+        Args:
+            id_lists: Skill IDs for each row
+            n_words: Row width in uint64 words
+
+        Returns:
+            Array of shape (len(id_lists), n_words)
+        """
+        bits = np.zeros((len(id_lists), n_words), dtype=np.uint64)
+        lengths = [len(ids) for ids in id_lists]
+        if not any(lengths):
+            return bits
+
+        ids = np.fromiter(
+            (skill_id for row in id_lists for skill_id in row),
+            dtype=np.int64,
+            count=sum(lengths)
+        )
+        rows = np.repeat(np.arange(len(id_lists)), lengths)
+        fits = ids < n_words * 64
+        ids, rows = ids[fits], rows[fits]
+        masks = np.left_shift(np.uint64(1), (ids & 63).astype(np.uint64))
+        np.bitwise_or.at(bits, (rows, ids >> 6), masks)
+        return bits
+
+
+class SkillOverlay:
+    """
+    Request-local skill IDs on top of a shared SkillIndex.
+
+    Skills already in the shared index when the overlay is created keep
+    their IDs; other skills get local IDs numbered after them and are
+    discarded with the overlay, so request data never grows the shared
+    vocabulary. Exposes the SkillIndex methods used for scoring (intern,
+    lookup, coverage, words, bitsets) with the same meaning. Relations
+    to local skills are found by comparing against the few local skills
+    directly.
+    """
+
+    def __init__(self, index: SkillIndex):
+        """
+        Initialize an empty overlay.
+
+        Args:
+            index: Shared vocabulary (only its current skills are visible)
+        """
+        self.index = index
+        self.base = len(index)
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self._vectors: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.base + len(self._skills)
+
+    def intern(self, skill: str) -> int:
+        """Get the ID for a skill, adding it to the overlay if the shared index lacks it."""
+        canonical = normalize_skill(skill)
+        skill_id = self.index.get(canonical)
+        if skill_id is not None and skill_id < self.base:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._ids.get(canonical)
+            if skill_id is None:
+                skill_id = self.base + len(self._skills)
+                self._skills.append(canonical)
+                self._ids[canonical] = skill_id
+                self._vectors = None
+            return skill_id
+
+    def intern_all(self, skills: Iterable[str]) -> List[int]:
+        """Intern several skills, preserving order."""
+        return [self.intern(skill) for skill in skills]
+
+    def local_skills(self) -> List[str]:
+        """Canonical overlay-only skills; skill i has ID base + i."""
+        return list(self._skills)
+
+    def local_vectors(self, embed) -> np.ndarray:
+        """
+        Embeddings of the overlay-only skills, computed once per set of skills.
+
+        Args:
+            embed: Function embedding a list of skills (e.g. SkillSynonyms.vectors)
+
+        Returns:
+            Array with one row per local skill
+        """
+        with self._lock:
+            if self._vectors is None or len(self._vectors) != len(self._skills):
+                self._vectors = embed(list(self._skills))
+            return self._vectors
+
+    def visible(self, skill_ids: Set[int]) -> Set[int]:
+        """
+        Drop shared IDs assigned after the overlay was created.
+
+        Such IDs would collide with local ones. Pass a set the caller owns.
+        """
+        if len(self.index) > self.base:
+            return {skill_id for skill_id in skill_ids if skill_id < self.base}
+        return skill_ids
+
+    def lookup(self, skill: str) -> Set[int]:
+        """IDs of visible skills that contain or are contained in a skill (a new set)."""
+        canonical = normalize_skill(skill)
+        related = set(self.index.lookup(canonical))
+        related = self.visible(related)
+        related.update(
+            self.base + position for position, other in enumerate(self._skills)
+            if canonical in other or other in canonical
+        )
+        return related
+
+    def coverage(self, skills: Iterable[str]) -> FrozenSet[int]:
+        """All IDs matched, exactly or fuzzily, by a set of skills (see SkillIndex.coverage)."""
+        covered: Set[int] = set()
+        for skill in skills:
+            covered |= self.lookup(skill)
+        return frozenset(covered)
+
+    def words(self) -> int:
+        """Number of uint64 words needed for a bit vector over the overlay."""
+        return max(1, (len(self) + 63) // 64)
+
+    def bitset(self, skill_ids: Iterable[int], n_words: int) -> np.ndarray:
+        """Pack skill IDs into a bit vector (see SkillIndex.bitset)."""
+        return self.index.bitset(skill_ids, n_words)
+
+    def bitsets(self, id_lists: Sequence[Sequence[int]], n_words: int) -> np.ndarray:
+        """Pack one skill-ID list per row into a bit matrix (see SkillIndex.bitsets)."""
+        return self.index.bitsets(id_lists, n_words)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """
+    Count set bits per row of a uint64 bit matrix.
+
+    Args:
+        bits: Array of shape (N, W)
+
+    Returns:
+        Array of N counts
+    """
+    bits = np.ascontiguousarray(bits, dtype=np.uint64)
+    if len(bits) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return _POPCOUNT8[bits.view(np.uint8)].reshape(len(bits), -1).sum(axis=1, dtype=np.int64)
+
+
+# Global shared vocabulary
+skill_index = SkillIndex()
@@ -0,0 +1,261 @@
+"""
+Semantic skill synonym matching.
+
+Embeds every distinct skill in the shared vocabulary once and resolves
+near-synonyms ("k8s" / "Kubernetes") with a thresholded similarity over
+the cached skill-embedding matrix. Each skill's synonyms are found when it
+is embedded and stored in the SkillIndex next to its substring relations,
+so expanding a skill set is a union of precomputed sets. Skills outside the
+vocabulary (a user's) are embedded and compared without being added, and
+the few skills of a request's SkillOverlay are compared directly.
+"""
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+from config import Config
+from models.embeddings import embedding_service
+from services.skill_index import SkillIndex, SkillOverlay, normalize_skill, skill_index
+
+logger = logging.getLogger(__name__)
+
+# Largest similarity block computed at once when linking new skills
+SIMILARITY_BLOCK_ELEMENTS = 1 << 24
+
+
+class SkillSynonyms:
+    """
+    Skill-embedding store keyed by skill ID.
+
+    Skill IDs are assigned sequentially, so row i of the matrix holds the
+    embedding of skill i and only newly interned skills need encoding and
+    comparing against the vocabulary.
+    """
+
+    def __init__(
+        self,
+        index: Optional[SkillIndex] = None,
+        embedder=None,
+        threshold: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            index: Skill vocabulary (uses the shared index if None)
+            embedder: Embedding service (uses the global instance if None)
+            threshold: Minimum cosine similarity for a synonym
+                (uses Config.SKILL_SYNONYM_THRESHOLD if None)
+            enabled: Resolve synonyms at all (uses Config.SKILL_SYNONYMS_ENABLED if None)
+        """
+        self.index = skill_index if index is None else index
+        self.embedder = embedding_service if embedder is None else embedder
+        self.threshold = Config.SKILL_SYNONYM_THRESHOLD if threshold is None else threshold
+        self.enabled = Config.SKILL_SYNONYMS_ENABLED if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((256, Config.EMBEDDING_DIMENSION), dtype=np.float32)
+        self._embedded = 0
+
+    def ensure_embedded(self) -> int:
+        """
+        Embed every skill interned since the last call, in one batch, and
+        link it to its near-synonyms in the index.
+
+        Returns:
+            Number of embedded skills
+        """
+        with self._lock:
+            total = len(self.index)
+            if total <= self._embedded:
+                return self._embedded
+
+            skills = [self.index.skill(skill_id) for skill_id in range(self._embedded, total)]
+            # Blank skills carry no meaning; leave their rows at zero
+            texts = [skill for skill in skills if skill]
+            vectors = self.embedder.embed_batch(texts) if texts else None
+
+            if total > self._matrix.shape[0]:
+                grown = np.zeros((max(total, self._matrix.shape[0] * 2), self._matrix.shape[1]), dtype=np.float32)
+                grown[:self._embedded] = self._matrix[:self._embedded]
+                self._matrix = grown
+
+            row = 0
+            for offset, skill in enumerate(skills):
+                if skill:
+                    self._matrix[self._embedded + offset] = vectors[row]
+                    row += 1
+
+            self._link_synonyms(self._embedded, total)
+            self._embedded = total
+            return total
+
+    def _link_synonyms(self, start: int, stop: int) -> None:
+        # Compare skills [start, stop) against every embedded skill (new ones
+        # included), a bounded block of columns at a time
+        matrix = self._matrix[:stop]
+        block = max(1, SIMILARITY_BLOCK_ELEMENTS // stop)
+        for block_start in range(start, stop, block):
+            block_stop = min(block_start + block, stop)
+            similar = (matrix @ matrix[block_start:block_stop].T) >= self.threshold
+            for offset, column in enumerate(similar.T):
+                self.index.link_synonyms(block_start + offset, np.flatnonzero(column).tolist())
+
+    def vectors(self, skills: Sequence[str]) -> np.ndarray:
+        """
+        Embed skills without adding them to the vocabulary.
+
+        Args:
+            skills: Skill strings (normalized internally)
+
+        Returns:
+            Array of shape (len(skills), D); blank skills get zero rows
+        """
+        canonical = [normalize_skill(skill) for skill in skills]
+        vectors = np.zeros((len(canonical), self._matrix.shape[1]), dtype=np.float32)
+        rows = [row for row, skill in enumerate(canonical) if skill]
+        if rows:
+            vectors[rows] = self.embedder.embed_batch([canonical[row] for row in rows])
+        return vectors
+
+    def matches(self, vectors: np.ndarray, skills: Iterable[str]) -> np.ndarray:
+        """
+        Check which embedded skills are near-synonyms of any given skill.
+
+        Args:
+            vectors: Skill embeddings from `vectors`
+            skills: Skills to compare against
+
+        Returns:
+            Boolean array aligned with the rows of vectors
+        """
+        skills = list(skills)
+        if not skills or not len(vectors):
+            return np.zeros(len(vectors), dtype=bool)
+        return ((vectors @ self.vectors(skills).T) >= self.threshold).any(axis=1)
+
+    def neighbours(self, skills: Sequence[str]) -> List[Set[int]]:
+        """
+        Find vocabulary skills that are near-synonyms of each given skill.
+
+        Interned skills use the synonyms linked when they were embedded.
+        Other skills are embedded together and compared against the
+        vocabulary in one product, without being added to it.
+
+        Args:
+            skills: Skill strings
+
+        Returns:
+            One set of IDs per skill (empty when synonym matching is
+            disabled; linked sets are shared and must not be modified)
+        """
+        if not self.enabled:
+            return [set() for _ in skills]
+
+        size = self.ensure_embedded()
+        neighbours: List[Set[int]] = []
+        # Canonical skill -> positions of skills not embedded in the vocabulary
+        unknown: Dict[str, List[int]] = {}
+        for position, skill in enumerate(skills):
+            skill_id = self.index.get(skill)
+            if skill_id is not None and skill_id < size:
+                neighbours.append(self.index.synonyms(skill_id))
+            else:
+                neighbours.append(set())
+                unknown.setdefault(normalize_skill(skill), []).append(position)
+
+        if unknown and size:
+            texts = list(unknown)
+            # (V, D) x (D, K) similarity matrix, thresholded per skill
+            similar = (self._matrix[:size] @ self.vectors(texts).T) >= self.threshold
+            for text, column in zip(texts, similar.T):
+                ids = set(np.flatnonzero(column).tolist())
+                for position in unknown[text]:
+                    neighbours[position] = ids
+
+        return neighbours
+
+    def expand(self, skills: Iterable[str]) -> Set[int]:
+        """
+        Find vocabulary skills that are near-synonyms of the given ones.
+
+        Args:
+            skills: Skill strings to expand
+
+        Returns:
+            IDs whose embedding similarity to any given skill meets the
+            threshold (empty when synonym matching is disabled)
+        """
+        expanded: Set[int] = set()
+        for ids in self.neighbours(list(skills)):
+            expanded |= ids
+        return expanded
+
+    def covers(
+        self,
+        skills: Sequence[str],
+        vocabulary: Optional[Union[SkillIndex, SkillOverlay]] = None
+    ) -> List[Set[int]]:
+        """
+        Skills matched by each given skill: exact, substring or synonym.
+
+        Intern the skills the result will be compared against first. The
+        given skills are not interned.
+
+        Args:
+            skills: Skills a user has
+            vocabulary: Index or request overlay the IDs refer to
+                (uses the shared index if None)
+
+        Returns:
+            One set of covered IDs per skill (must not be modified)
+        """
+        if vocabulary is None or vocabulary is self.index:
+            related = [self.index.lookup(skill) for skill in skills]
+            if not self.enabled:
+                return related
+            return [ids | synonyms for ids, synonyms in zip(related, self.neighbours(skills))]
+
+        related = [vocabulary.lookup(skill) for skill in skills]
+        if not self.enabled:
+            return related
+
+        for ids, synonyms in zip(related, self.neighbours(skills)):
+            ids |= vocabulary.visible(set(synonyms))
+
+        local = vocabulary.local_skills()
+        if local and skills:
+            similar = (self.vectors(skills) @ vocabulary.local_vectors(self.vectors).T) >= self.threshold
+            for ids, row in zip(related, similar):
+                ids.update(vocabulary.base + position for position in np.flatnonzero(row).tolist())
+        return related
+
+    def coverage(
+        self,
+        skills: Iterable[str],
+        vocabulary: Optional[Union[SkillIndex, SkillOverlay]] = None
+    ) -> FrozenSet[int]:
+        """
+        Skills matched by the given ones: exact, substring or synonym.
+
+        Intern the skills the result will be compared against first.
+
+        Args:
+            skills: Skills a user has
+            vocabulary: Index or request overlay the IDs refer to
+                (uses the shared index if None)
+
+        Returns:
+            Covered skill IDs
+        """
+        covered: Set[int] = set()
+        for ids in self.covers(list(skills), vocabulary):
+            covered |= ids
+        return frozenset(covered)
+
+
+# Global synonym store over the shared vocabulary
+skill_synonyms = SkillSynonyms()
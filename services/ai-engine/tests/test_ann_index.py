@@ -0,0 +1,97 @@
+"""
+Tests for the IVF approximate nearest-neighbour index.
+"""
+import numpy as np
+import pytest
+from models.ann_index import IVFIndex
+
+DIM = 32
+
+
+def normalized(rng, n):
+    """Create clustered unit vectors."""
+    centers = rng.standard_normal((20, DIM))
+    points = centers[rng.integers(0, 20, n)] + 0.3 * rng.standard_normal((n, DIM))
+    points /= np.linalg.norm(points, axis=1, keepdims=True)
+    return points.astype(np.float32)
+
+
+@pytest.fixture
+def data():
+    """Create indexed vectors and queries."""
+    rng = np.random.default_rng(42)
+    return normalized(rng, 3000), normalized(rng, 50)
+
+
+def exact_top_k(vectors, query, k):
+    return set(np.argsort(-(vectors @ query))[:k].tolist())
+
+
+def test_untrained_index_is_exact(data):
+    """Test that an untrained index performs a brute-force scan."""
+    vectors, queries = data
+    index = IVFIndex(dimension=DIM, nlist=32, nprobe=4)
+    index.add([str(i) for i in range(len(vectors))], vectors)
+
+    ids, scores = index.search(queries[0], 10)
+
+    assert {int(i) for i in ids} == exact_top_k(vectors, queries[0], 10)
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_recall_improves_with_nprobe(data):
+    """Test the recall/latency knob."""
+    vectors, queries = data
+    index = IVFIndex(dimension=DIM, nlist=32, nprobe=1)
+    index.add([str(i) for i in range(len(vectors))], vectors)
+    index.train()
+
+    def recall(nprobe):
+        hits = 0
+        for query in queries:
+            ids, _ = index.search(query, 10, nprobe=nprobe)
+            hits += len({int(i) for i in ids} & exact_top_k(vectors, query, 10))
+        return hits / (10 * len(queries))
+
+    assert recall(8) >= recall(1)
+    assert recall(8) >= 0.9
+    assert recall(32) == 1.0
+
+
+def test_incremental_insert_and_delete(data):
+    """Test adding, replacing and removing vectors after training."""
+    vectors, queries = data
+    index = IVFIndex(dimension=DIM, nlist=16, nprobe=16)
+    index.add([str(i) for i in range(1000)], vectors[:1000])
+    index.train()
+
+    index.add(["new"], queries[:1])
+    ids, _ = index.search(queries[0], 1)
+    assert ids == ["new"]
+
+    assert index.remove(["new", "missing"]) == 1
+    assert "new" not in index
+    assert len(index) == 1000
+
+    index.add(["0"], queries[1:2])
+    assert len(index) == 1000
+    ids, _ = index.search(queries[1], 1)
+    assert ids == ["0"]
+
+
+def test_save_and_load(tmp_path, data):
+    """Test that a saved index returns the same results."""
+    vectors, queries = data
+    index = IVFIndex(dimension=DIM, nlist=16, nprobe=4)
+    index.add([f"job-{i}" for i in range(len(vectors))], vectors)
+    index.train()
+    index.remove(["job-5"])
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = IVFIndex.load(path)
+
+    assert len(loaded) == len(index)
+    assert loaded.is_trained
+    for query in queries[:5]:
+        assert loaded.search(query, 10)[0] == index.search(query, 10)[0]
@@ -0,0 +1,106 @@
+"""
+Tests for the content-addressed embedding cache.
+"""
+import time
+
+import numpy as np
+import pytest
+from models.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def vector():
+    """Create a sample embedding vector."""
+    rng = np.random.default_rng(0)
+    v = rng.standard_normal(384).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+def test_memory_hit_and_miss(vector):
+    """Test that stored embeddings are served from memory."""
+    cache = EmbeddingCache(model_name="test-model", path="")
+
+    assert cache.get("Job title: Engineer") is None
+    cache.put("Job title: Engineer", vector)
+
+    cached = cache.get("Job title: Engineer")
+    assert np.allclose(cached, vector)
+    assert not cached.flags.writeable
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_keys_depend_on_model_and_text():
+    """Test that the cache key covers both model name and text."""
+    a = EmbeddingCache(model_name="model-a", path="")
+    b = EmbeddingCache(model_name="model-b", path="")
+
+    assert a.key("text") != b.key("text")
+    assert a.key("text") != a.key("text ")
+    assert a.key("text") == EmbeddingCache(model_name="model-a", path="").key("text")
+
+
+def test_disk_tier_survives_restart(tmp_path, vector):
+    """Test that embeddings persist in the SQLite tier."""
+    path = str(tmp_path / "embeddings.sqlite3")
+
+    EmbeddingCache(model_name="test-model", path=path).put("profile text", vector)
+
+    restarted = EmbeddingCache(model_name="test-model", path=path)
+    cached = restarted.get("profile text")
+
+    assert cached is not None
+    assert np.allclose(cached, vector)
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_ttl_expiry(vector):
+    """Test that memory entries expire after the TTL."""
+    cache = EmbeddingCache(model_name="test-model", ttl=1, path="")
+    cache._memory.ttl = 0.01
+    cache.put("text", vector)
+
+    time.sleep(0.02)
+
+    assert cache.get("text") is None
+    assert cache.stats()["memory_expirations"] == 1
+
+
+def test_disk_tier_expires_rows(tmp_path, vector, monkeypatch):
+    """Test that disk rows older than the TTL are neither served nor kept."""
+    path = str(tmp_path / "embeddings.sqlite3")
+    EmbeddingCache(model_name="test-model", ttl=60, path=path).put("profile text", vector)
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    restarted = EmbeddingCache(model_name="test-model", ttl=60, path=path)
+
+    assert restarted.get("profile text") is None
+    assert restarted.stats()["disk_entries"] == 0
+
+
+def test_disk_tier_prunes_oldest_rows(tmp_path, vector):
+    """Test that the disk tier keeps at most its row cap, dropping the oldest."""
+    cache = EmbeddingCache(model_name="test-model", path=str(tmp_path / "e.sqlite3"), disk_max_entries=3)
+    for text in ["a", "b", "c", "d", "e"]:
+        cache.put(text, vector)
+    cache.clear()
+
+    assert cache.stats()["disk_entries"] == 3
+    assert cache.get("a") is None
+    assert cache.get("e") is not None
+
+
+def test_lru_eviction(vector):
+    """Test that the least recently used entry is evicted first."""
+    cache = EmbeddingCache(model_name="test-model", max_entries=2, path="")
+    cache.put("a", vector)
+    cache.put("b", vector)
+    cache.get("a")
+    cache.put("c", vector)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.stats()["memory_evictions"] == 1
@@ -0,0 +1,38 @@
+"""
+Tests for the multi-process embedding pool.
+"""
+import numpy as np
+import pytest
+
+from models.embedding_pool import EmbeddingProcessPool
+from models.embeddings import EmbeddingService
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Start a two-process pool once for the module."""
+    pool = EmbeddingProcessPool(processes=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_matches_in_process_encoding(pool):
+    """Test that shared-memory results equal in-process model output."""
+    texts = [f"Senior engineer number {i} with Python and Go" for i in range(10)]
+
+    pooled = pool.encode(texts, batch_size=4)
+    local = EmbeddingService().model.encode(
+        texts,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+    assert pooled.shape == (len(texts), pool.dimension)
+    assert np.allclose(pooled, local, atol=1e-5)
+    assert pool.stats()["chunks"] == 2
+
+
+def test_pool_handles_empty_input(pool):
+    """Test that no texts yields an empty matrix without touching workers."""
+    assert pool.encode([]).shape == (0, pool.dimension)
@@ -0,0 +1,67 @@
+"""
+Tests for the bounded inference executor.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from utils.executor import InferenceExecutor, InferenceQueueFull
+
+
+@pytest.fixture
+def executor():
+    """Create a small executor and stop its threads afterwards."""
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_runs_off_event_loop_thread(executor):
+    """Test that work runs on a worker thread and its result is returned."""
+    async def main():
+        loop_thread = threading.get_ident()
+        worker_thread = await executor.run(threading.get_ident)
+        return loop_thread, worker_thread
+
+    loop_thread, worker_thread = asyncio.run(main())
+
+    assert worker_thread != loop_thread
+    assert executor.stats()["completed"] == 1
+
+
+def test_rejects_when_queue_full(executor):
+    """Test backpressure once every worker and queue slot is taken."""
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        waiting = asyncio.ensure_future(executor.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        with pytest.raises(InferenceQueueFull):
+            await executor.run(lambda: None)
+
+        release.set()
+        return stats, await asyncio.gather(running, waiting)
+
+    stats, results = asyncio.run(main())
+
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    assert results == [True, "done"]
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["queued"] == 0
+
+
+def test_failures_are_counted_and_raised(executor):
+    """Test that exceptions propagate to the caller."""
+    def boom():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(boom))
+
+    assert executor.stats()["failed"] == 1
+    assert executor.stats()["active"] == 0
@@ -0,0 +1,117 @@
+"""
+Tests for columnar job scoring.
+"""
+import itertools
+import random
+
+import pytest
+
+from models.schemas import ExperienceLevel, Job, UserProfile, WorkType
+from services.job_batch import JobBatch
+from services.seniority import SENIORITY_TERMS, SeniorityClassifier
+from services.matching import MatchingService
+
+SALARIES = [None, 0, 40000, 80000, 100000, 150000]
+TITLES = ["Junior Developer", "Senior Engineer", "Engineering Director", "Software Engineer", "Head of Data"]
+WORK_TYPES = [None] + list(WorkType)
+
+
+@pytest.fixture
+def jobs():
+    """Create jobs covering every work type and salary shape."""
+    rng = random.Random(0)
+    return [
+        Job(
+            job_id=f"job-{i}",
+            title=rng.choice(TITLES),
+            company="Acme",
+            description=rng.choice(["Build APIs.", "Lead the platform team.", "Entry-level role."]),
+            work_type=work_type,
+            salary_min=salary_min,
+            salary_max=salary_max,
+        )
+        for i, (work_type, salary_min, salary_max) in enumerate(
+            itertools.product(WORK_TYPES, SALARIES, SALARIES)
+        )
+    ]
+
+
+@pytest.mark.parametrize("experience_level", [None] + list(ExperienceLevel))
+@pytest.mark.parametrize("work_style", WORK_TYPES)
+def test_experience_and_location_match_per_job(jobs, experience_level, work_style):
+    """Test that vectorized experience/location scores equal the per-job ones."""
+    service = MatchingService()
+    profile = UserProfile(user_id="u", experience_level=experience_level, work_style=work_style)
+    batch = JobBatch(jobs)
+
+    assert batch.experience_scores(profile).tolist() == [service._score_experience(profile, job) for job in jobs]
+    assert batch.location_scores(profile).tolist() == [service._score_location(profile, job) for job in jobs]
+
+
+@pytest.mark.parametrize("salary_min,salary_max", [
+    (None, None), (0, 0), (60000, None), (None, 90000), (60000, 120000), (90000, 90000), (120000, 60000),
+])
+def test_salary_matches_per_job(jobs, salary_min, salary_max):
+    """Test that vectorized salary scores equal the per-job ones, including falsy zeros."""
+    service = MatchingService()
+    profile = UserProfile(user_id="u", salary_min=salary_min, salary_max=salary_max)
+
+    batched = JobBatch(jobs).salary_scores(profile)
+
+    assert batched.tolist() == [service._score_salary(profile, job) for job in jobs]
+
+
+def _reference_level(job):
+    """Keyword scan used before seniority inference was cached."""
+    job_text = f"{job.title} {job.description}".lower()
+    for level, terms in SENIORITY_TERMS:
+        if any(term in job_text for term in terms):
+            return level
+    return 'mid'
+
+
+@pytest.mark.parametrize("title,description", [
+    ("Software Engineer", "Build APIs."),
+    ("Senior Engineer", "Mentor junior developers."),
+    ("VP of Engineering", "Lead the org."),
+    ("Head", "of platform, early"),
+    ("Early", "career programme"),
+    ("Sentry developer", "Error tracking."),
+    ("Staff Engineer", "Report to the Chief Architect."),
+])
+def test_seniority_matches_keyword_scan(title, description):
+    """Test that the compiled matcher agrees with per-term substring checks."""
+    job = Job(job_id="j", title=title, company="Acme", description=description)
+
+    assert SeniorityClassifier().level(job) == _reference_level(job)
+
+
+def test_seniority_cached_by_job_and_content():
+    """Test that levels are reused per job and recomputed when the text changes."""
+    classifier = SeniorityClassifier()
+    job = Job(job_id="j", title="Junior Developer", company="Acme", description="Build APIs.")
+
+    assert classifier.level(job) == "entry"
+    assert classifier.level(job) == "entry"
+    assert classifier.stats()["hits"] == 1
+
+    promoted = job.model_copy(update={"title": "Director of Engineering"})
+    assert classifier.level(promoted) == "executive"
+    assert classifier.stats()["misses"] == 2
+
+
+class CollidingText(str):
+    """String whose hash collides with every other CollidingText."""
+
+    def __hash__(self):
+        return 0
+
+
+def test_seniority_hash_collisions_are_not_shared():
+    """Test that postings whose text hashes collide keep their own levels."""
+    classifier = SeniorityClassifier()
+    junior = Job.model_construct(job_id="j", title=CollidingText("Junior Developer"), description="")
+    director = Job.model_construct(job_id="j", title=CollidingText("Director"), description="")
+
+    assert classifier.level(junior) == "entry"
+    assert classifier.level(director) == "executive"
@@ -0,0 +1,291 @@
+"""
+Tests for the server-side job corpus.
+"""
+import json
+
+import numpy as np
+import pytest
+from models.schemas import Job, UserProfile, WorkType
+from models.quantization import as_float32
+from services.job_batch import JobBatch
+from services.job_corpus import JobCorpus
+from services.matching import MatchingService
+
+
+def make_job(i: int, **overrides) -> Job:
+    """Create a sample job posting."""
+    data = dict(
+        job_id=f"job-{i}",
+        title=f"Backend Engineer {i}",
+        company="Tech Corp",
+        description="Build scalable APIs with Python.",
+        requirements=["Python", "FastAPI"],
+        work_type=WorkType.REMOTE,
+    )
+    data.update(overrides)
+    return Job(**data)
+
+
+@pytest.fixture
+def corpus():
+    """Create an empty corpus."""
+    return JobCorpus(initial_capacity=2)
+
+
+def test_upsert_and_snapshot(corpus):
+    """Test that upserted jobs line up with their embeddings."""
+    jobs = [make_job(i) for i in range(5)]
+    result = corpus.upsert(jobs)
+
+    assert result == {"inserted": 5, "updated": 0, "unchanged": 0}
+    assert len(corpus) == 5
+
+    snapshot = corpus.snapshot()
+    assert [job.job_id for job in snapshot.jobs] == [job.job_id for job in jobs]
+    assert snapshot.embeddings.dtype == np.float32
+    assert snapshot.embeddings.flags["C_CONTIGUOUS"]
+
+    expected = corpus.embedder.embed_job(jobs[3].dict())
+    assert np.allclose(snapshot.embeddings[3], expected, atol=1e-5)
+
+
+def test_upsert_detects_unchanged_and_updated(corpus):
+    """Test that only changed postings are replaced."""
+    corpus.upsert([make_job(1), make_job(2)])
+    result = corpus.upsert([make_job(1), make_job(2, title="Staff Engineer")])
+
+    assert result == {"inserted": 0, "updated": 1, "unchanged": 1}
+    assert corpus.get("job-2").title == "Staff Engineer"
+    assert len(corpus) == 2
+
+
+def test_delete_and_load(corpus):
+    """Test deletion and bulk replacement."""
+    corpus.upsert([make_job(i) for i in range(4)])
+
+    assert corpus.delete(["job-0", "missing"]) == 1
+    assert "job-0" not in corpus
+
+    result = corpus.load([make_job(1), make_job(9)])
+    assert result["deleted"] == 2
+    assert result["inserted"] == 1
+    assert result["unchanged"] == 1
+    assert sorted(job.job_id for job in corpus.snapshot().jobs) == ["job-1", "job-9"]
+
+
+def test_snapshot_is_isolated_from_writes(corpus):
+    """Test that a snapshot does not change under later writes."""
+    corpus.upsert([make_job(i) for i in range(3)])
+    snapshot = corpus.snapshot()
+    before = snapshot.embeddings.copy()
+
+    corpus.upsert([make_job(1, title="Changed"), make_job(7)])
+    corpus.delete(["job-0"])
+
+    assert [job.job_id for job in snapshot.jobs] == ["job-0", "job-1", "job-2"]
+    assert np.array_equal(snapshot.embeddings, before)
+
+
+def test_match_by_id_equals_inline_match(corpus):
+    """Test that corpus matching gives the same results as inline jobs."""
+    jobs = [make_job(i, requirements=["Python", "Docker"][: i % 2 + 1]) for i in range(6)]
+    corpus.upsert(jobs)
+    profile = UserProfile(user_id="u1", skills=["Python"])
+    service = MatchingService()
+
+    inline = service.match_profile_to_jobs(profile, jobs[:4], limit=4)
+    by_id = service.match_profile_to_corpus(
+        profile, corpus, job_ids=[job.job_id for job in jobs[:4]], limit=4
+    )
+
+    assert [m.model_dump() for m in by_id] == [m.model_dump() for m in inline]
+
+
+def test_skill_bits_are_stored_with_rows(corpus, monkeypatch):
+    """Test that packed requirements follow upserts, compaction and vocabulary growth."""
+    corpus.upsert([make_job(i, requirements=[f"skill {i}", "Python"]) for i in range(70)])
+    corpus.delete([f"job-{i}" for i in range(0, 70, 2)])
+    corpus.upsert([make_job(i, requirements=[f"new skill {i}" for i in range(i, i + 80)]) for i in range(3)])
+
+    snapshot = corpus.snapshot()
+    expected = JobBatch.pack_skills(snapshot.jobs)
+    width = max(expected.shape[1], snapshot.skill_bits.shape[1])
+    assert np.array_equal(
+        np.pad(snapshot.skill_bits, ((0, 0), (0, width - snapshot.skill_bits.shape[1]))),
+        np.pad(expected, ((0, 0), (0, width - expected.shape[1])))
+    )
+
+    def fail(jobs):
+        raise AssertionError("corpus matching repacked requirements")
+
+    monkeypatch.setattr(JobBatch, "pack_skills", staticmethod(fail))
+    profile = UserProfile(user_id="u1", skills=["Python"])
+    assert len(MatchingService().match_profile_to_corpus(profile, corpus, limit=5)) == 5
+
+
+def test_skill_bits_widening_keeps_row_capacity():
+    """Test that a growing vocabulary widens the bit matrix without doubling its rows."""
+    corpus = JobCorpus(initial_capacity=256)
+    for i in range(200):
+        corpus.upsert([make_job(i, requirements=[f"widening skill {i}-{k}" for k in range(3)])])
+
+    assert corpus._skill_bits.shape[0] == 256
+
+
+def test_ann_candidate_stage(monkeypatch):
+    """Test that whole-corpus matching goes through the ANN shortlist."""
+    from config import Config
+
+    monkeypatch.setattr(Config, "ANN_MIN_CORPUS_SIZE", 20)
+    monkeypatch.setattr(Config, "ANN_CANDIDATES", 5)
+
+    corpus = JobCorpus(ann_enabled=True)
+    corpus.upsert([make_job(i, description=f"Role number {i} building APIs") for i in range(40)])
+    assert corpus.index.is_trained
+
+    profile = UserProfile(user_id="u1", skills=["Python"])
+    service = MatchingService()
+    embedding = service.embedder.embed_profile(profile.dict())
+
+    candidates = corpus.candidate_ids(embedding, 10)
+    assert candidates is not None and len(candidates) == 10
+
+    matches = service.match_profile_to_corpus(profile, corpus, limit=3)
+    assert len(matches) == 3
+    assert {m.job_id for m in matches} <= set(
+        corpus.candidate_ids(embedding, max(Config.ANN_CANDIDATES, 30))
+    )
+
+
+def test_ann_index_reads_vectors_from_store(monkeypatch):
+    """Test that the ANN index scores compact store rows instead of copying vectors."""
+    from config import Config
+
+    monkeypatch.setattr(Config, "ANN_MIN_CORPUS_SIZE", 20)
+    corpus = JobCorpus(ann_enabled=True, dtype="int8")
+    corpus.upsert([make_job(i, description=f"Role number {i} building APIs") for i in range(40)])
+    corpus.delete(["job-3"])
+
+    query = corpus.snapshot(["job-7"]).embeddings.to_float32()[0]
+    ids, _ = corpus.index.search(query, 40, nprobe=corpus.index.nlist)
+
+    assert corpus.index.stats()["vector_bytes"] == 0
+    assert ids[0] == "job-7"
+    assert len(ids) == 39 and "job-3" not in ids
+
+
+def test_restore_loads_saved_ann_index(tmp_path, monkeypatch):
+    """Test that a restored corpus reuses the saved ANN index instead of retraining."""
+    from config import Config
+    from models.ann_index import IVFIndex
+
+    monkeypatch.setattr(Config, "ANN_MIN_CORPUS_SIZE", 20)
+    original = JobCorpus(ann_enabled=True)
+    original.upsert([make_job(i, description=f"Role number {i} building APIs") for i in range(40)])
+    prefix = str(tmp_path / "corpus")
+    original.save(prefix)
+
+    def fail(self, *args, **kwargs):
+        raise AssertionError("restore retrained the ANN index")
+
+    monkeypatch.setattr(IVFIndex, "train", fail)
+    restored = JobCorpus(ann_enabled=True)
+    assert restored.restore(prefix)
+
+    query = original.snapshot(["job-7"]).embeddings[0]
+    assert restored.index.is_trained
+    assert restored.candidate_ids(query, 10) == original.candidate_ids(query, 10)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_save_and_restore_memory_mapped(tmp_path, dtype):
+    """Test that a restored corpus is memory-mapped and matches the original."""
+    original = JobCorpus(dtype=dtype)
+    original.upsert([make_job(i) for i in range(5)])
+    original.delete(["job-2"])
+    prefix = str(tmp_path / "corpus")
+
+    assert original.save(prefix) == 4
+
+    restored = JobCorpus()
+    assert restored.restore(prefix)
+    assert restored.stats()["memory_mapped"] == 1
+    assert [job.job_id for job in restored.snapshot().jobs] == ["job-0", "job-1", "job-3", "job-4"]
+    assert restored.get("job-3") == original.get("job-3")
+    assert np.array_equal(
+        as_float32(restored.snapshot(["job-3"]).embeddings),
+        as_float32(original.snapshot(["job-3"]).embeddings)
+    )
+    assert np.array_equal(restored.snapshot().skill_bits, original.snapshot().skill_bits)
+
+    # Writes go to private memory, leaving the mapped files untouched
+    restored.upsert([make_job(9)])
+    assert restored.stats()["memory_mapped"] == 0
+    assert len(restored.snapshot()) == 5
+
+    again = JobCorpus()
+    assert again.restore(prefix)
+    assert len(again) == 4
+
+
+def test_save_writes_generations(tmp_path):
+    """Test that each save writes a new file set and prunes all but the previous one."""
+    corpus = JobCorpus()
+    prefix = str(tmp_path / "corpus")
+    generations = []
+    for i in range(3):
+        corpus.upsert([make_job(i)])
+        corpus.save(prefix)
+        with open(f"{prefix}.meta.json") as f:
+            generations.append(json.load(f)["generation"])
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == sorted(
+        ["corpus.meta.json"]
+        + [f"corpus.{generation}.{suffix}" for generation in generations[1:]
+           for suffix in ("embeddings.bin", "jobs.json")]
+    )
+
+    restored = JobCorpus()
+    assert restored.restore(prefix)
+    assert len(restored) == 3
+
+
+def test_restore_rejects_truncated_embeddings(tmp_path):
+    """Test that an embeddings file of the wrong size is not mapped."""
+    corpus = JobCorpus()
+    corpus.upsert([make_job(i) for i in range(3)])
+    prefix = str(tmp_path / "corpus")
+    corpus.save(prefix)
+
+    with open(f"{prefix}.meta.json") as f:
+        embeddings_path = f"{prefix}.{json.load(f)['generation']}.embeddings.bin"
+    with open(embeddings_path, "r+b") as f:
+        f.truncate(100)
+
+    restored = JobCorpus()
+    assert not restored.restore(prefix)
+    assert len(restored) == 0
+
+
+def test_restore_then_unchanged_upsert(tmp_path):
+    """Test that resyncing unchanged jobs after a restore leaves the mapped files alone."""
+    original = JobCorpus()
+    original.upsert([make_job(i) for i in range(3)])
+    prefix = str(tmp_path / "corpus")
+    original.save(prefix)
+
+    restored = JobCorpus()
+    assert restored.restore(prefix)
+
+    assert restored.upsert([make_job(1)]) == {"inserted": 0, "updated": 0, "unchanged": 1}
+    assert restored.stats()["memory_mapped"] == 1
+    assert restored.upsert([make_job(1, title="Changed")])["updated"] == 1
+    assert restored.get("job-1").title == "Changed"
+
+
+def test_restore_without_snapshot(tmp_path):
+    """Test that a missing snapshot leaves the corpus empty."""
+    corpus = JobCorpus()
+    assert not corpus.restore(str(tmp_path / "missing"))
+    assert len(corpus) == 0
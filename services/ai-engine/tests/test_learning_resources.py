@@ -0,0 +1,56 @@
+"""
+Tests for the learning resource catalog.
+"""
+import json
+import sqlite3
+
+from services.learning_resources import LearningResourceCatalog
+
+
+def test_platform_links_without_curated_file():
+    """Test the generated platform links and their memoization."""
+    catalog = LearningResourceCatalog(path="")
+
+    assert catalog.gap_resources("Machine Learning") == [
+        "Coursera: https://www.coursera.org/search?query=Machine+Learning",
+        "Udemy: https://www.udemy.com/courses/search/?q=Machine+Learning",
+    ]
+    paths = catalog.path_resources("Machine Learning")
+    assert [r["title"] for r in paths] == [
+        "Learn Machine Learning on Coursera",
+        "Learn Machine Learning on Udemy",
+        "Learn Machine Learning on Pluralsight",
+    ]
+
+    paths[0]["title"] = "changed"
+    assert catalog.path_resources("Machine Learning")[0]["title"] == "Learn Machine Learning on Coursera"
+    assert catalog.stats()["hits"] == 2
+
+
+def test_curated_json_resources_first(tmp_path):
+    """Test that curated JSON resources are matched by canonical skill."""
+    path = tmp_path / "resources.json"
+    path.write_text(json.dumps({" Python": [{"title": "Python Crash Course", "url": "https://example.com/py"}]}))
+    catalog = LearningResourceCatalog(path=str(path))
+
+    assert catalog.path_resources("PYTHON")[0] == {"title": "Python Crash Course", "url": "https://example.com/py"}
+    assert catalog.gap_resources("python")[0] == "Python Crash Course: https://example.com/py"
+    assert len(catalog.gap_resources("Go")) == 2
+
+
+def test_curated_sqlite_resources(tmp_path):
+    """Test that curated resources can be read from SQLite."""
+    path = tmp_path / "resources.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE resources (skill TEXT, title TEXT, url TEXT)")
+    conn.executemany("INSERT INTO resources VALUES (?, ?, ?)", [
+        ("kubernetes", "K8s Basics", "https://example.com/k8s"),
+        ("kubernetes", "CKA Prep", "https://example.com/cka"),
+    ])
+    conn.commit()
+    conn.close()
+
+    catalog = LearningResourceCatalog(path=str(path))
+
+    assert [r["title"] for r in catalog.path_resources("Kubernetes")[:2]] == ["K8s Basics", "CKA Prep"]
+    catalog.close()
@@ -1,9 +1,11 @@
 """
 Integration tests for matching service.
 """
+import numpy as np
 import pytest
 from models.schemas import UserProfile, Job, ExperienceLevel, WorkType
 from services.matching import MatchingService
+from services.skill_index import skill_index
 
 
 @pytest.fixture
@@ -156,5 +158,85 @@ def test_limit_respected(matching_service, sample_profile, sample_jobs):
     assert len(matches) == 2
 
 
+def test_batched_job_embeddings_match_single(matching_service, sample_jobs):
+    """Test that batched job encoding yields the per-job vectors."""
+    embedder = matching_service.embedder
+    job_dicts = [job.dict() for job in sample_jobs]
+
+    batched = embedder.embed_jobs(job_dicts)
+    single = np.stack([embedder.embed_job(job) for job in job_dicts])
+
+    assert batched.shape == single.shape
+    assert np.allclose(batched, single, atol=1e-5)
+
+
+def test_embedding_text_reads_models_directly(matching_service, sample_profile, sample_jobs):
+    """Test that models yield the same embedding text as their dumped dicts."""
+    embedder = matching_service.embedder
+
+    assert embedder.build_profile_text(sample_profile) == embedder.build_profile_text(sample_profile.model_dump())
+    for job in sample_jobs:
+        assert embedder.build_job_text(job) == embedder.build_job_text(job.model_dump())
+
+
+def test_batched_similarity_matches_pairwise(matching_service, sample_profile, sample_jobs):
+    """Test that batched cosine similarity equals per-job scores."""
+    embedder = matching_service.embedder
+    profile_embedding = embedder.embed_profile(sample_profile.dict())
+    job_embeddings = embedder.embed_jobs([job.dict() for job in sample_jobs])
+
+    batched = embedder.cosine_similarity_batch(profile_embedding, job_embeddings)
+    pairwise = [embedder.cosine_similarity(profile_embedding, e) for e in job_embeddings]
+
+    assert batched.shape == (len(sample_jobs),)
+    assert np.allclose(batched, pairwise, atol=1e-6)
+    assert ((batched >= 0) & (batched <= 1)).all()
+
+
+def test_batched_skill_scores_match_per_job(matching_service, sample_profile, sample_jobs):
+    """Test that bitset skill scoring equals the per-job skill scores."""
+    jobs = sample_jobs + [sample_jobs[0].model_copy(update={"requirements": []})]
+
+    batched = matching_service._score_skills_batch(sample_profile.skills, jobs)
+    per_job = [
+        matching_service._score_skills(sample_profile.skills, job.requirements)['score']
+        for job in jobs
+    ]
+
+    assert batched.tolist() == per_job
+
+
+def test_batch_matching_matches_single_profile(matching_service, sample_profile, sample_jobs):
+    """Test that batched multi-profile matching equals per-profile matching."""
+    other = sample_profile.model_copy(update={
+        "user_id": "test-user-2",
+        "skills": ["React", "JavaScript"],
+        "experience_level": ExperienceLevel.ENTRY,
+        "work_style": WorkType.ONSITE,
+    })
+    profiles = [sample_profile, other]
+
+    batched = matching_service.match_profiles_to_jobs(profiles, sample_jobs, limit=2)
+
+    assert len(batched) == len(profiles)
+    for profile, matches in zip(profiles, batched):
+        single = matching_service.match_profile_to_jobs(profile, sample_jobs, limit=2)
+        assert [m.job_id for m in matches] == [m.job_id for m in single]
+        assert [m.match_score for m in matches] == [m.match_score for m in single]
+        assert matches == single
+
+
+def test_inline_jobs_do_not_grow_vocabulary(matching_service, sample_profile, sample_jobs):
+    """Test that matching against request jobs leaves the shared vocabulary alone."""
+    jobs = [job.model_copy(update={"requirements": job.requirements + [f"Request-only {job.job_id}"]})
+            for job in sample_jobs]
+    size = len(skill_index)
+
+    matching_service.match_profile_to_jobs(sample_profile, jobs, limit=2)
+    matching_service._score_skills(sample_profile.skills, jobs[0].requirements)
+
+    assert len(skill_index) == size
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
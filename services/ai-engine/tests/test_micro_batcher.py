@@ -0,0 +1,117 @@
+"""
+Tests for the embedding micro-batcher.
+"""
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from config import Config
+from models.embeddings import EmbeddingService
+from models.micro_batcher import MicroBatcher
+
+
+class RecordingEncoder:
+    """Encoder double that records every batch it is given."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def encoder():
+    """Create a recording encoder."""
+    return RecordingEncoder()
+
+
+def test_concurrent_texts_share_one_batch(encoder):
+    """Test that texts submitted within the wait window are encoded together."""
+    batcher = MicroBatcher(encoder, max_batch=8, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(text) for text in ["a", "bb", "ccc", "bb"]]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.close()
+
+    assert encoder.calls == [["a", "bb", "ccc"]]
+    assert [vector[0] for vector in results] == [1.0, 2.0, 3.0, 2.0]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_batches_are_capped_at_max_batch(encoder):
+    """Test that a full batch is encoded without waiting for the deadline."""
+    batcher = MicroBatcher(encoder, max_batch=2, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(str(i)) for i in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        batcher.close()
+
+    assert all(len(call) <= 2 for call in encoder.calls)
+    assert sum(len(call) for call in encoder.calls) == 5
+    assert 0 < batcher.stats()["fill_ratio"] <= 1
+
+
+def test_encode_errors_reach_every_caller():
+    """Test that a failed batch fails each waiting caller."""
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(failing, max_batch=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit("x"), batcher.submit("y")]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+    finally:
+        batcher.close()
+
+    assert batcher.stats()["failures"] >= 1
+
+
+def test_threaded_callers_get_their_own_vectors(encoder):
+    """Test the blocking embed() API from many threads."""
+    batcher = MicroBatcher(encoder, max_batch=16, max_wait_ms=20)
+    texts = ["x" * n for n in range(1, 11)]
+    results = {}
+
+    def call(text):
+        results[text] = batcher.embed(text)
+
+    threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        batcher.close()
+
+    assert all(results[text][0] == len(text) for text in texts)
+    assert len(encoder.calls) < len(texts)
+
+
+def test_event_loop_callers_fill_batches_beyond_executor_width(encoder, monkeypatch):
+    """Test that requests awaiting the batcher on the event loop share one batch."""
+    batcher = MicroBatcher(encoder, max_batch=32, max_wait_ms=200)
+    service = EmbeddingService()
+    monkeypatch.setattr(service, "_batcher", batcher)
+    texts = [f"profile {i}" for i in range(4 * Config.MAX_WORKERS)]
+
+    async def requests():
+        return await asyncio.gather(*(service.embed_text_async(text) for text in texts))
+
+    try:
+        results = asyncio.run(requests())
+    finally:
+        batcher.close()
+
+    assert [len(call) for call in encoder.calls] == [len(texts)]
+    assert len(texts) > Config.MAX_WORKERS
+    assert [vector[0] for vector in results] == [float(len(text)) for text in texts]
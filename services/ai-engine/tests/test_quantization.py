@@ -0,0 +1,60 @@
+"""
+Tests for compact (float16 / int8) embedding storage.
+"""
+import numpy as np
+import pytest
+
+from models.quantization import EmbeddingStore, QuantizedEmbeddings, quantize_int8, similarity
+from services.job_corpus import JobCorpus
+from tests.test_job_corpus import make_job
+
+
+def random_unit_vectors(n: int, dimension: int = 384, seed: int = 0) -> np.ndarray:
+    """Create normalized random vectors."""
+    vectors = np.random.default_rng(seed).standard_normal((n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_int8_round_trip_error_is_small():
+    """Test that per-vector scales keep the reconstruction close."""
+    vectors = random_unit_vectors(100)
+    codes, scales = quantize_int8(vectors)
+
+    decoded = QuantizedEmbeddings(codes, scales).to_float32()
+
+    assert codes.dtype == np.int8
+    assert np.abs(decoded - vectors).max() < scales.max()
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_scores_preserve_top_k(dtype):
+    """Test recall@10 of quantized scoring against float32."""
+    vectors = random_unit_vectors(2000)
+    queries = random_unit_vectors(20, seed=1)
+
+    store = EmbeddingStore(vectors.shape[1], capacity=len(vectors), dtype=dtype)
+    store.write(0, vectors)
+    quantized = store.head(len(vectors))
+
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    approx = np.argsort(-similarity(queries, quantized), axis=1)[:, :10]
+    recall = np.mean([len(set(e) & set(a)) / 10 for e, a in zip(exact, approx)])
+
+    assert recall >= 0.9
+    assert quantized.nbytes < vectors.nbytes / 1.9
+
+
+def test_int8_corpus_matches_like_float32():
+    """Test that an int8 corpus keeps rows aligned through updates and compaction."""
+    corpus = JobCorpus(initial_capacity=2, dtype="int8")
+    corpus.upsert([make_job(i) for i in range(6)])
+    corpus.delete(["job-1", "job-4"])
+    corpus._compact()
+
+    snapshot = corpus.snapshot()
+    expected = corpus.embedder.embed_job(make_job(5).dict())
+
+    assert isinstance(snapshot.embeddings, QuantizedEmbeddings)
+    assert [job.job_id for job in snapshot.jobs] == ["job-0", "job-2", "job-3", "job-5"]
+    assert np.allclose(snapshot.embeddings[3:4].to_float32()[0], expected, atol=0.01)
+    assert similarity(expected, snapshot.embeddings)[3] == pytest.approx(1.0, abs=0.01)
@@ -0,0 +1,123 @@
+"""
+Tests for incremental skill aggregation.
+"""
+import multiprocessing
+
+import pytest
+
+from models.schemas import Job, UserProfile
+from services.skill_aggregate import LOCK_STRIPES, SkillAggregate, SkillAggregateStore
+from services.skill_analysis import SkillAnalyzer
+
+
+@pytest.fixture
+def jobs():
+    """Create jobs with overlapping and repeated requirements."""
+    return [
+        Job(job_id="j1", title="Backend", company="A", description="Python is required, Docker a bonus.",
+            requirements=["Python", "Docker", "SQL"]),
+        Job(job_id="j2", title="Data", company="B", description="Spark must have. SQL preferred.",
+            requirements=["SQL", "Spark", " Python", "SQL"]),
+        Job(job_id="j3", title="Platform", company="C", description="Kubernetes nice to have.",
+            requirements=["Kubernetes", "Docker"]),
+    ]
+
+
+def test_incremental_matches_full_aggregation(jobs):
+    """Test that adds and removes leave the same metadata as rebuilding."""
+    analyzer = SkillAnalyzer()
+    aggregate = SkillAggregate()
+
+    for job in jobs:
+        aggregate.add(job)
+    assert aggregate.skills() == analyzer._aggregate_required_skills(jobs)
+
+    assert aggregate.remove("j1")
+    assert not aggregate.remove("j1")
+    assert aggregate.skills() == analyzer._aggregate_required_skills(jobs[1:])
+
+    aggregate.add(jobs[0])
+    assert aggregate.job_ids == ["j2", "j3", "j1"]
+    assert aggregate.skills() == analyzer._aggregate_required_skills(jobs[1:] + jobs[:1])
+
+
+def test_unchanged_job_keeps_position(jobs):
+    """Test that re-adding an identical job is a no-op."""
+    aggregate = SkillAggregate.from_jobs(jobs)
+
+    assert not aggregate.add(jobs[0])
+    assert aggregate.job_ids == ["j1", "j2", "j3"]
+
+
+def test_analysis_from_aggregate(jobs):
+    """Test that analysis over an aggregate equals analysis over the job list."""
+    analyzer = SkillAnalyzer()
+    profile = UserProfile(user_id="u", skills=["Python", "Docker"])
+
+    assert analyzer.analyze_skill_gaps(profile, SkillAggregate.from_jobs(jobs)) == \
+        analyzer.analyze_skill_gaps(profile, jobs)
+
+
+def test_store_persists_per_user(jobs, tmp_path):
+    """Test that aggregates survive a new store reading the same directory."""
+    store = SkillAggregateStore(path=str(tmp_path))
+    assert store.add_jobs("user-1", jobs) == {"changed": 3, "unchanged": 0}
+    assert store.remove_job("user-1", "j2")
+
+    reloaded = SkillAggregateStore(path=str(tmp_path)).get("user-1")
+
+    assert reloaded.job_ids == ["j1", "j3"]
+    assert reloaded.skills() == store.get("user-1").skills()
+    assert len(SkillAggregateStore(path=str(tmp_path)).get("user-2")) == 0
+
+
+def _add_jobs_in_worker(path, user_id, job_ids):
+    store = SkillAggregateStore(path=path)
+    for job_id in job_ids:
+        store.add_jobs(user_id, [Job(job_id=job_id, title="T", company="C", description="D",
+                                     requirements=[job_id])])
+
+
+def test_store_serializes_workers(tmp_path):
+    """Test that concurrent updates from several processes are all kept."""
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_add_jobs_in_worker,
+                        args=(str(tmp_path), "user-1", [f"w{w}-{i}" for i in range(20)]))
+        for w in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    job_ids = SkillAggregateStore(path=str(tmp_path)).get("user-1").job_ids
+
+    assert sorted(job_ids) == sorted(f"w{w}-{i}" for w in range(4) for i in range(20))
+
+
+def test_failed_save_drops_cached_aggregate(jobs, tmp_path, monkeypatch):
+    """Test that memory does not keep a change that was not written to disk."""
+    store = SkillAggregateStore(path=str(tmp_path))
+    store.add_jobs("user-1", jobs[:1])
+
+    def fail(user_id, aggregate):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_save", fail)
+    with pytest.raises(OSError):
+        store.add_jobs("user-1", jobs[1:])
+
+    assert store.get("user-1").job_ids == ["j1"]
+
+
+def test_user_lock_does_not_block_other_users(jobs, tmp_path):
+    """Test that a held update lock only blocks updates to that user."""
+    store = SkillAggregateStore(path=str(tmp_path))
+    store.add_jobs("user-1", jobs[:1])
+
+    with store._locked("user-1"):
+        assert store.get("user-1").job_ids == ["j1"]
+        other = next(f"user-{i}" for i in range(2, 1000)
+                     if hash(f"user-{i}") % LOCK_STRIPES != hash("user-1") % LOCK_STRIPES)
+        assert store.add_jobs(other, jobs[1:2]) == {"changed": 1, "unchanged": 0}
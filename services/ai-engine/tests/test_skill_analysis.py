@@ -0,0 +1,83 @@
+"""
+Tests for lazy skill analysis sessions.
+"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.schemas import Job, UserProfile
+from services.skill_analysis import SkillAnalyzer
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def profile():
+    return UserProfile(user_id="u", skills=["Python", "Docker"], roles=["Backend Engineer"])
+
+
+@pytest.fixture
+def jobs():
+    return [
+        Job(job_id="j1", title="Backend", company="A", description="Go is required. Redis is a bonus.",
+            requirements=["Python", "Go", "Redis", "SQL"]),
+        Job(job_id="j2", title="Platform", company="B", description="Kubernetes must have.",
+            requirements=["Kubernetes", "Docker", "Terraform", "Go"]),
+    ]
+
+
+def test_session_matches_separate_calls(profile, jobs, monkeypatch):
+    """Test that one session yields both artifacts while finding gaps once."""
+    analyzer = SkillAnalyzer()
+    expected = analyzer.analyze_skill_gaps(profile, jobs)
+    expected_paths = analyzer.generate_learning_paths(expected.skill_gaps, max_paths=3)
+
+    calls = []
+    create = analyzer._create_skill_gap
+    monkeypatch.setattr(analyzer, "_create_skill_gap", lambda *args: calls.append(args) or create(*args))
+
+    combined = analyzer.session(profile, jobs).with_learning_paths(max_paths=3)
+
+    assert combined.analysis == expected
+    assert combined.learning_paths == expected_paths
+    assert len(calls) == len(expected.skill_gaps)
+
+
+def test_shared_session_computes_once(profile, jobs, monkeypatch):
+    """Test that threads sharing a session compute the analysis once."""
+    analyzer = SkillAnalyzer()
+    calls = []
+    aggregate = analyzer._aggregate_required_skills
+    monkeypatch.setattr(analyzer, "_aggregate_required_skills", lambda jobs: calls.append(1) or aggregate(jobs))
+
+    session = analyzer.session(profile, jobs)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(session.result)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_combined_endpoint_matches_separate_endpoints(profile, jobs):
+    """Test that the combined endpoint returns what the two endpoints return."""
+    body = {"profile": profile.model_dump(mode="json"), "target_jobs": [job.model_dump(mode="json") for job in jobs]}
+
+    combined = client.post("/api/v1/analyze-skills/with-paths?max_paths=2", json=body)
+
+    assert combined.status_code == 200
+    assert combined.json()["analysis"] == client.post("/api/v1/analyze-skills", json=body).json()
+    assert combined.json()["learning_paths"] == \
+        client.post("/api/v1/learning-paths?max_paths=2", json=body).json()
+
+
+def test_saved_analysis_rejects_other_users_profile(profile):
+    """Test that a profile must belong to the user in the path."""
+    response = client.post("/api/v1/users/someone-else/analyze-skills", json=profile.model_dump(mode="json"))
+
+    assert response.status_code == 400
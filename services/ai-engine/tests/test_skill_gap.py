@@ -167,3 +167,27 @@ def test_skill_gap_sorted_output():
 
     # Missing skills should be sorted
     assert data["missing_skills"] == sorted(data["missing_skills"])
+
+
+def test_bulk_skill_gap_matches_single():
+    """Test that each bulk result equals the single-user endpoint's answer."""
+    required_skills = ["Python", " docker", "Kubernetes", "python", "SQL"]
+    users = [
+        {"user_id": "u1", "user_skills": ["PYTHON", "sql "]},
+        {"user_id": "u2", "user_skills": []},
+        {"user_id": "u3", "user_skills": ["Docker", "Kubernetes", "Python", "SQL"]},
+    ]
+
+    response = client.post("/api/v1/skill-gap/bulk", json={"required_skills": required_skills, "users": users})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["required_skills"] == required_skills
+    assert [result["user_id"] for result in data["results"]] == ["u1", "u2", "u3"]
+
+    for user, result in zip(users, data["results"]):
+        single = client.post("/api/v1/skill-gap", json={
+            "user_skills": user["user_skills"],
+            "required_skills": required_skills,
+        }).json()
+        assert result["missing_skills"] == single["missing_skills"]
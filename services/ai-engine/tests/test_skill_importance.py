@@ -0,0 +1,59 @@
+"""
+Tests for requirement importance labelling.
+"""
+import pytest
+
+from models.schemas import Job
+from services.skill_analysis import SkillAnalyzer
+from services.skill_importance import ImportanceAnnotator, label_requirements
+
+FILLER = "We ship product every week with a small, friendly team. " * 3
+
+
+@pytest.mark.parametrize("description,requirements", [
+    ("Python is required. Docker experience is a bonus.", ["Python", "Docker"]),
+    (f"Kubernetes is a plus. {FILLER} Go is mandatory.", ["Kubernetes", "Go", "Rust"]),
+    (f"Must have: Java. {FILLER}", ["Java", "JavaScript", "SQL"]),
+    ("Nice to have: React, must have TypeScript", ["React", "TypeScript"]),
+    ("", ["Python", ""]),
+    (FILLER, []),
+])
+def test_labels_match_per_skill_heuristic(description, requirements):
+    """Test that one-pass labels equal the per-skill context check."""
+    analyzer = SkillAnalyzer()
+    job_text = f"{description} {' '.join(requirements)}".lower()
+
+    expected = tuple(analyzer._determine_importance(req, job_text) for req in requirements)
+
+    assert label_requirements(description, requirements) == expected
+
+
+def test_labels_cached_by_content():
+    """Test that labels are reused for identical job content."""
+    annotator = ImportanceAnnotator()
+    job = Job(job_id="a", title="Engineer", company="Acme",
+              description=f"Python required. {FILLER}", requirements=["Python", "SQL"])
+    repost = job.model_copy(update={"job_id": "b"})
+
+    assert annotator.annotate(job) == ("critical", "important")
+    assert annotator.annotate(repost) == ("critical", "important")
+    assert annotator.stats()["hits"] == 1
+
+
+class CollidingText(str):
+    """String whose hash collides with every other CollidingText."""
+
+    def __hash__(self):
+        return 0
+
+
+def test_hash_collisions_do_not_share_labels():
+    """Test that jobs with colliding text hashes keep their own labels."""
+    annotator = ImportanceAnnotator()
+    first = Job.model_construct(job_id="a", description=CollidingText("Python required."),
+                                requirements=["Python"])
+    second = Job.model_construct(job_id="b", description=CollidingText("Python is a plus."),
+                                 requirements=["Python"])
+
+    assert annotator.annotate(first) == ("critical",)
+    assert annotator.annotate(second) == ("nice-to-have",)
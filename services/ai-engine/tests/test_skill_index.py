@@ -0,0 +1,106 @@
+"""
+Tests for the shared skill vocabulary index.
+"""
+import random
+
+from services.skill_index import GRAM_SIZE, SkillIndex, normalize_skill, popcount
+
+
+def test_intern_normalizes_and_is_stable():
+    """Test that equivalent spellings share one ID."""
+    index = SkillIndex()
+
+    assert index.intern("Python") == index.intern("  python ")
+    assert index.intern("Go") != index.intern("Python")
+    assert len(index) == 2
+    assert index.skill(index.intern("PYTHON")) == normalize_skill("Python")
+
+
+def test_containment_relation_is_symmetric_and_order_independent():
+    """Test that substring relations are recorded whichever skill comes first."""
+    index = SkillIndex()
+    react = index.intern("React")
+    reactjs = index.intern("React.js")
+    java = index.intern("Java")
+    javascript = index.intern("JavaScript")
+    rust = index.intern("Rust")
+
+    assert reactjs in index.related(react)
+    assert react in index.related(reactjs)
+    assert java in index.related(javascript)
+    assert javascript in index.related(java)
+    assert index.related(rust) == {rust}
+
+
+def test_coverage_includes_exact_and_fuzzy_matches():
+    """Test that coverage mirrors substring fuzzy matching."""
+    index = SkillIndex()
+    required = index.intern_all(["React.js", "Docker", "SQL", "PostgreSQL"])
+    covered = index.coverage(["react", "PostgreSQL"])
+
+    assert {skill_id for skill_id in required if skill_id in covered} == {
+        index.intern("React.js"),
+        index.intern("SQL"),
+        index.intern("PostgreSQL"),
+    }
+
+
+def test_lookup_does_not_intern():
+    """Test that request-only skills are related to the vocabulary without being added."""
+    index = SkillIndex()
+    react, reactjs, rust = index.intern_all(["React", "React.js", "Rust"])
+
+    assert index.lookup("react.js native") == {react, reactjs}
+    assert index.lookup("REACT") == index.related(react)
+    assert index.lookup("Haskell") == set()
+    assert index.get("Haskell") is None
+    assert len(index) == 3
+
+
+def test_relations_match_substring_scan():
+    """Test that the n-gram index finds exactly the substring-related skills."""
+    rng = random.Random(0)
+    skills = list({"".join(rng.choice("abc .") for _ in range(rng.randint(0, 2 * GRAM_SIZE + 2)))
+                   for _ in range(300)})
+    index = SkillIndex()
+    ids = index.intern_all(skills)
+    canonical = [index.skill(skill_id) for skill_id in ids]
+
+    for skill_id, skill in zip(ids, canonical):
+        expected = {other_id for other_id, other in zip(ids, canonical) if skill in other or other in skill}
+        assert index.related(skill_id) == expected
+    for query in ["", "a", "ab c", "abcabcab", "zzz"]:
+        expected = {other_id for other_id, other in zip(ids, canonical) if query in other or other in query}
+        assert index.lookup(query) == expected
+
+
+def test_overlay_keeps_request_skills_local():
+    """Test that overlay IDs relate like interned ones without growing the index."""
+    index = SkillIndex()
+    react, rust = index.intern_all(["React", "Rust"])
+    overlay = index.overlay()
+
+    react_again, reactjs, cooking = overlay.intern_all(["react", "React.js", "Cooking"])
+    index.intern("React Native")  # Shared growth after the overlay is hidden from it
+
+    assert react_again == react
+    assert (reactjs, cooking) == (2, 3)
+    assert len(index) == 3
+    assert overlay.lookup("react") == {react, reactjs}
+    assert overlay.coverage(["js", "rust"]) == {reactjs, rust}
+    assert overlay.words() == 1
+
+
+def test_bitsets_and_popcount():
+    """Test packing skill IDs into uint64 words and counting overlap."""
+    index = SkillIndex()
+    ids = index.intern_all([f"skill-{i}" for i in range(130)])
+    n_words = index.words()
+
+    bits = index.bitsets([ids[:3], ids[60:70], [], ids], n_words)
+
+    assert bits.shape == (4, 3)
+    assert popcount(bits).tolist() == [3, 10, 0, 130]
+
+    user = index.bitset([ids[0], ids[65], ids[129]], n_words)
+    assert popcount(bits & user).tolist() == [1, 1, 0, 3]
@@ -0,0 +1,102 @@
+"""
+Tests for semantic skill synonym matching.
+"""
+import numpy as np
+import pytest
+from services.skill_index import SkillIndex
+from services.skill_synonyms import SkillSynonyms
+
+
+class KeyedEmbedder:
+    """Embedder returning fixed vectors so synonym pairs are known."""
+
+    VECTORS = {
+        "k8s": [1.0, 0.0, 0.0],
+        "kubernetes": [0.95, 0.31, 0.0],
+        "python": [0.0, 1.0, 0.0],
+        "cooking": [0.0, 0.0, 1.0],
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_batch(self, texts):
+        self.calls.append(list(texts))
+        rows = np.zeros((len(texts), 384), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vector = np.array(self.VECTORS[text], dtype=np.float32)
+            rows[i, :3] = vector / np.linalg.norm(vector)
+        return rows
+
+
+@pytest.fixture
+def store():
+    """Create a synonym store over a private vocabulary."""
+    return SkillSynonyms(index=SkillIndex(), embedder=KeyedEmbedder(), threshold=0.9, enabled=True)
+
+
+def test_expand_finds_synonyms(store):
+    """Test that near-synonyms are resolved through the embedding matrix."""
+    k8s, kubernetes, python, cooking = store.index.intern_all(["k8s", "Kubernetes", "Python", "Cooking"])
+
+    assert store.expand(["k8s"]) == {k8s, kubernetes}
+    assert store.expand(["Python"]) == {python}
+    assert kubernetes in store.coverage(["k8s"])
+    assert cooking not in store.coverage(["k8s", "python"])
+
+
+def test_synonyms_are_linked_when_embedded(store):
+    """Test that synonyms are stored in the index, in both directions, once embedded."""
+    k8s, python = store.index.intern_all(["k8s", "Python"])
+    store.ensure_embedded()
+    assert store.index.synonyms(k8s) == {k8s}
+
+    kubernetes = store.index.intern("Kubernetes")
+    store.ensure_embedded()
+
+    assert store.index.synonyms(k8s) == {k8s, kubernetes}
+    assert store.index.synonyms(kubernetes) == {k8s, kubernetes}
+    assert store.index.synonyms(python) == {python}
+
+
+def test_each_skill_is_embedded_once(store):
+    """Test that only newly interned skills are encoded."""
+    store.index.intern_all(["k8s", "Python"])
+    store.expand(["k8s"])
+    store.expand(["python"])
+    store.index.intern("Kubernetes")
+    store.expand(["k8s"])
+
+    assert store.embedder.calls == [["k8s", "python"], ["kubernetes"]]
+
+
+def test_disabled_store_falls_back_to_containment():
+    """Test that a disabled store only reports substring coverage."""
+    store = SkillSynonyms(index=SkillIndex(), embedder=KeyedEmbedder(), enabled=False)
+    k8s, kubernetes = store.index.intern_all(["k8s", "Kubernetes"])
+
+    assert store.expand(["k8s"]) == set()
+    assert store.coverage(["k8s"]) == {k8s}
+    assert store.embedder.calls == []
+
+
+def test_request_skills_are_matched_without_interning(store):
+    """Test that skills outside the vocabulary are compared but not added."""
+    kubernetes, python = store.index.intern_all(["Kubernetes", "Python"])
+
+    assert store.covers(["k8s", "python", "cooking"]) == [{kubernetes}, {python}, set()]
+    assert len(store.index) == 2
+
+    vectors = store.vectors(["Kubernetes", "Cooking"])
+    assert store.matches(vectors, ["k8s"]).tolist() == [True, False]
+
+
+def test_overlay_skills_are_matched_as_synonyms(store):
+    """Test that request-local skills are compared directly, not interned."""
+    (python,) = store.index.intern_all(["Python"])
+    overlay = store.index.overlay()
+    kubernetes, cooking = overlay.intern_all(["Kubernetes", "Cooking"])
+
+    assert store.covers(["k8s", "python"], overlay) == [{kubernetes}, {python}]
+    assert store.coverage(["k8s"], overlay) == {kubernetes}
+    assert len(store.index) == 1
@@ -0,0 +1,41 @@
+"""
+Tests for startup timing and the liveness/readiness probes.
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.startup import StartupTimer
+
+
+def test_startup_timer_records_phases():
+    """Test that phases accumulate and readiness is recorded once."""
+    timer = StartupTimer()
+
+    with timer.phase("model_load"):
+        time.sleep(0.01)
+    timer.record("model_load", 0.005)
+
+    assert not timer.ready
+    timer.mark_ready()
+    first = timer.report()["time_to_ready_ms"]
+    timer.mark_ready()
+
+    report = timer.report()
+    assert timer.ready
+    assert report["model_load_ms"] >= 15
+    assert report["time_to_ready_ms"] == first
+
+
+def test_probes_after_startup():
+    """Test that /live and /ready answer once the lifespan has run."""
+    with TestClient(app) as client:
+        live = client.get("/live")
+        ready = client.get("/ready")
+
+    assert live.status_code == 200
+    assert ready.status_code == 200
+    assert ready.json()["status"] == "ready"
+    assert ready.json()["model_loaded"] is True
+    assert "time_to_ready_ms" in ready.json()["startup"]
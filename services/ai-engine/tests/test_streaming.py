@@ -0,0 +1,60 @@
+"""
+Tests for the NDJSON streaming match endpoints.
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from config import Config
+from main import app
+
+client = TestClient(app)
+
+JOBS = [
+    {
+        "job_id": f"job-{i}",
+        "title": title,
+        "company": "Acme",
+        "description": f"{title} working with {', '.join(skills)}.",
+        "requirements": skills,
+    }
+    for i, (title, skills) in enumerate([
+        ("Backend Engineer", ["Python", "FastAPI", "PostgreSQL"]),
+        ("Frontend Developer", ["React", "TypeScript"]),
+        ("Data Engineer", ["Python", "Spark", "SQL"]),
+        ("Senior DevOps Engineer", ["Kubernetes", "Docker", "AWS"]),
+    ])
+]
+
+
+def _profile(i):
+    return {"user_id": f"user-{i}", "skills": ["Python", "SQL"] if i % 2 else ["React", "Docker"]}
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_match_stream_equals_match():
+    """Test that the streamed matches are the buffered matches, one per line."""
+    request = {"profile": _profile(1), "jobs": JOBS, "limit": 3}
+
+    buffered = client.post("/api/v1/match", json=request).json()
+    response = client.post("/api/v1/match/stream", json=request)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert _lines(response) == buffered
+
+
+def test_batch_stream_spans_chunks(monkeypatch):
+    """Test that every profile is streamed, in order, across profile chunks."""
+    monkeypatch.setattr(Config, "BATCH_SIZE", 2)
+    request = {"profiles": [_profile(i) for i in range(5)], "jobs": JOBS, "limit": 2}
+
+    buffered = client.post("/api/v1/match/batch", json=request).json()
+    response = client.post("/api/v1/match/batch/stream", json=request)
+
+    assert response.status_code == 200
+    assert _lines(response) == buffered
+    assert [line["user_id"] for line in _lines(response)] == [f"user-{i}" for i in range(5)]
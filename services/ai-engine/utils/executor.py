@@ -0,0 +1,144 @@
+"""
+Bounded thread pool for CPU-bound model inference.
+
+Request handlers are `async def`, so calling the embedding model directly
+would block the event loop (and with it /health and every other request).
+Inference is handed to a fixed pool of worker threads instead; PyTorch and
+NumPy release the GIL while computing. Admission is bounded: once all
+workers are busy and the wait queue is full, new work is rejected so the
+caller can shed load instead of piling up latency.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when the executor has no free worker or queue slot."""
+
+
+class InferenceExecutor:
+    """
+    Thread pool with a bounded wait queue and queue-depth counters.
+
+    At most `max_workers` calls run at once and at most `max_queue` more
+    wait for a worker; anything beyond that raises InferenceQueueFull.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """
+        Initialize the executor (threads are started on first use).
+
+        Args:
+            max_workers: Worker threads (uses Config.MAX_WORKERS if None)
+            max_queue: Calls allowed to wait for a worker
+                (uses Config.INFERENCE_QUEUE_SIZE if None)
+        """
+        self.max_workers = max(1, max_workers or Config.MAX_WORKERS)
+        self.max_queue = max(0, Config.INFERENCE_QUEUE_SIZE if max_queue is None else max_queue)
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        self._active = 0
+        self._queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on a worker thread and await its result.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            InferenceQueueFull: If every worker and queue slot is taken
+        """
+        with self._lock:
+            if self._active + self._queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise InferenceQueueFull(
+                    f"Inference queue full ({self._active} running, {self._queued} waiting)"
+                )
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="inference"
+                )
+            self._queued += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+            pool = self._pool
+
+        call = functools.partial(fn, *args, **kwargs)
+        future = pool.submit(self._call, call, time.monotonic())
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, dropping calls that have not started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, float]:
+        """Get queue-depth and throughput counters for monitoring."""
+        with self._lock:
+            started = self.completed + self.failed + self._active
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self._wait_seconds / started * 1000, 2) if started else 0.0,
+            }
+
+    def _call(self, call: Callable[[], Any], submitted_at: float) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_seconds += time.monotonic() - submitted_at
+
+        try:
+            result = call()
+        except BaseException:
+            with self._lock:
+                self._active -= 1
+                self.failed += 1
+            raise
+
+        with self._lock:
+            self._active -= 1
+            self.completed += 1
+        return result
+
+    def _on_done(self, future: Future) -> None:
+        # Calls cancelled before a worker picked them up never reach _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+
+# Global executor shared by all request handlers
+inference_executor = InferenceExecutor()
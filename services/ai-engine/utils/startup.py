@@ -0,0 +1,68 @@
+"""
+Startup phase timing.
+
+Records how long each cold-start phase (module imports, model import,
+model load, warm-up, corpus restore) took, so slow starts can be
+diagnosed from /ready and /health after the fact.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class StartupTimer:
+    """Accumulates named phase durations since process start."""
+
+    def __init__(self):
+        """Start the clock (module import time approximates process start)."""
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: Dict[str, float] = {}
+        self._ready_after: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block of startup work.
+
+        Args:
+            name: Phase name (repeated phases accumulate)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def elapsed(self) -> float:
+        """Seconds since the clock started."""
+        return time.perf_counter() - self._started
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a measured duration to a phase."""
+        with self._lock:
+            self._phases[name] = self._phases.get(name, 0.0) + seconds
+
+    def mark_ready(self) -> None:
+        """Record the time until the service became ready (first call wins)."""
+        with self._lock:
+            if self._ready_after is None:
+                self._ready_after = time.perf_counter() - self._started
+
+    @property
+    def ready(self) -> bool:
+        """Whether mark_ready has been called."""
+        return self._ready_after is not None
+
+    def report(self) -> Dict[str, float]:
+        """Get phase durations in milliseconds."""
+        with self._lock:
+            report = {f"{name}_ms": round(seconds * 1000, 1) for name, seconds in self._phases.items()}
+            if self._ready_after is not None:
+                report["time_to_ready_ms"] = round(self._ready_after * 1000, 1)
+            return report
+
+
+# Global timer for the running process
+startup_timer = StartupTimer()